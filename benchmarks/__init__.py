@@ -0,0 +1 @@
+"""Benchmarks of the UTE Energy integration against a local UTE API."""
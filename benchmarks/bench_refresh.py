@@ -0,0 +1,256 @@
+"""End-to-end refresh benchmark of the coordinators against the mock UTE API.
+
+Every scenario registers the agreement, billing and reading coordinators of
+N service points on one hub, like N config entries of a user, and refreshes
+them all together: once cold (login, empty caches) and then `--rounds` warm
+times. Latency, UTE API calls and throughput are reported per scenario.
+
+    python -m benchmarks.bench_refresh --save baseline.json
+    python -m benchmarks.bench_refresh --compare baseline.json
+
+With --compare the exit status is 1 when a scenario is slower than the
+baseline by more than --tolerance, or makes more calls per refresh.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass
+import json
+import logging
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ute_energy.breaker import CircuitBreakers
+from custom_components.ute_energy.const import ENDPOINTS
+from custom_components.ute_energy.coordinator import (
+    COORDINATORS,
+    UteEnergyDataUpdateCoordinator,
+)
+from custom_components.ute_energy.hub import UteEnergyHub
+from custom_components.ute_energy.limiter import RequestLimiter
+from custom_components.ute_energy.ute_energy import AsyncUteEnergy, ReadingPollSettings
+
+from .mock_server import MockUteConfig, MockUteServer
+
+EMAIL = "bench@example.com"
+PHONE = "59899000000"
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements of a scenario."""
+
+    accounts: int
+    cold_seconds: float
+    warm_p50_seconds: float
+    warm_p95_seconds: float
+    cold_calls: int
+    calls_per_refresh: float
+    requests_per_second: float
+    accounts_per_second: float
+    failed_refreshes: int
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[max(0, round(percent / 100 * len(ordered)) - 1)]
+
+
+async def _refresh_all(
+    coordinators: list[UteEnergyDataUpdateCoordinator],
+) -> tuple[float, int]:
+    """Refresh every coordinator together, return elapsed time and failures."""
+    start = time.perf_counter()
+    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(
+        not coordinator.last_update_success for coordinator in coordinators
+    )
+
+
+async def run_scenario(accounts: int, args: argparse.Namespace) -> ScenarioResult:
+    """Benchmark the refresh of a number of service points."""
+    server = MockUteServer(
+        MockUteConfig(
+            accounts=accounts,
+            latency=args.latency,
+            jitter=args.jitter,
+            slow=dict(args.slow),
+            reading_polls=args.reading_polls,
+        )
+    )
+    url = await server.start()
+    connector = aiohttp.TCPConnector()
+    session = aiohttp.ClientSession(connector=connector)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            client = AsyncUteEnergy(
+                EMAIL,
+                PHONE,
+                session,
+                concurrent_fetch=not args.sequential,
+                # Every round reads the meter, no reuse of recent readings.
+                reading_poll=ReadingPollSettings(
+                    initial_delay=args.poll_delay,
+                    max_delay=args.poll_delay * 4,
+                    min_interval=0,
+                ),
+                limiter=RequestLimiter(rate=args.rate) if args.rate else None,
+                breakers=CircuitBreakers(),
+                base_url=url,
+            )
+            hub = UteEnergyHub(hass, "bench", client)
+            coordinators = []
+            for account_id in server.account_ids:
+                for coordinator_class in COORDINATORS:
+                    coordinator = coordinator_class(hass, hub, account_id, account_id)
+                    hub.async_register(coordinator)
+                    coordinators.append(coordinator)
+
+            cold_seconds, failures = await _refresh_all(coordinators)
+            cold_calls = server.total_calls
+
+            server.reset_stats()
+            warm: list[float] = []
+            for _ in range(args.rounds):
+                elapsed, failed = await _refresh_all(coordinators)
+                warm.append(elapsed)
+                failures += failed
+            warm_calls = server.total_calls
+        finally:
+            await hass.async_stop(force=True)
+            await session.close()
+            await connector.close()
+            await server.stop()
+
+    warm_total = sum(warm)
+    warm_p50 = statistics.median(warm)
+    return ScenarioResult(
+        accounts=accounts,
+        cold_seconds=round(cold_seconds, 4),
+        warm_p50_seconds=round(warm_p50, 4),
+        warm_p95_seconds=round(_percentile(warm, 95), 4),
+        cold_calls=cold_calls,
+        calls_per_refresh=round(warm_calls / args.rounds, 1),
+        requests_per_second=round(warm_calls / warm_total, 1),
+        accounts_per_second=round(accounts / warm_p50, 1),
+        failed_refreshes=failures,
+    )
+
+
+def compare(
+    results: list[ScenarioResult], baseline: dict[str, dict], tolerance: float
+) -> list[str]:
+    """Return the regressions of results against a saved baseline."""
+    regressions = []
+    for result in results:
+        if (previous := baseline.get(str(result.accounts))) is None:
+            continue
+        limit = previous["warm_p50_seconds"] * (1 + tolerance)
+        if result.warm_p50_seconds > limit:
+            regressions.append(
+                f"{result.accounts} accounts: warm p50 {result.warm_p50_seconds} s"
+                f" > {limit:.4f} s"
+            )
+        if result.calls_per_refresh > previous["calls_per_refresh"]:
+            regressions.append(
+                f"{result.accounts} accounts: {result.calls_per_refresh} calls"
+                f" per refresh > {previous['calls_per_refresh']}"
+            )
+        if result.failed_refreshes > previous["failed_refreshes"]:
+            regressions.append(
+                f"{result.accounts} accounts: {result.failed_refreshes} failed"
+                " refreshes"
+            )
+    return regressions
+
+
+def _print_table(results: list[ScenarioResult]) -> None:
+    """Print the results as a table."""
+    columns = list(asdict(results[0]))
+    widths = [max(len(column), 10) for column in columns]
+    print("  ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for result in results:
+        values = asdict(result).values()
+        print(
+            "  ".join(str(value).rjust(width) for value, width in zip(values, widths))
+        )
+
+
+def _slow_endpoint(value: str) -> tuple[str, float]:
+    """Parse an ENDPOINT=SECONDS argument."""
+    endpoint, _, seconds = value.partition("=")
+    if endpoint not in ENDPOINTS:
+        raise argparse.ArgumentTypeError(f"unknown endpoint {endpoint}")
+    return endpoint, float(seconds)
+
+
+async def _run(args: argparse.Namespace) -> list[ScenarioResult]:
+    """Run the scenarios one after the other."""
+    return [await run_scenario(accounts, args) for accounts in args.accounts]
+
+
+def main() -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--accounts", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--rounds", type=int, default=5, help="warm refreshes")
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="seconds per response"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument(
+        "--slow",
+        type=_slow_endpoint,
+        action="append",
+        default=[],
+        metavar="ENDPOINT=SECONDS",
+        help="extra latency of an endpoint, as LAST_READING=0.5",
+    )
+    parser.add_argument(
+        "--reading-polls", type=int, default=2, help="lastReading polls per reading"
+    )
+    parser.add_argument(
+        "--poll-delay", type=float, default=0.05, help="first lastReading wait"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=0, help="limiter requests/s, 0 disables it"
+    )
+    parser.add_argument("--sequential", action="store_true")
+    parser.add_argument("--save", type=Path, help="write the results as baseline")
+    parser.add_argument("--compare", type=Path, help="baseline to gate against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(_run(args))
+    _print_table(results)
+
+    if args.save:
+        args.save.write_text(
+            json.dumps({str(r.accounts): asdict(r) for r in results}, indent=2)
+        )
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if regressions := compare(results, baseline, args.tolerance):
+            print("\n".join(["Regressions:", *regressions]))
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
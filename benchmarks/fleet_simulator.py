@@ -0,0 +1,425 @@
+"""Scaling report of the integration with thousands of service points.
+
+Every scenario starts a test Home Assistant instance and sets up N config
+entries through the real integration setup, so the sensor and binary sensor
+platforms create the full entity set of each tariff (TRS, TRD and TRT in
+turns). The UTE API is the in-process MockUteApi behind a fake client
+session, no sockets involved. After setup every coordinator is refreshed
+`--rounds` times with new meter readings.
+
+Reported per scenario: setup time, entities, memory, event loop lag and the
+state write rate of the refresh rounds.
+
+    python -m benchmarks.fleet_simulator --entries 10 100 1000 --output report.json
+    python -m benchmarks.fleet_simulator --compare report.json
+
+With --compare the exit status is 1 when a scenario regressed by more than
+--tolerance against the previous report.
+
+Requires pytest-homeassistant-custom-component for the test instance.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+import json
+import logging
+from pathlib import Path
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import recorder as recorder_helper
+from homeassistant.loader import DATA_CUSTOM_COMPONENTS
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.ute_energy.const import (
+    ACCOUNT_SERVICE_POINT_ID,
+    CONF_LIMITER_BURST,
+    CONF_LIMITER_MAX_CONCURRENCY,
+    CONF_LIMITER_RATE,
+    CONF_USER_EMAIL,
+    CONF_USER_PHONE,
+    CONNECTION,
+    DOMAIN,
+    DOUBLE_TARIFF,
+    ENTRY_COORDINATORS,
+    ENTRY_NAME,
+    HUBS,
+    SIMPLE_TARIFF,
+    TRIPLE_TARIFF,
+)
+
+from .mock_server import MockUteApi, MockUteConfig
+
+EMAIL = "fleet@example.com"
+PHONE = "59899000000"
+MANIFEST = Path(__file__).parent.parent / "custom_components" / DOMAIN / "manifest.json"
+GATED_METRICS = (
+    "setup_seconds",
+    "refresh_p50_seconds",
+    "loop_lag_p99_ms",
+    "memory_per_entity_kib",
+)
+
+
+class FakeResponse:
+    """Response of the fake client session."""
+
+    def __init__(self, status: int, text: str) -> None:
+        """Initialize."""
+        self.status = status
+        self.reason = "OK" if status == 200 else "Error"
+        self._text = text
+
+    async def __aenter__(self) -> FakeResponse:
+        """Enter the response context."""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Exit the response context."""
+
+    async def read(self) -> bytes:
+        """Return the body."""
+        return self._text.encode()
+
+    def get_encoding(self) -> str:
+        """Return the charset of the body."""
+        return "utf-8"
+
+
+class FakeClientSession:
+    """aiohttp session stand-in answering from a MockUteApi."""
+
+    def __init__(self, api: MockUteApi) -> None:
+        """Initialize."""
+        self.api = api
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> _FakeRequest:
+        """Return the response context of a request."""
+        return _FakeRequest(
+            self.api, urlsplit(url).path, (headers or {}).get("Authorization"), data
+        )
+
+    def detach(self) -> None:
+        """Nothing to detach."""
+
+
+class _FakeRequest:
+    """Async context resolving a request against the mock API."""
+
+    def __init__(
+        self, api: MockUteApi, path: str, authorization: str | None, body: str | None
+    ) -> None:
+        """Initialize."""
+        self._request = api.async_respond(path, authorization, body)
+
+    async def __aenter__(self) -> FakeResponse:
+        """Answer the request."""
+        return FakeResponse(*await self._request)
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Release the response."""
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a periodic sleeper."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        """Initialize."""
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        self.lags.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Sleep and record the overshoot."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - start - self.interval))
+
+    def percentile_ms(self, percent: float) -> float:
+        """Return a lag percentile in milliseconds."""
+        if not self.lags:
+            return 0.0
+        ordered = sorted(self.lags)
+        index = min(len(ordered) - 1, int(percent / 100 * len(ordered)))
+        return round(ordered[index] * 1000, 2)
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements of a scenario."""
+
+    entries: int
+    entities: int
+    setup_seconds: float
+    setup_loop_lag_max_ms: float
+    refresh_p50_seconds: float
+    loop_lag_p99_ms: float
+    loop_lag_max_ms: float
+    state_writes: int
+    state_writes_per_second: float
+    memory_mib: float
+    memory_peak_mib: float
+    memory_per_entity_kib: float
+
+
+@contextmanager
+def _trace_memory(enabled: bool) -> Iterator[list[float]]:
+    """Yield [current, peak] traced allocations in MiB, filled on exit."""
+    usage = [0.0, 0.0]
+    if enabled:
+        tracemalloc.start()
+    try:
+        yield usage
+    finally:
+        if enabled:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            usage[:] = [current / 2**20, peak / 2**20]
+
+
+async def _async_setup_fleet(
+    hass: HomeAssistant, api: MockUteApi, options: dict[str, Any]
+) -> list[str]:
+    """Add a config entry per service point and set them all up."""
+    entries = []
+    for account_id in api.account_ids:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            unique_id=account_id,
+            data={
+                CONNECTION: {
+                    CONF_USER_EMAIL: EMAIL,
+                    CONF_USER_PHONE: PHONE,
+                    ACCOUNT_SERVICE_POINT_ID: int(account_id),
+                },
+                ENTRY_NAME: f"A{account_id}",
+            },
+            options=options,
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry.entry_id)
+
+    results = await asyncio.gather(
+        *(hass.config_entries.async_setup(entry_id) for entry_id in entries)
+    )
+    await hass.async_block_till_done()
+    if not all(results):
+        raise RuntimeError(f"{results.count(False)} config entries failed setup")
+    return entries
+
+
+async def run_scenario(entries: int, args: argparse.Namespace) -> ScenarioResult:
+    """Set up a fleet of config entries and refresh it."""
+    api = MockUteApi(
+        MockUteConfig(
+            accounts=entries,
+            tariffs=(SIMPLE_TARIFF, DOUBLE_TARIFF, TRIPLE_TARIFF),
+            reading_polls=1,
+        )
+    )
+    monitor = LoopLagMonitor()
+    with tempfile.TemporaryDirectory() as storage_dir:
+        async with async_test_home_assistant(storage_dir=storage_dir) as hass:
+            # Load custom_components/ute_energy from this checkout.
+            hass.data.pop(DATA_CUSTOM_COMPONENTS, None)
+            # The recorder keeps its database in the temporary config dir.
+            recorder_helper.async_initialize_recorder(hass)
+            await async_setup_component(hass, "recorder", {"recorder": {}})
+            options: dict[str, Any] = {}
+            if not args.rate:
+                options = {
+                    CONF_LIMITER_RATE: 1e9,
+                    CONF_LIMITER_BURST: 10**9,
+                    CONF_LIMITER_MAX_CONCURRENCY: 10**9,
+                }
+            elif args.rate > 0:
+                options = {CONF_LIMITER_RATE: args.rate}
+
+            with patch(
+                "custom_components.ute_energy.hub.async_create_clientsession",
+                return_value=FakeClientSession(api),
+            ), _trace_memory(args.trace_memory) as memory:
+                monitor.start()
+                start = time.perf_counter()
+                entry_ids = await _async_setup_fleet(hass, api, options)
+                setup_seconds = time.perf_counter() - start
+                await monitor.stop()
+                setup_lag_max = monitor.percentile_ms(100)
+                # Every round reads the meter, no reuse of recent readings.
+                for hub in hass.data[DOMAIN][HUBS].values():
+                    hub.client.reading_poll.min_interval = 0
+
+                state_writes = 0
+
+                @callback
+                def _count_write(_: Event) -> None:
+                    nonlocal state_writes
+                    state_writes += 1
+
+                unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+                coordinators = [
+                    coordinator
+                    for entry_id in entry_ids
+                    for coordinator in hass.data[DOMAIN][entry_id][
+                        ENTRY_COORDINATORS
+                    ].values()
+                ]
+                refreshes: list[float] = []
+                monitor.start()
+                for _ in range(args.rounds):
+                    start = time.perf_counter()
+                    await asyncio.gather(
+                        *(coordinator.async_refresh() for coordinator in coordinators)
+                    )
+                    await hass.async_block_till_done()
+                    refreshes.append(time.perf_counter() - start)
+                await monitor.stop()
+                unsub()
+
+            entities = len(hass.states.async_all())
+            await hass.async_stop(force=True)
+
+    memory_current, memory_peak = memory
+    return ScenarioResult(
+        entries=entries,
+        entities=entities,
+        setup_seconds=round(setup_seconds, 3),
+        setup_loop_lag_max_ms=setup_lag_max,
+        refresh_p50_seconds=round(statistics.median(refreshes), 3),
+        loop_lag_p99_ms=monitor.percentile_ms(99),
+        loop_lag_max_ms=monitor.percentile_ms(100),
+        state_writes=state_writes,
+        state_writes_per_second=round(state_writes / sum(refreshes), 1),
+        memory_mib=round(memory_current, 2),
+        memory_peak_mib=round(memory_peak, 2),
+        memory_per_entity_kib=round(memory_current * 1024 / max(entities, 1), 2),
+    )
+
+
+def compare(
+    report: dict[str, Any], previous: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return the regressions of a report against a previous one."""
+    before = {scenario["entries"]: scenario for scenario in previous["scenarios"]}
+    regressions = []
+    for scenario in report["scenarios"]:
+        if (old := before.get(scenario["entries"])) is None:
+            continue
+        for metric in GATED_METRICS:
+            # Ignore regressions too small to measure reliably.
+            if old[metric] and scenario[metric] > max(
+                old[metric] * (1 + tolerance), old[metric] + 0.01
+            ):
+                regressions.append(
+                    f"{scenario['entries']} entries: {metric} {scenario[metric]}"
+                    f" > {old[metric]} (+{tolerance:.0%})"
+                )
+    return regressions
+
+
+def _print_table(results: list[ScenarioResult]) -> None:
+    """Print the results as a table."""
+    columns = list(asdict(results[0]))
+    widths = [max(len(column), 8) for column in columns]
+    print("  ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for result in results:
+        values = asdict(result).values()
+        print(
+            "  ".join(str(value).rjust(width) for value, width in zip(values, widths))
+        )
+
+
+async def _run(args: argparse.Namespace) -> list[ScenarioResult]:
+    """Run the scenarios one after the other."""
+    return [await run_scenario(entries, args) for entries in args.entries]
+
+
+def main() -> int:
+    """Run the simulator from the command line."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--entries", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=3, help="refresh rounds")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0,
+        help="limiter requests/s, 0 for unlimited, -1 for the integration default",
+    )
+    parser.add_argument(
+        "--no-trace-memory",
+        dest="trace_memory",
+        action="store_false",
+        help="skip tracemalloc, which slows everything down",
+    )
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    parser.add_argument("--compare", type=Path, help="previous report to gate against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(_run(args))
+    _print_table(results)
+
+    report = {
+        "version": json.loads(MANIFEST.read_text())["version"],
+        "python": platform.python_version(),
+        "trace_memory": args.trace_memory,
+        "scenarios": [asdict(result) for result in results],
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.compare:
+        if regressions := compare(
+            report, json.loads(args.compare.read_text()), args.tolerance
+        ):
+            print("\n".join(["Regressions:", *regressions]))
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Cold import time benchmark of the integration modules.
+
+Every module is imported in a fresh interpreter run with `-X importtime`,
+after the Home Assistant modules that are always loaded before an
+integration (core, config entries, the recorder dependency and the entity
+components of the platforms). Only the time of the modules imported on top
+of them is counted, the median of `--runs` imports is reported. The
+package is byte-compiled first, so source compilation is not measured.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --update
+
+The exit status is 1 when a module takes longer than its budget in
+benchmarks/import_budget.json, or directly imports one of its forbidden
+modules. --update rewrites the budgets from this machine, with --headroom.
+"""
+from __future__ import annotations
+
+import argparse
+import compileall
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import re
+import statistics
+import subprocess
+import sys
+
+PACKAGE = "custom_components.ute_energy"
+MODULES = (PACKAGE, f"{PACKAGE}.sensor", f"{PACKAGE}.config_flow")
+PRELOAD = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.storage",
+    "homeassistant.components.recorder",
+    "homeassistant.components.sensor",
+    "homeassistant.components.binary_sensor",
+)
+BUDGET = Path(__file__).with_name("import_budget.json")
+MARKER = "-- preloaded --"
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|( *)(\S+)")
+
+
+@dataclass
+class ImportResult:
+    """Measurements of a module."""
+
+    module: str
+    median_ms: float
+    min_ms: float
+    modules: int
+    direct: list[str]
+
+
+def _import_once(module: str) -> tuple[float, int, set[str]]:
+    """Import a module in a fresh interpreter.
+
+    Return the milliseconds spent on top of the preloaded modules, how many
+    modules were imported and the third-party modules imported directly by
+    the integration.
+    """
+    code = "; ".join(
+        [
+            *(f"import {name}" for name in PRELOAD),
+            "import sys",
+            f"sys.stderr.write({MARKER!r} + '\\n')",
+            f"import {module}",
+        ]
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+        text=True,
+    )
+    lines = process.stderr.partition(MARKER)[2].splitlines()
+    entries = [
+        (int(match.group(1)), len(match.group(2)) // 2, match.group(3))
+        for line in lines
+        if (match := _LINE.match(line))
+    ]
+
+    # Lines are printed after their children, reversed a parent comes first.
+    direct: set[str] = set()
+    parents: list[str] = []
+    for _, depth, name in reversed(entries):
+        del parents[depth:]
+        parent = parents[-1] if parents else ""
+        top = name.partition(".")[0]
+        if parent.startswith(PACKAGE) and top not in (
+            "custom_components",
+            "homeassistant",
+        ):
+            direct.add(top)
+        parents.append(name)
+
+    return sum(self_us for self_us, _, _ in entries) / 1000, len(entries), direct
+
+
+def measure(module: str, runs: int) -> ImportResult:
+    """Import a module runs times and summarize."""
+    samples, counts, direct = [], [], set()
+    for _ in range(runs):
+        elapsed, count, imported = _import_once(module)
+        samples.append(elapsed)
+        counts.append(count)
+        direct |= imported
+    return ImportResult(
+        module=module,
+        median_ms=round(statistics.median(samples), 1),
+        min_ms=round(min(samples), 1),
+        modules=max(counts),
+        direct=sorted(direct),
+    )
+
+
+def compare(results: list[ImportResult], budget: dict) -> list[str]:
+    """Return the budgets exceeded by the results."""
+    regressions = []
+    for result in results:
+        if (limits := budget.get(result.module)) is None:
+            continue
+        if result.median_ms > limits["max_ms"]:
+            regressions.append(
+                f"{result.module}: {result.median_ms} ms > {limits['max_ms']} ms"
+            )
+        if forbidden := sorted(set(result.direct) & set(limits.get("forbidden", []))):
+            regressions.append(f"{result.module}: imports {', '.join(forbidden)}")
+    return regressions
+
+
+def _print_table(results: list[ImportResult]) -> None:
+    """Print the results as a table."""
+    width = max(len(result.module) for result in results)
+    print(f"{'module'.ljust(width)}  median_ms  min_ms  modules  direct")
+    for result in results:
+        print(
+            f"{result.module.ljust(width)}  {result.median_ms:>9}  "
+            f"{result.min_ms:>6}  {result.modules:>7}  {' '.join(result.direct)}"
+        )
+
+
+def main() -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--modules", nargs="+", default=list(MODULES))
+    parser.add_argument("--runs", type=int, default=7, help="imports per module")
+    parser.add_argument("--budget", type=Path, default=BUDGET)
+    parser.add_argument(
+        "--update", action="store_true", help="rewrite the budgets from the results"
+    )
+    parser.add_argument("--headroom", type=float, default=1.0)
+    args = parser.parse_args()
+
+    root = Path(__file__).parent.parent
+    compileall.compile_dir(root / PACKAGE.replace(".", "/"), quiet=1)
+    results = [measure(module, args.runs) for module in args.modules]
+    _print_table(results)
+
+    budget = json.loads(args.budget.read_text()) if args.budget.exists() else {}
+    if args.update:
+        for result in results:
+            limits = budget.setdefault(result.module, {"forbidden": []})
+            limits["max_ms"] = round(result.median_ms * (1 + args.headroom), 1)
+        args.budget.write_text(json.dumps(budget, indent=2) + "\n")
+        return 0
+    if regressions := compare(results, budget):
+        print("\n".join(["Regressions:", *regressions]))
+        return 1
+    print("Within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,415 @@
+"""Local stand-in for the UTE API serving every path in ENDPOINTS.
+
+Fixtures are generated per account from a seed, so runs are repeatable.
+Tariffs, latency, slow endpoints, READING_INPROGRESS sequences, expired
+tokens (401) and forbidden accounts (403) are configured through
+MockUteConfig. MockUteApi answers in process, MockUteServer serves it over
+HTTP.
+
+Run standalone with `python -m benchmarks.mock_server --accounts 10`.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import datetime
+import itertools
+import json
+import random
+import re
+from typing import Any
+
+from aiohttp import web
+
+from custom_components.ute_energy.const import (
+    ACCOUNT_ID,
+    ACCOUNT_SERVICE_POINT_ADDRESS,
+    ACCOUNT_SERVICE_POINT_ID,
+    ACTIVE_CONSUMPTION,
+    AGREEMENT_INFO,
+    BASE_ACCOUNTS,
+    CONSUMPTION_ATTR,
+    CONTRACTED_POWER_ON_FLAT,
+    CONTRACTED_POWER_ON_PEAK,
+    CONTRACTED_POWER_ON_VALLEY,
+    CONTRACTED_TARIFF,
+    CONTRACTED_VOLTAGE,
+    CURRENT_CONSUMPTION,
+    CURRENT_STATUS,
+    CURRENT_VOLTAGE,
+    DATA,
+    ENDPOINTS,
+    GET_ACCOUNT_INFO,
+    ID,
+    INVOICE_INFO,
+    INVOICES,
+    LAST_READING,
+    MISC_BEHAVIOUR,
+    MONTH,
+    MONTH_CHARGES,
+    MONTH_CONSUMPTION,
+    PEAK_INFO,
+    READING_INPROGRESS,
+    READING_REQUEST,
+    READINGS,
+    REQUEST_CODE,
+    REQUEST_CONSUMPTION,
+    REQUEST_TOKEN,
+    RESPONSE_RESULT,
+    RESPONSE_STATUS,
+    SELECTED_PEAK,
+    SERVICE_AGREEMENT_ID,
+    SIMPLE_TARIFF,
+    SINGLE_SERIE,
+    TOKEN_TYPE,
+    TRIPLE_TARIFF,
+    VALIDATE_CODE,
+    VALOR,
+    VALUE,
+    YEAR,
+)
+
+FIRST_ACCOUNT_ID = 1000000
+PUBLIC_ENDPOINTS = {REQUEST_TOKEN, REQUEST_CODE, VALIDATE_CODE}
+
+
+@dataclass
+class MockUteConfig:
+    """Fixtures and faults served by the mock UTE API."""
+
+    accounts: int = 1
+    invoice_months: int = 24
+    chart_months: int = 13
+    # Seconds added to every response, plus up to `jitter` more.
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Extra seconds by endpoint key, for slow endpoints.
+    slow: dict[str, float] = field(default_factory=dict)
+    # lastReading answers READING_INPROGRESS until the n-th poll.
+    reading_polls: int = 1
+    # Account ids answered with 403.
+    forbidden: set[str] = field(default_factory=set)
+    # Contracted tariff of each account, in turns.
+    tariffs: tuple[str, ...] = (TRIPLE_TARIFF,)
+    seed: int = 0
+
+
+def _compile(template: str) -> re.Pattern[str]:
+    """Return a regex matching an endpoint path, one group per placeholder."""
+    return re.compile("^/api/" + re.escape(template).replace(r"\{\}", "([^/]+)") + "$")
+
+
+ROUTES: tuple[tuple[str, re.Pattern[str]], ...] = tuple(
+    (endpoint, _compile(template)) for endpoint, template in ENDPOINTS.items()
+)
+
+
+class MockUteApi:
+    """Fixtures and request handling of the mock UTE API."""
+
+    def __init__(self, config: MockUteConfig | None = None) -> None:
+        """Initialize."""
+        self.config = config or MockUteConfig()
+        self.calls: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self._random = random.Random(self.config.seed)
+        self._tokens: set[str] = set()
+        self._token_ids = itertools.count(1)
+        self._readings: dict[str, int] = {}
+        self.account_ids = [
+            str(FIRST_ACCOUNT_ID + index) for index in range(self.config.accounts)
+        ]
+        self._handlers: dict[str, Callable[[tuple[str, ...], dict[str, Any]], Any]] = {
+            REQUEST_TOKEN: self._request_token,
+            REQUEST_CODE: self._request_code,
+            VALIDATE_CODE: self._validate_code,
+            BASE_ACCOUNTS: self._base_accounts,
+            GET_ACCOUNT_INFO: self._get_account_info,
+            PEAK_INFO: self._peak_info,
+            MISC_BEHAVIOUR: self._misc_behaviour,
+            INVOICE_INFO: self._invoice_info,
+            REQUEST_CONSUMPTION: self._request_consumption,
+            READING_REQUEST: self._reading_request,
+            LAST_READING: self._last_reading,
+        }
+
+    @property
+    def total_calls(self) -> int:
+        """Return the number of requests served."""
+        return sum(self.calls.values())
+
+    def reset_stats(self) -> None:
+        """Clear the request counters."""
+        self.calls.clear()
+        self.statuses.clear()
+
+    def expire_tokens(self) -> None:
+        """Reject every issued token, the next requests get 401."""
+        self._tokens.clear()
+
+    def tariff(self, account_id: str) -> str:
+        """Return the contracted tariff of an account."""
+        index = int(account_id) - FIRST_ACCOUNT_ID
+        return self.config.tariffs[index % len(self.config.tariffs)]
+
+    async def async_respond(
+        self, path: str, authorization: str | None, body: str | None
+    ) -> tuple[int, str]:
+        """Answer a request, applying latency and faults.
+
+        Return the status and the body of the response.
+        """
+        # The client joins some paths with a double slash.
+        path = re.sub("/+", "/", path)
+        for endpoint, pattern in ROUTES:
+            if match := pattern.match(path):
+                break
+        else:
+            return self._count(404, json.dumps({RESPONSE_STATUS: False}))
+
+        self.calls[endpoint] += 1
+        delay = self.config.latency + self.config.slow.get(endpoint, 0.0)
+        if self.config.jitter:
+            delay += self._random.uniform(0, self.config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if endpoint not in PUBLIC_ENDPOINTS and not self._authorized(authorization):
+            return self._count(401, "Token expired")
+
+        args = match.groups()
+        payload: dict[str, Any] = json.loads(body or "null") or {}
+        account_id = args[0] if args else payload.get(ACCOUNT_SERVICE_POINT_ID)
+        if str(account_id) in self.config.forbidden:
+            return self._count(403, "Forbidden")
+
+        content = self._handlers[endpoint](args, payload)
+        return self._count(
+            200, content if isinstance(content, str) else json.dumps(content)
+        )
+
+    def _count(self, status: int, text: str) -> tuple[int, str]:
+        """Count a response status."""
+        self.statuses[status] += 1
+        return status, text
+
+    def _authorized(self, authorization: str | None) -> bool:
+        """Return True if the request carries a live token."""
+        header = authorization or ""
+        return header.removeprefix(f"{TOKEN_TYPE} ") in self._tokens
+
+    def _account_random(self, account_id: str, salt: str) -> random.Random:
+        """Return a generator seeded by account, so fixtures are stable."""
+        return random.Random(f"{self.config.seed}:{account_id}:{salt}")
+
+    def _months(self, count: int) -> list[datetime.date]:
+        """Return the first day of the last count months, newest first."""
+        month = datetime.date.today().replace(day=1)
+        months = []
+        for _ in range(count):
+            months.append(month)
+            month = (month - datetime.timedelta(days=1)).replace(day=1)
+        return months
+
+    def _request_token(self, args: tuple[str, ...], payload: dict[str, Any]) -> Any:
+        """Issue a new token."""
+        token = f"mock-token-{next(self._token_ids)}"
+        self._tokens.add(token)
+        return token
+
+    def _request_code(self, args: tuple[str, ...], payload: dict[str, Any]) -> Any:
+        """Accept an auth code request."""
+        return {RESPONSE_STATUS: True, DATA: None}
+
+    def _validate_code(self, args: tuple[str, ...], payload: dict[str, Any]) -> Any:
+        """Accept any auth code."""
+        return {RESPONSE_STATUS: True, DATA: None}
+
+    def _base_accounts(self, args: tuple[str, ...], payload: dict[str, Any]) -> Any:
+        """Return the service points of the user."""
+        return {
+            RESPONSE_STATUS: True,
+            DATA: [
+                {
+                    ACCOUNT_SERVICE_POINT_ID: int(account_id),
+                    ACCOUNT_ID: f"A{account_id}",
+                    ACCOUNT_SERVICE_POINT_ADDRESS: f"Calle {index + 1} 1234",
+                }
+                for index, account_id in enumerate(self.account_ids)
+            ],
+        }
+
+    def _get_account_info(self, args: tuple[str, ...], payload: dict[str, Any]) -> Any:
+        """Return the agreement of a service point."""
+        rand = self._account_random(args[0], GET_ACCOUNT_INFO)
+        power = rand.choice((3.3, 4.4, 6.6, 9.2))
+        return {
+            RESPONSE_STATUS: True,
+            DATA: {
+                AGREEMENT_INFO: {
+                    SERVICE_AGREEMENT_ID: int(args[0]) * 10,
+                    CONTRACTED_TARIFF: self.tariff(args[0]),
+                    CONTRACTED_VOLTAGE: "230",
+                    CONTRACTED_POWER_ON_PEAK: power,
+                    CONTRACTED_POWER_ON_VALLEY: power,
+                    CONTRACTED_POWER_ON_FLAT: power,
+                }
+            },
+        }
+
+    def _peak_info(self, args: tuple[str, ...], payload: dict[str, Any]) -> Any:
+        """Return the selected peak start."""
+        hour = self._account_random(args[0], PEAK_INFO).choice((17, 18, 19))
+        return {RESPONSE_STATUS: True, DATA: {SELECTED_PEAK: f"{hour}:00"}}
+
+    def _misc_behaviour(self, args: tuple[str, ...], payload: dict[str, Any]) -> Any:
+        """Report peak selection as available, except on the simple tariff."""
+        account_id = str(payload.get(ACCOUNT_SERVICE_POINT_ID))
+        return {RESPONSE_STATUS: self.tariff(account_id) != SIMPLE_TARIFF, DATA: None}
+
+    def _invoice_info(self, args: tuple[str, ...], payload: dict[str, Any]) -> Any:
+        """Return the newest invoices, as many as the page size."""
+        account_id, page_size = args
+        rand = self._account_random(account_id, INVOICE_INFO)
+        # The current month is not billed yet.
+        months = self._months(self.config.invoice_months + 1)[1:]
+        invoices = [
+            {
+                ID: index + 1,
+                YEAR: month.year,
+                MONTH: month.month,
+                MONTH_CHARGES: round(rand.uniform(1500, 6000), 2),
+            }
+            for index, month in enumerate(months)
+        ]
+        return {RESPONSE_STATUS: True, DATA: {INVOICES: invoices[: int(page_size)]}}
+
+    def _request_consumption(
+        self, args: tuple[str, ...], payload: dict[str, Any]
+    ) -> Any:
+        """Return the monthly consumption chart, current month last."""
+        rand = self._account_random(args[0], REQUEST_CONSUMPTION)
+        months = reversed(self._months(self.config.chart_months))
+        series = [
+            {
+                ID: index + 1,
+                MONTH_CONSUMPTION: int(
+                    datetime.datetime.combine(month, datetime.time()).timestamp() * 1000
+                ),
+                VALUE: round(rand.uniform(120, 650), 1),
+            }
+            for index, month in enumerate(months)
+        ]
+        return {
+            RESPONSE_STATUS: True,
+            DATA: [{ACTIVE_CONSUMPTION: {SINGLE_SERIE: series}}],
+        }
+
+    def _reading_request(self, args: tuple[str, ...], payload: dict[str, Any]) -> Any:
+        """Start a remote reading, pending for `reading_polls` polls."""
+        account_id = str(payload.get(ACCOUNT_SERVICE_POINT_ID))
+        self._readings[account_id] = self.config.reading_polls
+        return {RESPONSE_STATUS: True, DATA: None}
+
+    def _last_reading(self, args: tuple[str, ...], payload: dict[str, Any]) -> Any:
+        """Return READING_INPROGRESS until the reading is ready."""
+        account_id = args[0]
+        polls = self._readings.get(account_id, 1) - 1
+        self._readings[account_id] = polls
+        if polls > 0:
+            return {
+                RESPONSE_STATUS: True,
+                RESPONSE_RESULT: READING_INPROGRESS,
+                DATA: None,
+            }
+
+        readings = {
+            CURRENT_STATUS: "true",
+            CURRENT_VOLTAGE: f"{self._random.uniform(225, 235):.1f}",
+            CURRENT_CONSUMPTION: f"{self._random.uniform(0.2, 12):.2f}",
+        }
+        return {
+            RESPONSE_STATUS: True,
+            RESPONSE_RESULT: 0,
+            DATA: {
+                READINGS: [
+                    {CONSUMPTION_ATTR: name, VALOR: value}
+                    for name, value in readings.items()
+                ]
+            },
+        }
+
+
+class MockUteServer(MockUteApi):
+    """aiohttp application answering like rocme.ute.com.uy."""
+
+    def __init__(self, config: MockUteConfig | None = None) -> None:
+        """Initialize."""
+        super().__init__(config)
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Listen on host and port, return the base URL of the API."""
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        self.url = f"http://{host}:{self._runner.addresses[0][1]}/api/"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Answer an HTTP request."""
+        status, text = await self.async_respond(
+            request.path,
+            request.headers.get("Authorization"),
+            await request.text() if request.can_read_body else None,
+        )
+        return web.Response(status=status, text=text)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Serve until interrupted."""
+    server = MockUteServer(
+        MockUteConfig(
+            accounts=args.accounts,
+            latency=args.latency,
+            jitter=args.jitter,
+            reading_polls=args.reading_polls,
+        )
+    )
+    url = await server.start(args.host, args.port)
+    print(f"Mock UTE API listening on {url}, accounts: {server.account_ids}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    """Run the mock UTE API from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--reading-polls", type=int, default=1)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,62 @@
 """The UTE Energy integration."""
 from __future__ import annotations
 
+import asyncio
+from datetime import timedelta
+from functools import partial
 import logging
+import time
 import homeassistant.helpers.entity_registry as er
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers.device_registry import DeviceEntry
 
-from .ute_energy import UteEnergy
-from .coordinator import UteEnergyDataUpdateCoordinator
+from .hub import UteEnergyHub, async_get_hub, async_release_hub
+from .coordinator import COORDINATORS, UteEnergyDataUpdateCoordinator
+from .snapshots import async_get_snapshot_store
+from .token_store import async_get_token_store
+from .statistics import UteEnergyStatisticsImporter
+from .utils import credentials_key
 
 from .const import (
     ACCOUNT_ID,
     ACCOUNT_SERVICE_POINT_ID,
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_MIN_INTERVAL,
+    ADAPTIVE_SENSITIVITY,
+    CACHE,
+    CACHE_TTL,
     CONNECTION,
+    CONF_ADAPTIVE,
+    CONF_ADAPTIVE_MAX,
+    CONF_ADAPTIVE_MIN,
+    CONF_ADAPTIVE_SENSITIVITY,
+    CONF_LIMITER_BURST,
+    CONF_LIMITER_MAX_CONCURRENCY,
+    CONF_LIMITER_RATE,
+    CONF_READING_MIN_INTERVAL,
+    CONF_SAMPLING,
+    CONF_SAMPLING_INTERVAL,
+    CONF_SAMPLING_SIZE,
     CONF_USER_EMAIL,
     CONF_USER_PHONE,
     DEFAULT_NAME,
     DOMAIN,
     ENTRY_NAME,
-    ENTRY_COORDINATOR,
+    ENTRY_COORDINATORS,
+    ENTRY_HUB,
+    ENTRY_STATISTICS,
+    HUBS,
+    LIMITER_BURST,
+    LIMITER_MAX_CONCURRENCY,
+    LIMITER_RATE,
+    SAMPLING_INTERVAL,
+    SAMPLING_SIZE,
+    SERVICE_CLEAR_CACHE,
+    TIER_BILLING,
+    TIER_READING,
     UPDATE_LISTENER,
 )
 
@@ -35,40 +70,185 @@ PLATFORMS: list[Platform] = [
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up UTE Energy from a config entry."""
+    start = time.monotonic()
     email = entry.data[CONNECTION][CONF_USER_EMAIL]
     phone = entry.data[CONNECTION][CONF_USER_PHONE]
     account_id = entry.data[ENTRY_NAME]
     account_service_point_id = entry.data[CONNECTION][ACCOUNT_SERVICE_POINT_ID]
 
-    ute_api = UteEnergy(email, phone)
+    hub = await async_get_hub(hass, entry.entry_id, email, phone)
 
-    coordinator = UteEnergyDataUpdateCoordinator(
-        hass, ute_api, entry.entry_id, account_service_point_id
+    coordinators = {
+        coordinator_class.tier: coordinator_class(
+            hass, hub, entry.entry_id, account_service_point_id
+        )
+        for coordinator_class in COORDINATORS
+    }
+    if entry.options.get(CONF_SAMPLING, False):
+        coordinators[TIER_READING].async_enable_sampling(
+            entry.options.get(CONF_SAMPLING_INTERVAL, SAMPLING_INTERVAL),
+            entry.options.get(CONF_SAMPLING_SIZE, SAMPLING_SIZE),
+        )
+    elif entry.options.get(CONF_ADAPTIVE, False):
+        coordinators[TIER_READING].async_enable_adaptive_interval(
+            timedelta(
+                minutes=entry.options.get(CONF_ADAPTIVE_MIN, ADAPTIVE_MIN_INTERVAL)
+            ),
+            timedelta(
+                minutes=entry.options.get(CONF_ADAPTIVE_MAX, ADAPTIVE_MAX_INTERVAL)
+            ),
+            entry.options.get(CONF_ADAPTIVE_SENSITIVITY, ADAPTIVE_SENSITIVITY) / 100,
+        )
+    if (limiter := hub.client.limiter) is not None:
+        limiter.set_limits(
+            entry.entry_id,
+            entry.options.get(CONF_LIMITER_RATE, LIMITER_RATE),
+            entry.options.get(CONF_LIMITER_BURST, LIMITER_BURST),
+            entry.options.get(CONF_LIMITER_MAX_CONCURRENCY, LIMITER_MAX_CONCURRENCY),
+        )
+    if CONF_READING_MIN_INTERVAL in entry.options:
+        hub.client.reading_min_intervals[account_service_point_id] = entry.options[
+            CONF_READING_MIN_INTERVAL
+        ]
+    for coordinator in coordinators.values():
+        hub.async_register(coordinator)
+
+    snapshots = await async_get_snapshot_store(hass)
+    restored = [
+        coordinator
+        for coordinator in coordinators.values()
+        if coordinator.async_restore(snapshots)
+    ]
+    try:
+        await asyncio.gather(
+            *(
+                coordinator.async_config_entry_first_refresh()
+                for coordinator in coordinators.values()
+                if coordinator not in restored
+            )
+        )
+    except Exception:
+        await _async_release_coordinators(hass, entry, hub, coordinators)
+        raise
+
+    statistics = UteEnergyStatisticsImporter(
+        hass, coordinators[TIER_BILLING], account_id
     )
-    await coordinator.async_config_entry_first_refresh()
+    statistics.async_start()
 
     hass.data.setdefault(DOMAIN, {})
 
     hass.data[DOMAIN][entry.entry_id] = {
         ENTRY_NAME: DEFAULT_NAME,
         ACCOUNT_ID: account_id,
-        ENTRY_COORDINATOR: coordinator,
+        ENTRY_COORDINATORS: coordinators,
+        ENTRY_HUB: hub,
+        ENTRY_STATISTICS: statistics,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     update_listener = entry.add_update_listener(async_update_options)
     hass.data[DOMAIN][entry.entry_id][UPDATE_LISTENER] = update_listener
+
+    if not hass.services.has_service(DOMAIN, SERVICE_CLEAR_CACHE):
+        hass.services.async_register(
+            DOMAIN, SERVICE_CLEAR_CACHE, partial(async_clear_cache, hass)
+        )
+
+    if restored:
+        entry.async_create_background_task(
+            hass,
+            _async_first_refresh(account_id, restored),
+            f"{DOMAIN} first refresh {account_id}",
+        )
+    _LOGGER.debug(
+        "Set up %s in %.3f s, %s of %s tiers restored",
+        account_id,
+        time.monotonic() - start,
+        len(restored),
+        len(coordinators),
+    )
     return True
 
 
+async def _async_first_refresh(
+    account_id: str, coordinators: list[UteEnergyDataUpdateCoordinator]
+) -> None:
+    """Replace the restored data with live data."""
+    start = time.monotonic()
+    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+    _LOGGER.debug(
+        "First refresh of %s done in %.3f s", account_id, time.monotonic() - start
+    )
+
+
+async def async_clear_cache(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Drop cached UTE responses, optionally for a single service point."""
+    account_service_point_id = call.data.get(ACCOUNT_SERVICE_POINT_ID)
+    hass.data[DOMAIN][CACHE].invalidate(account_service_point_id)
+    for hub in hass.data[DOMAIN].get(HUBS, {}).values():
+        hub.client.forget_sections(account_service_point_id, CACHE_TTL)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    hub: UteEnergyHub = hass.data[DOMAIN][entry.entry_id][ENTRY_HUB]
+    hub.async_remove_metrics_platform(entry.entry_id)
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        hub.async_release_metrics(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data[ENTRY_STATISTICS].async_stop()
+        await _async_release_coordinators(
+            hass, entry, entry_data[ENTRY_HUB], entry_data[ENTRY_COORDINATORS]
+        )
+        if not any(
+            other.state is ConfigEntryState.LOADED
+            for other in hass.config_entries.async_entries(DOMAIN)
+            if other.entry_id != entry.entry_id
+        ):
+            hass.services.async_remove(DOMAIN, SERVICE_CLEAR_CACHE)
 
     return unload_ok
 
 
+async def _async_release_coordinators(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    hub: UteEnergyHub,
+    coordinators: dict[str, UteEnergyDataUpdateCoordinator],
+) -> None:
+    """Detach the entry coordinators from the hub and release it."""
+    for coordinator in coordinators.values():
+        hub.async_unregister(coordinator)
+    account_service_point_id = entry.data[CONNECTION][ACCOUNT_SERVICE_POINT_ID]
+    hub.client.cancel_reading(account_service_point_id)
+    hub.client.reading_min_intervals.pop(account_service_point_id, None)
+    if (limiter := hub.client.limiter) is not None:
+        limiter.remove_limits(entry.entry_id)
+    await async_release_hub(hass, hub, entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the persisted data of a removed config entry."""
+    snapshots = await async_get_snapshot_store(hass)
+    snapshots.remove(entry.entry_id)
+
+    email = entry.data[CONNECTION][CONF_USER_EMAIL]
+    phone = entry.data[CONNECTION][CONF_USER_PHONE]
+    key = credentials_key(email, phone)
+    if not any(
+        credentials_key(
+            other.data[CONNECTION][CONF_USER_EMAIL],
+            other.data[CONNECTION][CONF_USER_PHONE],
+        )
+        == key
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        token_store = await async_get_token_store(hass)
+        token_store.remove(email, phone)
+
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update options."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,179 @@
+"""Consumption and bill forecasts from the downloaded UTE history.
+
+The monthly consumption chart and the invoice list are turned into NumPy
+arrays indexed by month number (year * 12 + month - 1), from which the
+seasonal baseline of the current month, the year-over-year change of the
+last billed month and the end-of-month kWh and $U are computed. Forecasts
+are cached until the history or the day changes.
+
+NumPy is not imported with this module, the sensor platform imports it in
+the executor when the forecast sensors are about to be added.
+"""
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+from .invoices import InvoiceStore
+from .models import ConsumptionPoint
+from .statistics import MonthlyPoints, cost_points, energy_points
+
+if TYPE_CHECKING:
+    import numpy as np
+
+PRICE_MONTHS: int = 3
+
+
+@dataclass(frozen=True)
+class Forecast:
+    """Forecast of the month in progress."""
+
+    baseline: float | None = None
+    year_over_year: float | None = None
+    month_to_date: float | None = None
+    consumption: float | None = None
+    price: float | None = None
+    charges: float | None = None
+
+
+def _month_number(moment: datetime.date) -> int:
+    """Return the month number of a date."""
+    return moment.year * 12 + moment.month - 1
+
+
+def _arrays(points: MonthlyPoints) -> tuple[np.ndarray, np.ndarray]:
+    """Return the month numbers and values of monthly points."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    months = np.fromiter(
+        (_month_number(start) for start, _ in points), dtype=np.int64, count=len(points)
+    )
+    values = np.fromiter(
+        (value for _, value in points), dtype=np.float64, count=len(points)
+    )
+    return months, values
+
+
+def seasonal_baseline(
+    months: np.ndarray, values: np.ndarray, current: int
+) -> float | None:
+    """Return the mean of the same calendar month in previous years.
+
+    Without that month in the history, the mean of the last 12 months.
+    """
+    past = months < current
+    same_month = past & (months % 12 == current % 12)
+    for mask in (same_month, past & (months >= current - 12)):
+        if mask.any():
+            return float(values[mask].mean())
+    return None
+
+
+def year_over_year(
+    months: np.ndarray, values: np.ndarray, current: int
+) -> float | None:
+    """Return the % change of the last completed month against a year before."""
+    last, previous = values[months == current - 1], values[months == current - 13]
+    if not last.size or not previous.size or not previous[0]:
+        return None
+    return float((last[0] - previous[0]) / previous[0] * 100)
+
+
+def effective_price(
+    energy: tuple[np.ndarray, np.ndarray], costs: tuple[np.ndarray, np.ndarray]
+) -> float | None:
+    """Return the median $U/kWh of the latest months both billed and charted."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    _, energy_index, cost_index = np.intersect1d(
+        energy[0], costs[0], assume_unique=True, return_indices=True
+    )
+    kwh, charges = energy[1][energy_index], costs[1][cost_index]
+    valid = kwh > 0
+    if not valid.any():
+        return None
+    return float(np.median((charges[valid] / kwh[valid])[-PRICE_MONTHS:]))
+
+
+def compute_forecast(
+    energy: MonthlyPoints,
+    costs: MonthlyPoints,
+    month_to_date: float | None,
+    today: datetime.date,
+) -> Forecast:
+    """Forecast the month of today from completed months and its partial kWh.
+
+    The rest of the month is expected to follow the seasonal baseline, so the
+    forecast moves from the baseline to the measured kWh as the month goes by.
+    """
+    current = _month_number(today)
+    energy_arrays, cost_arrays = _arrays(energy), _arrays(costs)
+    baseline = seasonal_baseline(*energy_arrays, current)
+    remaining = 1 - today.day / calendar.monthrange(today.year, today.month)[1]
+
+    if month_to_date is None:
+        consumption = baseline
+    elif baseline is None:
+        consumption = month_to_date / (1 - remaining) if remaining < 1 else None
+    else:
+        consumption = month_to_date + remaining * baseline
+
+    price = effective_price(energy_arrays, cost_arrays)
+    if consumption is not None and price is not None:
+        charges = consumption * price
+    else:
+        charges = seasonal_baseline(*cost_arrays, current)
+
+    return Forecast(
+        baseline=baseline,
+        year_over_year=year_over_year(*energy_arrays, current),
+        month_to_date=month_to_date,
+        consumption=consumption,
+        price=price,
+        charges=charges,
+    )
+
+
+def month_to_date(series: list[ConsumptionPoint], today: datetime.date) -> float | None:
+    """Return the kWh charted so far for the month of today."""
+    for point in series:
+        if not point.id or not point.timestamp:
+            continue
+        moment = dt_util.as_local(dt_util.utc_from_timestamp(point.timestamp / 1000))
+        if (moment.year, moment.month) == (today.year, today.month):
+            return float(point.value or 0)
+    return None
+
+
+class ForecastCache:
+    """Forecast of a service point, recomputed when its history changes."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._key: tuple[Any, ...] | None = None
+        self._forecast = Forecast()
+
+    def get(
+        self, series: list[ConsumptionPoint], invoices: InvoiceStore | None
+    ) -> Forecast:
+        """Return the forecast of the history, computing it if changed."""
+        today = dt_util.now().date()
+        key = (
+            today,
+            tuple((point.timestamp, point.value) for point in series),
+            id(invoices),
+            invoices.version if invoices is not None else None,
+        )
+        if key != self._key:
+            self._forecast = compute_forecast(
+                energy_points(series),
+                cost_points(invoices.as_list() if invoices is not None else []),
+                month_to_date(series, today),
+                today,
+            )
+            self._key = key
+        return self._forecast
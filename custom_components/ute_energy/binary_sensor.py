@@ -4,6 +4,7 @@ from __future__ import annotations
 from collections.abc import Callable
 from dataclasses import dataclass
 import logging
+from typing import Any
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -13,22 +14,23 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.typing import StateType
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import EntityCategory
 
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .coordinator import UteEnergyDataUpdateCoordinator
-from .utils import extract_entity_id
+from .utils import async_add_entity_groups, extract_entity_id, has_values
 
 from .const import (
     ACCOUNT_ID,
     ATTRIBUTION,
     CURRENT_STATUS,
     DOMAIN,
-    ENTRY_COORDINATOR,
+    ENTRY_COORDINATORS,
     ENTRY_NAME,
+    TIER_READING,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -63,22 +65,28 @@ async def async_setup_entry(
     domain_data = hass.data[DOMAIN][config_entry.entry_id]
     name = domain_data[ENTRY_NAME]
     account_id = domain_data[ACCOUNT_ID]
-    coordinator = domain_data[ENTRY_COORDINATOR]
-
-    entities: list[AbstractUteEnergyBinarySensor] = []
-    if coordinator.data.get(CURRENT_STATUS, None):
-        entities: list[AbstractUteEnergyBinarySensor] = [
-            UteEnergyBinarySensor(
-                name,
-                account_id,
-                f"{config_entry.unique_id}_{account_id}_{description.key}",
-                description,
-                coordinator,
+    coordinator = domain_data[ENTRY_COORDINATORS][TIER_READING]
+
+    async_add_entity_groups(
+        config_entry,
+        (coordinator,),
+        [
+            (
+                lambda: has_values(coordinator, (CURRENT_STATUS,)),
+                lambda: [
+                    UteEnergyBinarySensor(
+                        name,
+                        account_id,
+                        f"{config_entry.unique_id}_{account_id}_{description.key}",
+                        description,
+                        coordinator,
+                    )
+                    for description in BINARY_SENSOR_TYPES
+                ],
             )
-            for description in BINARY_SENSOR_TYPES
-        ]
-
-    async_add_entities(entities)
+        ],
+        async_add_entities,
+    )
 
 
 class AbstractUteEnergyBinarySensor(BinarySensorEntity):
@@ -97,6 +105,7 @@ class AbstractUteEnergyBinarySensor(BinarySensorEntity):
         """Initialize the sensor."""
         self.entity_description = description
         self._coordinator = coordinator
+        self._written: tuple[Any, ...] | None = None
 
         self._attr_name = f"{name} {description.name}"
         self._attr_unique_id = unique_id
@@ -109,9 +118,27 @@ class AbstractUteEnergyBinarySensor(BinarySensorEntity):
     async def async_added_to_hass(self) -> None:
         """Connect to dispatcher listening for entity data notifications."""
         self.async_on_remove(
-            self._coordinator.async_add_listener(self.async_write_ha_state)
+            self._coordinator.async_add_listener(self._async_write_if_changed)
         )
 
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return what a state write would publish."""
+        return (self.available, self.is_on, self.extra_state_attributes)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember what was written."""
+        self._written = self._state_fingerprint()
+        super().async_write_ha_state()
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write the state only if value, attributes or availability changed."""
+        if (fingerprint := self._state_fingerprint()) == self._written:
+            return
+        self._written = fingerprint
+        super().async_write_ha_state()
+
     async def async_update(self) -> None:
         """Get the latest data from Ute API and updates the states."""
         await self._coordinator.async_request_refresh()
@@ -0,0 +1,260 @@
+"""Circuit breakers guarding the UTE API."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .exceptions import UteApiCircuitOpen, UteEnergyException
+from .const import (
+    BREAKER_CLOSED,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_HALF_OPEN,
+    BREAKER_HOST_FAILURE_THRESHOLD,
+    BREAKER_MAX_RESET_TIMEOUT,
+    BREAKER_OPEN,
+    BREAKER_RESET_TIMEOUT,
+    BREAKERS,
+    DOMAIN,
+    HOST,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+
+def is_transient_failure(error: BaseException) -> bool:
+    """Return True if an error means the API, not the request, is failing."""
+    if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+        return True
+    return isinstance(error, UteEnergyException) and (error.status in TRANSIENT_STATUS)
+
+
+class CircuitBreaker:
+    """Closed, open and half-open breaker of a single endpoint or host.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    calls fail fast. Once the reset timeout elapsed a single probe is let
+    through while other calls wait for its verdict: success closes the
+    breaker, failure opens it again with the timeout doubled up to
+    `max_reset_timeout`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        max_reset_timeout: float = BREAKER_MAX_RESET_TIMEOUT,
+        on_change: Callable[[CircuitBreaker], None] | None = None,
+    ) -> None:
+        """Initialize."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+        self._verdict: asyncio.Event | None = None
+        self._on_change = on_change
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds left before a probe is allowed."""
+        if self.state != BREAKER_OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    @property
+    def probe_in_flight(self) -> bool:
+        """Return True while a half-open probe waits for its response."""
+        return self.state == BREAKER_HALF_OPEN and self.probing
+
+    async def async_wait_probe(self) -> None:
+        """Wait until the probe in flight got a verdict or was given back."""
+        if self.probe_in_flight and self._verdict is not None:
+            await self._verdict.wait()
+
+    def allow(self) -> bool:
+        """Return True if a call may go through, claiming the probe if needed."""
+        if self.state == BREAKER_OPEN:
+            if self.retry_in > 0:
+                return False
+            self._set_state(BREAKER_HALF_OPEN)
+        if self.state == BREAKER_HALF_OPEN:
+            if self.probing:
+                return False
+            self.probing = True
+            self._verdict = asyncio.Event()
+        return True
+
+    def release(self) -> None:
+        """Give back a probe whose call ended without a verdict."""
+        self._end_probe()
+
+    def _end_probe(self) -> None:
+        """Wake the calls waiting on the probe."""
+        self.probing = False
+        if self._verdict is not None:
+            self._verdict.set()
+            self._verdict = None
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self.failures = 0
+        self.reset_timeout = self.base_reset_timeout
+        self.opened_at = None
+        self._set_state(BREAKER_CLOSED)
+        self._end_probe()
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker on threshold or failed probe."""
+        self.failures += 1
+        if self.state == BREAKER_HALF_OPEN:
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            self._open()
+            self._end_probe()
+        elif self.state == BREAKER_CLOSED and self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        """Open the breaker for the current reset timeout."""
+        self.opened_at = time.monotonic()
+        self._set_state(BREAKER_OPEN)
+        _LOGGER.warning(
+            "UTE API %s failing, pausing calls for %s s",
+            self.name,
+            int(self.reset_timeout),
+        )
+
+    def _set_state(self, state: str) -> None:
+        """Change state and notify."""
+        if state == self.state:
+            return
+        _LOGGER.debug("Circuit breaker %s: %s -> %s", self.name, self.state, state)
+        self.state = state
+        if self._on_change is not None:
+            self._on_change(self)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(self.retry_in),
+        }
+
+
+class CircuitBreakers:
+    """Breaker of the UTE host plus one breaker per endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.host = CircuitBreaker(
+            HOST,
+            failure_threshold=BREAKER_HOST_FAILURE_THRESHOLD,
+            on_change=self._async_changed,
+        )
+        self.endpoints: dict[str, CircuitBreaker] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    def endpoint(self, endpoint: str) -> CircuitBreaker:
+        """Return the breaker of an endpoint."""
+        if (breaker := self.endpoints.get(endpoint)) is None:
+            breaker = self.endpoints[endpoint] = CircuitBreaker(
+                endpoint, on_change=self._async_changed
+            )
+        return breaker
+
+    @property
+    def state(self) -> str:
+        """Return the host state, or the worst endpoint state."""
+        states = {self.host.state}
+        states.update(breaker.state for breaker in self.endpoints.values())
+        for state in (BREAKER_OPEN, BREAKER_HALF_OPEN):
+            if state in states:
+                return state
+        return BREAKER_CLOSED
+
+    @asynccontextmanager
+    async def guard(self, endpoint: str) -> AsyncIterator[None]:
+        """Fail fast while open and record the outcome of the call.
+
+        Calls arriving while a probe is in flight wait for its verdict
+        instead of failing, so requests fetched together do not cancel the
+        probe by failing fast next to it.
+        """
+        breakers = (self.host, self.endpoint(endpoint))
+        while probe := next(
+            (breaker for breaker in breakers if breaker.probe_in_flight), None
+        ):
+            await probe.async_wait_probe()
+        for breaker in breakers:
+            if not breaker.allow():
+                for claimed in breakers:
+                    if claimed is breaker:
+                        break
+                    claimed.release()
+                raise UteApiCircuitOpen(
+                    f"UTE API {breaker.name} unavailable, "
+                    f"retry in {int(breaker.retry_in)} s"
+                )
+        try:
+            yield
+        except BaseException as error:
+            for breaker in breakers:
+                if is_transient_failure(error):
+                    breaker.record_failure()
+                elif isinstance(error, Exception):
+                    # The API answered, it is up even if the request failed.
+                    breaker.record_success()
+                else:
+                    breaker.release()
+            raise
+        for breaker in breakers:
+            breaker.record_success()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback on every state change."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def _async_changed(self, _: CircuitBreaker) -> None:
+        """Notify listeners."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every breaker for diagnostics."""
+        return {
+            "host": self.host.as_dict(),
+            "endpoints": {
+                endpoint: breaker.as_dict()
+                for endpoint, breaker in self.endpoints.items()
+            },
+        }
+
+
+def get_breakers(hass: HomeAssistant) -> CircuitBreakers:
+    """Return the breakers shared by every UTE API client."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (breakers := domain_data.get(BREAKERS)) is None:
+        breakers = domain_data[BREAKERS] = CircuitBreakers()
+    return breakers
@@ -0,0 +1,136 @@
+"""Persistent TTL cache for near static UTE API endpoints."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CACHE,
+    CACHE_SAVE_DELAY,
+    CACHE_STORAGE_KEY,
+    CACHE_TTL,
+    DOMAIN,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters of a cached endpoint."""
+
+    hits: int = 0
+    misses: int = 0
+
+
+class UteEnergyCache:
+    """Cache parsed endpoint responses per account with a TTL per endpoint.
+
+    Entries are persisted through the Store helper so they survive restarts.
+    Expired entries are kept until overwritten so callers can compare the new
+    response with the previous one.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, CACHE_STORAGE_KEY
+        )
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._load_task: asyncio.Task | None = None
+        self.stats: dict[str, CacheStats] = {}
+
+    async def async_load(self) -> None:
+        """Load persisted entries once."""
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Read entries from storage."""
+        if stored := await self._store.async_load():
+            self._entries = stored.get("entries", {})
+        _LOGGER.debug("Loaded %s cached UTE responses", len(self._entries))
+
+    def get(self, endpoint: str, account_id: str) -> Any | None:
+        """Return a cached value or None when missing or expired."""
+        stats = self.stats.setdefault(endpoint, CacheStats())
+        entry = self._entries.get(self._key(endpoint, account_id))
+        if entry is None or entry["expires"] <= time.time():
+            stats.misses += 1
+            return None
+        stats.hits += 1
+        return entry["value"]
+
+    def peek(self, endpoint: str, account_id: str) -> Any | None:
+        """Return the last stored value, even if expired."""
+        if entry := self._entries.get(self._key(endpoint, account_id)):
+            return entry["value"]
+        return None
+
+    def set(self, endpoint: str, account_id: str, value: Any) -> None:
+        """Store a value for the endpoint TTL."""
+        self._entries[self._key(endpoint, account_id)] = {
+            "expires": time.time() + CACHE_TTL[endpoint],
+            "value": value,
+        }
+        self._async_schedule_save()
+
+    def invalidate(
+        self, account_id: str | None = None, endpoint: str | None = None
+    ) -> None:
+        """Drop cached entries of an account and/or endpoint, or all of them."""
+        self._entries = {
+            key: entry
+            for key, entry in self._entries.items()
+            if not self._matches(key, account_id, endpoint)
+        }
+        _LOGGER.debug(
+            "Cache invalidated, account: %s, endpoint: %s", account_id, endpoint
+        )
+        self._async_schedule_save()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache counters for diagnostics."""
+        return {
+            "entries": len(self._entries),
+            "endpoints": {
+                endpoint: asdict(stats) for endpoint, stats in self.stats.items()
+            },
+        }
+
+    def _async_schedule_save(self) -> None:
+        """Persist entries after a short delay."""
+        self._store.async_delay_save(
+            lambda: {"entries": self._entries}, CACHE_SAVE_DELAY
+        )
+
+    @staticmethod
+    def _key(endpoint: str, account_id: str) -> str:
+        """Return the storage key of an entry."""
+        return f"{endpoint}|{account_id}"
+
+    @staticmethod
+    def _matches(key: str, account_id: str | None, endpoint: str | None) -> bool:
+        """Return True if the entry key matches the given filters."""
+        key_endpoint, _, key_account_id = key.partition("|")
+        return (endpoint is None or key_endpoint == endpoint) and (
+            account_id is None or key_account_id == str(account_id)
+        )
+
+
+async def async_get_cache(hass: HomeAssistant) -> UteEnergyCache:
+    """Return the shared cache, loading it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (cache := domain_data.get(CACHE)) is None:
+        cache = domain_data[CACHE] = UteEnergyCache(hass)
+    await cache.async_load()
+    return cache
@@ -7,22 +7,40 @@ import voluptuous as vol
 
 from .exceptions import UteApiAccessDenied
 
-from .ute_energy import UteEnergy
+from .limiter import get_limiter
+from .ute_energy import AsyncUteEnergy
 
 from homeassistant import config_entries
 from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntry
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.const import CONF_BASE
 
 from .const import (
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_MIN_INTERVAL,
+    ADAPTIVE_SENSITIVITY,
     DOMAIN,
     CONNECTION,
+    CONF_ADAPTIVE,
+    CONF_ADAPTIVE_MAX,
+    CONF_ADAPTIVE_MIN,
+    CONF_ADAPTIVE_SENSITIVITY,
+    CONF_PRICE,
+    CONF_LIMITER_BURST,
+    CONF_LIMITER_MAX_CONCURRENCY,
+    CONF_LIMITER_RATE,
+    CONF_READING_MIN_INTERVAL,
+    CONF_SAMPLING,
+    CONF_SAMPLING_INTERVAL,
+    CONF_SAMPLING_SIZE,
     CONF_USER_ACCOUNTS,
     CONF_USER_EMAIL,
     CONF_USER_PHONE,
     CONF_AUTH_CODE,
+    DEFAULT_PRICES,
     DEFAULT_USER_PHONE,
     ACCOUNT_SERVICE_POINT_ID,
     RESPONSE_RESULT,
@@ -30,6 +48,16 @@ from .const import (
     ACCOUNT_SERVICE_POINT_ADDRESS,
     ACCOUNT_ID,
     ENTRY_NAME,
+    LIMITER_BURST,
+    LIMITER_MAX_CONCURRENCY,
+    LIMITER_RATE,
+    READING_MIN_INTERVAL,
+    SAMPLING_INTERVAL,
+    SAMPLING_MAX_SIZE,
+    SAMPLING_MIN_INTERVAL,
+    SAMPLING_MIN_SIZE,
+    SAMPLING_SIZE,
+    SYNC_INTERVAL,
 )
 
 
@@ -92,9 +120,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     step_id="auth", data_schema=AUTH_CONFIG, errors=errors
                 )
 
-            self.connection = UteEnergy(user_email, user_phone)
+            self.connection = AsyncUteEnergy(
+                user_email,
+                user_phone,
+                async_get_clientsession(self.hass),
+                limiter=get_limiter(self.hass),
+            )
             try:
-                if not await self.hass.async_add_executor_job(self.connection.login):
+                if not await self.connection.login():
                     errors[CONF_BASE] = "invalid_auth"
             except UteApiAccessDenied:
                 errors[CONF_BASE] = "invalid_auth"
@@ -110,9 +143,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self.email = user_email
             self.phone = user_phone
 
-            status_requested_code = await self.hass.async_add_executor_job(
-                self.connection.request_auth_code
-            )
+            status_requested_code = await self.connection.request_auth_code()
             if status_requested_code.get(
                 RESPONSE_RESULT, None
             ) == 1 and not status_requested_code.get(RESPONSE_STATUS, False):
@@ -138,13 +169,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         accounts: dict[str, str] = {}
 
         if user_input is not None:
-            is_validated = await self.hass.async_add_executor_job(
-                self.connection.validate_auth_code, user_input[CONF_AUTH_CODE]
+            is_validated = await self.connection.validate_auth_code(
+                user_input[CONF_AUTH_CODE]
             )
             if is_validated:
-                accounts = await self.hass.async_add_executor_job(
-                    self.connection.request_accounts
-                )
+                accounts = await self.connection.request_accounts()
 
                 if not accounts:
                     errors[CONF_BASE] = "user_no_accounts"
@@ -254,15 +283,85 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     )
                 )
 
+            if user_input.get(
+                CONF_ADAPTIVE_MIN, ADAPTIVE_MIN_INTERVAL
+            ) > user_input.get(CONF_ADAPTIVE_MAX, ADAPTIVE_MAX_INTERVAL):
+                errors[CONF_ADAPTIVE_MIN] = "adaptive_bounds"
+
+            if user_input.get(CONF_SAMPLING) and user_input.get(CONF_ADAPTIVE):
+                errors[CONF_ADAPTIVE] = "sampling_and_adaptive"
+
             if not errors:
                 return self.async_create_entry(title="", data=user_input)
 
+        options = self.config_entry.options
         settings_schema = vol.Schema(
             {
                 vol.Optional(
                     CONF_USER_ACCOUNTS,
-                    default=self.config_entry.options.get(CONF_USER_ACCOUNTS, False),
-                ): bool
+                    default=options.get(CONF_USER_ACCOUNTS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_SAMPLING, default=options.get(CONF_SAMPLING, False)
+                ): bool,
+                vol.Optional(
+                    CONF_SAMPLING_INTERVAL,
+                    default=options.get(CONF_SAMPLING_INTERVAL, SAMPLING_INTERVAL),
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=SAMPLING_MIN_INTERVAL, max=SYNC_INTERVAL * 60),
+                ),
+                vol.Optional(
+                    CONF_SAMPLING_SIZE,
+                    default=options.get(CONF_SAMPLING_SIZE, SAMPLING_SIZE),
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=SAMPLING_MIN_SIZE, max=SAMPLING_MAX_SIZE),
+                ),
+                vol.Optional(
+                    CONF_ADAPTIVE, default=options.get(CONF_ADAPTIVE, False)
+                ): bool,
+                vol.Optional(
+                    CONF_ADAPTIVE_MIN,
+                    default=options.get(CONF_ADAPTIVE_MIN, ADAPTIVE_MIN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=24 * 60)),
+                vol.Optional(
+                    CONF_ADAPTIVE_MAX,
+                    default=options.get(CONF_ADAPTIVE_MAX, ADAPTIVE_MAX_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=24 * 60)),
+                vol.Optional(
+                    CONF_ADAPTIVE_SENSITIVITY,
+                    default=options.get(
+                        CONF_ADAPTIVE_SENSITIVITY, ADAPTIVE_SENSITIVITY
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                vol.Optional(
+                    CONF_READING_MIN_INTERVAL,
+                    default=options.get(
+                        CONF_READING_MIN_INTERVAL, READING_MIN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=60 * 60)),
+                vol.Optional(
+                    CONF_LIMITER_RATE,
+                    default=options.get(CONF_LIMITER_RATE, LIMITER_RATE),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=20)),
+                vol.Optional(
+                    CONF_LIMITER_BURST,
+                    default=options.get(CONF_LIMITER_BURST, LIMITER_BURST),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+                vol.Optional(
+                    CONF_LIMITER_MAX_CONCURRENCY,
+                    default=options.get(
+                        CONF_LIMITER_MAX_CONCURRENCY, LIMITER_MAX_CONCURRENCY
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+                **{
+                    vol.Optional(
+                        CONF_PRICE.format(band),
+                        default=options.get(CONF_PRICE.format(band), price),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0))
+                    for band, price in DEFAULT_PRICES.items()
+                },
             }
         )
 
@@ -37,9 +37,10 @@ ENDPOINTS: dict[str, str] = {
     REQUEST_CODE: "v1/users/register",
     VALIDATE_CODE: "v1/users/validate",
     BASE_ACCOUNTS: "v1/accounts",
+    GET_ACCOUNT_INFO: "v1/accounts/{}",
     PEAK_INFO: "v1/accounts/{}/peak",
     MISC_BEHAVIOUR: "v1/misc/behaviour",
-    INVOICE_INFO: "v2/invoices/{}/1/36",
+    INVOICE_INFO: "v2/invoices/{}/1/{}",
     REQUEST_CONSUMPTION: "v2/invoices/chart/{}",
     READING_REQUEST: "v1/device/readingRequest",
     LAST_READING: "v1/device/{}/lastReading/30",
@@ -54,6 +55,18 @@ CONF_USER_ACCOUNTS: str = "user_accounts"
 CONF_USER_EMAIL: str = "user_email"
 CONF_USER_PHONE: str = "user_phone"
 CONF_AUTH_CODE: str = "auth_code"
+CONF_SAMPLING: str = "sampling"
+CONF_SAMPLING_INTERVAL: str = "sampling_interval"
+CONF_SAMPLING_SIZE: str = "sampling_size"
+CONF_PRICE: str = "price_{}"
+CONF_ADAPTIVE: str = "adaptive_polling"
+CONF_ADAPTIVE_MIN: str = "adaptive_min_interval"
+CONF_ADAPTIVE_MAX: str = "adaptive_max_interval"
+CONF_ADAPTIVE_SENSITIVITY: str = "adaptive_sensitivity"
+CONF_READING_MIN_INTERVAL: str = "reading_min_interval"
+CONF_LIMITER_RATE: str = "limiter_rate"
+CONF_LIMITER_BURST: str = "limiter_burst"
+CONF_LIMITER_MAX_CONCURRENCY: str = "limiter_max_concurrency"
 ACCOUNT_SERVICE_POINT_ID: str = "accountServicePointId"
 ACCOUNT_SERVICE_POINT_ADDRESS: str = "servicePointAddress"
 ACCOUNT_ID: str = "accountId"
@@ -65,8 +78,76 @@ RESPONSE_ERROR_MESSAGE: str = "text"
 CONNECTION: str = "connection"
 AGREEMENT_INFO: str = "agreementInfo"
 ENTRY_NAME: str = "name"
-ENTRY_COORDINATOR: str = "coordinator"
+ENTRY_COORDINATORS: str = "coordinators"
 UPDATE_LISTENER: str = "update_listener"
+CACHE: str = "cache"
+STORAGE_VERSION: int = 1
+CACHE_STORAGE_KEY: str = f"{DOMAIN}.cache"
+CACHE_SAVE_DELAY: int = 30
+CACHE_TTL: dict[str, int] = {
+    GET_ACCOUNT_INFO: 24 * 60 * 60,
+    MISC_BEHAVIOUR: 24 * 60 * 60,
+    PEAK_INFO: 6 * 60 * 60,
+    INVOICE_INFO: 90 * 24 * 60 * 60,
+}
+# Cached endpoints whose answer depends on the contracted tariff.
+TARIFF_ENDPOINTS: tuple[str, ...] = (MISC_BEHAVIOUR, PEAK_INFO)
+INVOICE_PAGE_SIZE: int = 36
+SERVICE_CLEAR_CACHE: str = "clear_cache"
+TOKENS: str = "tokens"
+HUBS: str = "hubs"
+ENTRY_HUB: str = "hub"
+HUB_MAX_CONCURRENCY: int = 4
+TOKEN_STORAGE_KEY: str = f"{DOMAIN}.tokens"
+TOKEN_SAVE_DELAY: int = 5
+SNAPSHOTS: str = "snapshots"
+SNAPSHOT_STORAGE_KEY: str = f"{DOMAIN}.snapshots"
+SNAPSHOT_SAVE_DELAY: int = 60
+ENTRY_STATISTICS: str = "statistics"
+STATISTICS_CHUNK_SIZE: int = 12
+LOG_BODY_MAX_LENGTH: int = 1024
+LIMITER: str = "limiter"
+LIMITER_RATE: float = 2.0
+LIMITER_BURST: int = 6
+LIMITER_MAX_CONCURRENCY: int = 6
+PRIORITY_HIGH: int = 0
+PRIORITY_NORMAL: int = 1
+PRIORITY_LOW: int = 2
+BREAKERS: str = "breakers"
+BREAKER_CLOSED: str = "closed"
+BREAKER_OPEN: str = "open"
+BREAKER_HALF_OPEN: str = "half_open"
+BREAKER_FAILURE_THRESHOLD: int = 3
+BREAKER_HOST_FAILURE_THRESHOLD: int = 5
+BREAKER_RESET_TIMEOUT: int = 60
+BREAKER_MAX_RESET_TIMEOUT: int = 60 * 60
+BACKOFF_MAX_INTERVAL: int = 4 * 60
+AGREEMENT_BACKOFF_MAX_INTERVAL: int = 4 * 24 * 60
+CIRCUIT_BREAKER: str = "circuit_breaker"
+METRICS_WINDOW: int = 200
+METRIC_ENDPOINTS: dict[str, str] = {
+    REQUEST_TOKEN: "Login",
+    GET_ACCOUNT_INFO: "Agreement",
+    MISC_BEHAVIOUR: "Peak availability",
+    PEAK_INFO: "Peak time",
+    INVOICE_INFO: "Invoices",
+    REQUEST_CONSUMPTION: "Consumption chart",
+    READING_REQUEST: "Reading request",
+    LAST_READING: "Last reading",
+}
+REQUEST_PRIORITIES: dict[str, int] = {
+    REQUEST_TOKEN: PRIORITY_HIGH,
+    REQUEST_CODE: PRIORITY_HIGH,
+    VALIDATE_CODE: PRIORITY_HIGH,
+    READING_REQUEST: PRIORITY_HIGH,
+    LAST_READING: PRIORITY_HIGH,
+    BASE_ACCOUNTS: PRIORITY_NORMAL,
+    GET_ACCOUNT_INFO: PRIORITY_NORMAL,
+    PEAK_INFO: PRIORITY_NORMAL,
+    MISC_BEHAVIOUR: PRIORITY_NORMAL,
+    INVOICE_INFO: PRIORITY_LOW,
+    REQUEST_CONSUMPTION: PRIORITY_LOW,
+}
 TARIFAS: dict[str, str] = {"TRT": "Tarifa Resindencial Triple Horario"}
 SIMPLE_TARIFF: str = "TRS"
 DOUBLE_TARIFF: str = "TRD"
@@ -87,8 +168,61 @@ MONTH_CONSUMPTION = "categoryLong"
 ACTIVE_CONSUMPTION = "consumosActiva"
 SINGLE_SERIE = "unaSerie"
 SYNC_INTERVAL: int = 10
+BILLING_SYNC_INTERVAL: int = 60
+AGREEMENT_SYNC_INTERVAL: int = 24 * 60
+SAMPLING_INTERVAL: int = 60
+SAMPLING_MIN_INTERVAL: int = 30
+SAMPLING_SIZE: int = 24 * 60
+SAMPLING_MAX_SIZE: int = 7 * 24 * 60
+SAMPLING_MAX_GAP: int = 3
+SAMPLED_ENERGY: str = "sampled_energy"
+SAMPLING_MIN_SIZE: int = 2
+ADAPTIVE_MIN_INTERVAL: int = 2
+ADAPTIVE_MAX_INTERVAL: int = 30
+ADAPTIVE_SENSITIVITY: int = 20
+ADAPTIVE_BACKOFF: float = 2.0
+ADAPTIVE_MIN_POWER_DELTA: float = 100.0
+ADAPTIVE_VOLTAGE_DELTA: float = 5.0
+READING_INTERVAL: str = "reading_interval"
+BAND_SIMPLE: str = "simple"
+BAND_PEAK: str = "peak"
+BAND_OFF_PEAK: str = "off_peak"
+BAND_FLAT: str = "flat"
+BAND_VALLEY: str = "valley"
+TARIFF_BANDS: dict[str, tuple[str, ...]] = {
+    SIMPLE_TARIFF: (BAND_SIMPLE,),
+    DOUBLE_TARIFF: (BAND_PEAK, BAND_OFF_PEAK),
+    TRIPLE_TARIFF: (BAND_PEAK, BAND_FLAT, BAND_VALLEY),
+}
+# $U per kWh, taxes included. Estimates, users set their own in the options.
+DEFAULT_PRICES: dict[str, float] = {
+    BAND_SIMPLE: 7.4,
+    BAND_PEAK: 11.9,
+    BAND_OFF_PEAK: 4.7,
+    BAND_FLAT: 5.6,
+    BAND_VALLEY: 2.7,
+}
+PEAK_HOURS: int = 4
+DEFAULT_PEAK_START: int = 18
+VALLEY_END: int = 7
+CURRENT_PRICE: str = "current_price"
+COST_RATE: str = "cost_rate"
+MONTH_COST: str = "month_cost"
+CONSUMPTION_BASELINE: str = "consumption_baseline"
+CONSUMPTION_YEAR_OVER_YEAR: str = "consumption_year_over_year"
+FORECAST_CONSUMPTION: str = "forecast_consumption"
+FORECAST_CHARGES: str = "forecast_charges"
+TIER_AGREEMENT: str = "agreement"
+TIER_BILLING: str = "billing"
+TIER_READING: str = "reading"
+TIERS: tuple[str, ...] = (TIER_AGREEMENT, TIER_BILLING, TIER_READING)
 REQUEST_TIMEOUT: int = 300
 MAX_WAIT_TIME: int = 3
+READING_POLL_MAX_DELAY: int = 30
+READING_POLL_BACKOFF: float = 1.5
+READING_POLL_JITTER: float = 0.2
+READING_POLL_DEADLINE: int = 120
+READING_MIN_INTERVAL: int = 20
 ATTRIBUTION = "Data provided by Ute Energy"
 DATA = "data"
 MONTH = "month"
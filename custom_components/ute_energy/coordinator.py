@@ -1,13 +1,25 @@
-"""Ute energy data coordinator for the UTE API."""
+"""Ute energy data coordinators for the UTE API.
 
+Data is split in tiers refreshed on their own schedule: contract data
+(agreement and peak time) daily, billing data (invoices and consumption
+chart) hourly and real-time meter readings every SYNC_INTERVAL minutes.
+"""
+from __future__ import annotations
+
+import asyncio
 from datetime import timedelta
 import logging
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any
 
+import aiohttp
 import async_timeout
 
-from homeassistant.core import HomeAssistant
-from .ute_energy import UteEnergy
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from .models import AccountSnapshot
+from .sampling import PowerSampler
+from .scheduler import AdaptiveInterval
+from .ute_energy import AsyncUteEnergy, ReadingPollStats
 from .exceptions import UteApiUnauthorized, UteApiAccessDenied, UteEnergyException
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.device_registry import DeviceEntryType
@@ -15,13 +27,27 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, Upda
 
 # from homeassistant.util import dt
 
+if TYPE_CHECKING:
+    from .hub import UteEnergyHub
+    from .snapshots import UteEnergySnapshotStore
+
 from .const import (
+    AGREEMENT_SYNC_INTERVAL,
+    AGREEMENT_BACKOFF_MAX_INTERVAL,
+    BACKOFF_MAX_INTERVAL,
+    BILLING_SYNC_INTERVAL,
+    CURRENT_POWER,
     DEFAULT_NAME,
     DOMAIN,
     MANUFACTURER,
     REQUEST_TIMEOUT,
+    SAMPLING_MAX_GAP,
+    SAMPLING_MIN_SIZE,
     SOURCE_URL,
     SYNC_INTERVAL,
+    TIER_AGREEMENT,
+    TIER_BILLING,
+    TIER_READING,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -29,46 +55,163 @@ _LOGGER = logging.getLogger(__name__)
 UPDATE_INTERVAL = timedelta(minutes=SYNC_INTERVAL)
 
 
-class UteEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Class to manage fetching UTE data API."""
+class UteEnergyDataUpdateCoordinator(DataUpdateCoordinator[AccountSnapshot]):
+    """Base class to manage fetching a tier of UTE data API."""
+
+    tier: str
+    sync_interval: timedelta
+    backoff_max_interval = timedelta(minutes=BACKOFF_MAX_INTERVAL)
 
     def __init__(
         self,
         hass: HomeAssistant,
-        ute_api: UteEnergy,
+        hub: UteEnergyHub,
         device_key: str,
         account_service_point_id: str,
     ) -> None:
         """Initialize coordinator."""
-        self._ute_api = ute_api
-        self._account_service_point_id = account_service_point_id
+        self._hub = hub
+        self._ute_api = hub.client
+        self.account_service_point_id = account_service_point_id
         self._device_key = device_key
+        self._snapshots: UteEnergySnapshotStore | None = None
+        self.skipped_updates = 0
+        self.consecutive_failures = 0
+        self.last_cycle_duration: float | None = None
+        self._refresh_listeners: list[CALLBACK_TYPE] = []
 
-        _LOGGER.debug("Data will be update every %s", UPDATE_INTERVAL)
+        _LOGGER.debug("%s data will be update every %s", self.tier, self.sync_interval)
 
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=UPDATE_INTERVAL)
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{self.tier}",
+            update_interval=self.sync_interval,
+            always_update=False,
+        )
 
-    async def _async_update_data(self) -> dict[str:Any]:
+    async def _async_update_data(self) -> AccountSnapshot:
         """Update the data."""
-        data = {}
-        async with async_timeout.timeout(REQUEST_TIMEOUT):
-            try:
-                await self.hass.async_add_executor_job(self._ute_api.login)
-                data = await self._service_account_data()
-            except (
-                UteApiUnauthorized,
-                UteApiAccessDenied,
-                UteEnergyException,
-            ) as error:
-                raise UpdateFailed(error) from error
+        data = AccountSnapshot()
+        start = time.monotonic()
+        try:
+            async with async_timeout.timeout(REQUEST_TIMEOUT):
+                data = await self._hub.async_fetch(self)
+        except (
+            UteApiUnauthorized,
+            UteApiAccessDenied,
+            UteEnergyException,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ) as error:
+            self._async_backoff()
+            raise UpdateFailed(error) from error
+        else:
+            if (
+                not self.always_update
+                and self.last_update_success
+                and data == self.data
+            ):
+                self.skipped_updates += 1
+        finally:
+            self.last_cycle_duration = time.monotonic() - start
+            for update_callback in list(self._refresh_listeners):
+                update_callback()
+        if self.consecutive_failures:
+            _LOGGER.debug(
+                "%s data recovered, back to %s", self.tier, self.sync_interval
+            )
+            self.consecutive_failures = 0
+            self.update_interval = self.effective_interval
         return data
 
-    async def _service_account_data(self) -> dict[str, Any]:
-        """Poll service account data from UTE API."""
-        response = await self.hass.async_add_executor_job(
-            self._ute_api.retrieve_service_account_data, self._account_service_point_id
+    @callback
+    def async_add_refresh_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for the end of every refresh, even if the data is unchanged."""
+        self._refresh_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._refresh_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_backoff(self) -> None:
+        """Double the update interval after each failed refresh, up to the tier cap."""
+        self.consecutive_failures += 1
+        self.update_interval = min(
+            self.sync_interval * 2 ** min(self.consecutive_failures, 16),
+            self.backoff_max_interval,
+        )
+        _LOGGER.debug(
+            "%s refresh failed %s times, next try in %s",
+            self.tier,
+            self.consecutive_failures,
+            self.update_interval,
         )
-        return response
+
+    async def async_fetch_from_api(self) -> AccountSnapshot:
+        """Poll the tier data from UTE API."""
+        raise NotImplementedError
+
+    @callback
+    def async_restore(self, snapshots: UteEnergySnapshotStore) -> bool:
+        """Start from the persisted snapshot and persist every new one.
+
+        Return True if a snapshot was restored.
+        """
+        self._snapshots = snapshots
+        if (data := snapshots.get(self._device_key, self.tier)) is None:
+            return False
+        self.data = data
+        _LOGGER.debug("%s data restored", self.tier)
+        return True
+
+    @callback
+    def async_set_updated_data(self, data: AccountSnapshot) -> None:
+        """Take the data polled in a hub batch, notifying only if it changed."""
+        if self.always_update or not self.last_update_success or data != self.data:
+            super().async_set_updated_data(data)
+            return
+        self.skipped_updates += 1
+        self._async_unsub_refresh()
+        self._debounced_refresh.async_cancel()
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Persist every new snapshot before updating listeners."""
+        if (
+            self._snapshots is not None
+            and self.last_update_success
+            and self.data is not None
+        ):
+            self._snapshots.set(self._device_key, self.tier, self.data)
+        super().async_update_listeners()
+
+    @property
+    def effective_interval(self) -> timedelta:
+        """Return the interval to wait after a successful refresh."""
+        return self.sync_interval
+
+    @property
+    def batch_key(self) -> tuple[str, Any]:
+        """Return the key of the hub batches this coordinator joins."""
+        return self.tier, self.sync_interval
+
+    @property
+    def ute_api(self) -> AsyncUteEnergy:
+        """Return the UTE API client."""
+        return self._ute_api
+
+    @property
+    def reading_stats(self) -> ReadingPollStats | None:
+        """Return lastReading poll counters of this service point."""
+        return self._ute_api.reading_stats.get(self.account_service_point_id)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -81,3 +224,123 @@ class UteEnergyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             name=DEFAULT_NAME,
             configuration_url=SOURCE_URL,
         )
+
+
+class UteEnergyAgreementCoordinator(UteEnergyDataUpdateCoordinator):
+    """Coordinator for contract data, which rarely changes."""
+
+    tier = TIER_AGREEMENT
+    sync_interval = timedelta(minutes=AGREEMENT_SYNC_INTERVAL)
+    backoff_max_interval = timedelta(minutes=AGREEMENT_BACKOFF_MAX_INTERVAL)
+
+    async def async_fetch_from_api(self) -> AccountSnapshot:
+        """Poll agreement and peak time from UTE API."""
+        return await self._ute_api.retrieve_agreement_data(
+            self.account_service_point_id
+        )
+
+
+class UteEnergyBillingCoordinator(UteEnergyDataUpdateCoordinator):
+    """Coordinator for invoices and the consumption chart."""
+
+    tier = TIER_BILLING
+    sync_interval = timedelta(minutes=BILLING_SYNC_INTERVAL)
+
+    async def async_fetch_from_api(self) -> AccountSnapshot:
+        """Poll latest invoice and consumption from UTE API."""
+        return await self._ute_api.retrieve_billing_data(self.account_service_point_id)
+
+
+class UteEnergyReadingCoordinator(UteEnergyDataUpdateCoordinator):
+    """Coordinator for real-time meter readings."""
+
+    tier = TIER_READING
+    sync_interval = UPDATE_INTERVAL
+    sampling = False
+    scheduler: AdaptiveInterval | None = None
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        hub: UteEnergyHub,
+        device_key: str,
+        account_service_point_id: str,
+    ) -> None:
+        """Initialize coordinator, integrating the power of every reading."""
+        super().__init__(hass, hub, device_key, account_service_point_id)
+        self.sampler = self._create_sampler(SAMPLING_MIN_SIZE)
+
+    def _create_sampler(
+        self, size: int, longest: timedelta | None = None
+    ) -> PowerSampler:
+        """Return a sampler for the current sync interval.
+
+        Gaps up to SAMPLING_MAX_GAP times the longest interval between
+        readings are integrated.
+        """
+        interval = self.sync_interval.total_seconds()
+        max_gap = (longest or self.sync_interval).total_seconds() * SAMPLING_MAX_GAP
+        return PowerSampler(interval, size, max_gap)
+
+    @callback
+    def async_enable_sampling(self, interval: int, size: int) -> None:
+        """Poll the meter every interval seconds and integrate its power.
+
+        Must be called before the coordinator is registered on the hub.
+        """
+        self.sync_interval = self.update_interval = timedelta(seconds=interval)
+        self.sampler = self._create_sampler(size)
+        self.sampling = True
+        # Sampled energy grows even when the reading repeats, entities skip
+        # their own unchanged writes.
+        self.always_update = True
+        _LOGGER.debug("Sampling power every %s, %s samples kept", interval, size)
+
+    @callback
+    def async_enable_adaptive_interval(
+        self, minimum: timedelta, maximum: timedelta, sensitivity: float
+    ) -> None:
+        """Read sooner when readings change and back off while they are stable.
+
+        Must be called before the coordinator is registered on the hub.
+        """
+        self.scheduler = AdaptiveInterval(
+            minimum, maximum, sensitivity, initial=self.sync_interval
+        )
+        self.sampler = self._create_sampler(
+            SAMPLING_MIN_SIZE, max(maximum, self.sync_interval)
+        )
+        self.update_interval = self.scheduler.interval
+
+    @property
+    def batch_key(self) -> tuple[str, Any]:
+        """Return the key of the hub batches, adaptive coordinators poll alone.
+
+        Joining a shared batch would read every other meter of the user and
+        reset their timers on each adaptive refresh.
+        """
+        if self.scheduler is not None:
+            return self.tier, self.account_service_point_id
+        return super().batch_key
+
+    @property
+    def effective_interval(self) -> timedelta:
+        """Return the adaptive interval when enabled."""
+        if self.scheduler is not None:
+            return self.scheduler.interval
+        return self.sync_interval
+
+    async def async_fetch_from_api(self) -> AccountSnapshot:
+        """Poll the latest meter reading from UTE API."""
+        data = await self._ute_api.retrieve_reading_data(self.account_service_point_id)
+        self.sampler.add(time.time(), data.get(CURRENT_POWER))
+        if self.scheduler is not None and not self.consecutive_failures:
+            self.update_interval = self.scheduler.update(data.reading)
+        return data
+
+
+COORDINATORS: tuple[type[UteEnergyDataUpdateCoordinator], ...] = (
+    UteEnergyAgreementCoordinator,
+    UteEnergyBillingCoordinator,
+    UteEnergyReadingCoordinator,
+)
@@ -1,6 +1,7 @@
 """Diagnostics support for AccuWeather."""
 from __future__ import annotations
 
+from dataclasses import asdict
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
@@ -11,7 +12,12 @@ from homeassistant.core import HomeAssistant
 
 from .coordinator import UteEnergyDataUpdateCoordinator
 from .const import (
+    BREAKERS,
+    CACHE,
     DOMAIN,
+    LIMITER,
+    ENTRY_COORDINATORS,
+    TIER_READING,
     CONF_USER_EMAIL,
     CONF_USER_PHONE,
     ACCOUNT_SERVICE_POINT_ID,
@@ -41,8 +47,44 @@ async def async_get_config_entry_diagnostics(
     # not every device uses DataUpdateCoordinator
     if coordinator := hass.data[DOMAIN][config_entry.entry_id]:
         if isinstance(coordinator, dict):
-            diagnostics_data["coordinator_data"] = coordinator
+            coordinators: dict[str, UteEnergyDataUpdateCoordinator] = coordinator.get(
+                ENTRY_COORDINATORS, {}
+            )
+            diagnostics_data["coordinator_data"] = {
+                tier: tier_coordinator.data.as_dict()
+                if tier_coordinator.data is not None
+                else None
+                for tier, tier_coordinator in coordinators.items()
+            }
+            diagnostics_data["skipped_updates"] = {
+                tier: tier_coordinator.skipped_updates
+                for tier, tier_coordinator in coordinators.items()
+            }
+            if coordinators:
+                ute_api = next(iter(coordinators.values())).ute_api
+                diagnostics_data["fingerprints"] = {
+                    endpoint: asdict(stats)
+                    for endpoint, stats in ute_api.fingerprint_stats.items()
+                }
+                diagnostics_data["metrics"] = ute_api.metrics.as_dict()
+                diagnostics_data["refresh_durations"] = {
+                    tier: tier_coordinator.last_cycle_duration
+                    for tier, tier_coordinator in coordinators.items()
+                }
+            if TIER_READING in coordinators and (
+                reading_stats := coordinators[TIER_READING].reading_stats
+            ):
+                diagnostics_data["reading_polls"] = asdict(reading_stats)
         else:
             diagnostics_data["coordinator_data"] = repr(coordinator)
 
+    if cache := hass.data[DOMAIN].get(CACHE):
+        diagnostics_data["cache"] = cache.as_dict()
+
+    if limiter := hass.data[DOMAIN].get(LIMITER):
+        diagnostics_data["limiter"] = limiter.as_dict()
+
+    if breakers := hass.data[DOMAIN].get(BREAKERS):
+        diagnostics_data["circuit_breakers"] = breakers.as_dict()
+
     return diagnostics_data
@@ -47,8 +47,14 @@ class UteEnergyException(Exception):
 
     Attributes:
         message -- explanation of the error
+        status -- HTTP status of the response, if any
     """
 
-    def __init__(self, message) -> None:
+    def __init__(self, message, status: int | None = None) -> None:
         self.message = message
+        self.status = status
         super().__init__(self.message)
+
+
+class UteApiCircuitOpen(UteEnergyException):
+    """Exception raised when a call is skipped by an open circuit breaker."""
@@ -0,0 +1,283 @@
+"""Share a UTE API client between the config entries of a user."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo
+
+from .breaker import get_breakers
+from .cache import async_get_cache
+from .limiter import get_limiter
+from .const import (
+    DEFAULT_NAME,
+    DOMAIN,
+    HUBS,
+    HUB_MAX_CONCURRENCY,
+    MANUFACTURER,
+    SOURCE_URL,
+)
+from .token_store import async_get_token_store
+from .ute_energy import AsyncUteEnergy
+from .utils import credentials_key
+
+if TYPE_CHECKING:
+    from .coordinator import UteEnergyDataUpdateCoordinator
+    from .models import AccountSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UteEnergyHub:
+    """One client, connection pool and token for all service points of a user.
+
+    Coordinators fetch through the hub. The first coordinator of a tier that
+    refreshes starts a batch polling every registered service point of that
+    tier with bounded concurrency. Coordinators that were not waiting on the
+    batch receive their data pushed, which keeps all of them on one cycle.
+    Batches are keyed by tier and interval, so a service point sampled on a
+    fast cadence does not drag the others along, and a service point with an
+    adaptive interval is polled in a batch of its own.
+
+    The request metrics of the client are shown on a device of the hub, by
+    sensors added through a single config entry and handed to another one
+    when it unloads.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: str,
+        client: AsyncUteEnergy,
+    ) -> None:
+        """Initialize."""
+        self._hass = hass
+        self.key = key
+        self.client = client
+        # Registries are keyed by a digest, not by the credentials.
+        self.unique_id = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        self.metrics_entry_id: str | None = None
+        self._metrics_platforms: dict[str, CALLBACK_TYPE] = {}
+        self._entries: set[str] = set()
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._coordinators: dict[
+            tuple[str, Any], dict[str, UteEnergyDataUpdateCoordinator]
+        ] = {}
+        self._batches: dict[tuple[str, Any], asyncio.Task[dict[str, Any]]] = {}
+        self._waiting: dict[tuple[str, Any], set[str]] = {}
+        self._semaphore = asyncio.Semaphore(HUB_MAX_CONCURRENCY)
+        self._unsub_close: CALLBACK_TYPE | None = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_handle_close
+        )
+
+    @callback
+    def async_acquire(self, entry_id: str) -> None:
+        """Add a config entry reference."""
+        self._entries.add(entry_id)
+
+    @callback
+    def async_release(self, entry_id: str) -> bool:
+        """Drop a config entry reference, return True if it was the last one."""
+        self._entries.discard(entry_id)
+        return not self._entries
+
+    @callback
+    def async_add_metrics_platform(
+        self, entry_id: str, add_entities: CALLBACK_TYPE
+    ) -> None:
+        """Keep how a config entry adds the metric sensors, add them if unheld."""
+        self._metrics_platforms[entry_id] = add_entities
+        self._async_assign_metrics()
+
+    @callback
+    def async_remove_metrics_platform(self, entry_id: str) -> None:
+        """Forget a config entry about to unload its platforms."""
+        self._metrics_platforms.pop(entry_id, None)
+
+    @callback
+    def async_release_metrics(self, entry_id: str) -> None:
+        """Hand the metric sensors to another config entry once removed."""
+        if self.metrics_entry_id == entry_id:
+            self.metrics_entry_id = None
+            self._async_assign_metrics()
+
+    @callback
+    def _async_assign_metrics(self) -> None:
+        """Add the metric sensors through a config entry if none holds them."""
+        if self.metrics_entry_id is not None or not self._metrics_platforms:
+            return
+        self.metrics_entry_id, add_entities = next(
+            iter(self._metrics_platforms.items())
+        )
+        add_entities()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device of the client metrics."""
+        return DeviceInfo(
+            model=f"{DEFAULT_NAME} API",
+            entry_type=DeviceEntryType.SERVICE,
+            identifiers={(DOMAIN, self.unique_id)},
+            manufacturer=MANUFACTURER,
+            name=f"{DEFAULT_NAME} API",
+            configuration_url=SOURCE_URL,
+        )
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for the end of every poll of the hub."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify(self) -> None:
+        """Call the listeners, the client metrics may have changed."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_register(self, coordinator: UteEnergyDataUpdateCoordinator) -> None:
+        """Add a coordinator to the batches of its tier."""
+        self._coordinators.setdefault(coordinator.batch_key, {})[
+            coordinator.account_service_point_id
+        ] = coordinator
+
+    @callback
+    def async_unregister(self, coordinator: UteEnergyDataUpdateCoordinator) -> None:
+        """Remove a coordinator from the batches of its tier."""
+        self._coordinators.get(coordinator.batch_key, {}).pop(
+            coordinator.account_service_point_id, None
+        )
+
+    async def async_fetch(
+        self, coordinator: UteEnergyDataUpdateCoordinator
+    ) -> AccountSnapshot:
+        """Return fresh data for a coordinator, joining the running batch."""
+        key = coordinator.batch_key
+        account_id = coordinator.account_service_point_id
+
+        if (batch := self._batches.get(key)) is None:
+            batch = self._batches[key] = self._hass.async_create_task(
+                self._async_run_batch(key)
+            )
+
+        waiting = self._waiting.setdefault(key, set())
+        waiting.add(account_id)
+        try:
+            results = await asyncio.shield(batch)
+        finally:
+            waiting.discard(account_id)
+
+        if account_id not in results:
+            # Registered after the batch started, poll on its own.
+            try:
+                async with self._semaphore:
+                    return await coordinator.async_fetch_from_api()
+            finally:
+                self._async_notify()
+
+        result = results[account_id]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def _async_run_batch(self, key: tuple[str, Any]) -> dict[str, Any]:
+        """Poll every service point of a tier."""
+        coordinators = dict(self._coordinators.get(key, {}))
+        try:
+            await self.client.login()
+            results = await asyncio.gather(
+                *(
+                    self._async_fetch_account(coordinator)
+                    for coordinator in coordinators.values()
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            self._batches.pop(key, None)
+            self._async_notify()
+
+        batch = dict(zip(coordinators, results))
+        waiting = self._waiting.get(key, set())
+        for account_id, coordinator in coordinators.items():
+            result = batch[account_id]
+            if account_id not in waiting and not isinstance(result, BaseException):
+                coordinator.async_set_updated_data(result)
+
+        _LOGGER.debug("Polled %s %s service points", len(coordinators), key[0])
+        return batch
+
+    async def _async_fetch_account(
+        self, coordinator: UteEnergyDataUpdateCoordinator
+    ) -> AccountSnapshot:
+        """Poll a service point once a concurrency slot is free."""
+        async with self._semaphore:
+            return await coordinator.async_fetch_from_api()
+
+    async def _async_handle_close(self, _: Event) -> None:
+        """Close the hub session when Home Assistant stops."""
+        self._unsub_close = None
+        await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close the hub session."""
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        for batch in self._batches.values():
+            batch.cancel()
+        self.client.cancel_readings()
+        # Sessions created by Home Assistant share its connector, detach
+        # instead of closing it.
+        self.client.session.detach()
+
+
+async def async_get_hub(
+    hass: HomeAssistant, entry_id: str, email: str, phone: str
+) -> UteEnergyHub:
+    """Return the hub of a user, creating it for the first config entry."""
+    cache = await async_get_cache(hass)
+    token_store = await async_get_token_store(hass)
+
+    hubs: dict[str, UteEnergyHub] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        HUBS, {}
+    )
+    key = credentials_key(email, phone)
+    if (hub := hubs.get(key)) is None:
+        client = AsyncUteEnergy(
+            email,
+            phone,
+            async_create_clientsession(hass, auto_cleanup=False),
+            cache=cache,
+            service_token=token_store.get(email, phone),
+            on_token_refresh=lambda token: token_store.set(email, phone, token),
+            limiter=get_limiter(hass),
+            breakers=get_breakers(hass),
+        )
+        hub = hubs[key] = UteEnergyHub(hass, key, client)
+
+    hub.async_acquire(entry_id)
+    return hub
+
+
+async def async_release_hub(
+    hass: HomeAssistant, hub: UteEnergyHub, entry_id: str
+) -> None:
+    """Drop a config entry reference, closing the hub after the last one."""
+    if not hub.async_release(entry_id):
+        return
+
+    hass.data[DOMAIN][HUBS].pop(hub.key, None)
+    await hub.async_close()
+    _LOGGER.debug("Closed UTE hub, no config entries left")
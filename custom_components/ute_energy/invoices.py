@@ -0,0 +1,115 @@
+"""Local invoice store of a UTE service point."""
+from __future__ import annotations
+
+import datetime
+from typing import Any
+
+from .models import Invoice
+from .const import INVOICE_PAGE_SIZE
+
+
+class InvoiceStore:
+    """Invoices indexed by (year, month) with the latest one kept at hand.
+
+    The first fetch downloads a full page, later fetches only need the
+    months elapsed since the latest known invoice. That only holds while
+    the API returns the newest invoices first. The order is detected from
+    the pages, and full pages are requested once it is known to be oldest
+    first.
+    """
+
+    def __init__(self, invoices: list[dict[str, Any]] | None = None) -> None:
+        """Initialize."""
+        self._invoices: dict[tuple[int, int], Invoice] = {}
+        self._latest: tuple[int, int] | None = None
+        self.version = 0
+        self.newest_first: bool | None = None
+        if invoices:
+            self.merge(invoices)
+            # Stored invoices are sorted, they tell nothing of the API order.
+            self.newest_first = None
+
+    @classmethod
+    def from_storage(cls, data: dict[str, Any] | list[dict[str, Any]]) -> InvoiceStore:
+        """Build from as_storage data, or from a bare invoice list."""
+        if isinstance(data, list):
+            return cls(data)
+        store = cls(data["invoices"])
+        store.newest_first = data.get("newest_first")
+        return store
+
+    def as_storage(self) -> dict[str, Any]:
+        """Return the invoices and the detected page order to persist."""
+        return {
+            "invoices": [invoice.as_dict() for invoice in self.as_list()],
+            "newest_first": self.newest_first,
+        }
+
+    def __len__(self) -> int:
+        """Return the number of stored invoices."""
+        return len(self._invoices)
+
+    @property
+    def latest(self) -> Invoice | None:
+        """Return the most recent invoice not dated in the future."""
+        if self._latest is None:
+            return None
+        return self._invoices[self._latest]
+
+    def as_list(self) -> list[Invoice]:
+        """Return the invoices sorted from oldest to newest."""
+        return [self._invoices[key] for key in sorted(self._invoices)]
+
+    def page_size(self, today: datetime.date) -> int:
+        """Return the smallest page that can hold every invoice not yet stored.
+
+        The latest known invoice is requested again so corrections to it are
+        picked up and the page is known to overlap the store.
+        """
+        if self.newest_first is False or self._latest is None:
+            return INVOICE_PAGE_SIZE
+        year, month = self._latest
+        elapsed = (today.year * 12 + today.month) - (year * 12 + month)
+        return min(max(elapsed, 0) + 1, INVOICE_PAGE_SIZE)
+
+    def merge(
+        self, invoices: list[dict[str, Any]], today: datetime.date | None = None
+    ) -> bool:
+        """Add or replace invoices from API objects, return True if changed."""
+        today = today or datetime.date.today()
+        current = (today.year, today.month)
+        previous_latest = self._latest
+        changed = False
+
+        page = [Invoice.from_dict(invoice) for invoice in invoices]
+        if (newest_first := self._page_order(page, previous_latest)) is not None:
+            if newest_first != self.newest_first:
+                self.newest_first = newest_first
+                changed = True
+        for invoice in page:
+            key = invoice.key
+            if self._invoices.get(key) != invoice:
+                self._invoices[key] = invoice
+                changed = True
+            if key <= current and (self._latest is None or key > self._latest):
+                self._latest = key
+
+        if changed:
+            self.version += 1
+        return changed
+
+    @staticmethod
+    def _page_order(
+        page: list[Invoice], previous_latest: tuple[int, int] | None
+    ) -> bool | None:
+        """Return True if the page is newest first, None if it cannot tell.
+
+        A page that does not reach the latest known invoice cannot hold the
+        newest invoices either, so it is taken as oldest first.
+        """
+        keys = [invoice.key for invoice in page]
+        if len(set(keys)) > 1:
+            return keys[0] > keys[-1]
+        if keys and previous_latest is not None and keys[0] < previous_latest:
+            return False
+        return None
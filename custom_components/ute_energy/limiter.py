@@ -0,0 +1,205 @@
+"""Shared rate limiter for UTE API requests."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import heapq
+import itertools
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    LIMITER,
+    LIMITER_BURST,
+    LIMITER_MAX_CONCURRENCY,
+    LIMITER_RATE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class LimiterStats:
+    """Queue and wait counters of the limiter."""
+
+    granted: int = 0
+    max_queue_depth: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    last_wait: float = 0.0
+
+    def record(self, wait: float) -> None:
+        """Count a granted request and the time it waited."""
+        self.granted += 1
+        self.total_wait += wait
+        self.last_wait = wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @property
+    def average_wait(self) -> float:
+        """Return the mean wait of the granted requests."""
+        return self.total_wait / self.granted if self.granted else 0.0
+
+
+class RequestLimiter:
+    """Token bucket with a concurrency cap and prioritized waiters.
+
+    Tokens refill at `rate` per second up to `burst`. A request needs a
+    token and a free concurrency slot, waiting requests are served by
+    priority (lower first) and then in arrival order. Config entries set
+    their own limits, the strictest of them apply.
+    """
+
+    def __init__(
+        self,
+        rate: float = LIMITER_RATE,
+        burst: int = LIMITER_BURST,
+        max_concurrency: int = LIMITER_MAX_CONCURRENCY,
+    ) -> None:
+        """Initialize."""
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.stats = LimiterStats()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        self._defaults = (rate, burst, max_concurrency)
+        self._limits: dict[str, tuple[float, int, int]] = {}
+
+    def set_limits(
+        self, entry_id: str, rate: float, burst: int, max_concurrency: int
+    ) -> None:
+        """Set the limits of a config entry."""
+        self._limits[entry_id] = (rate, burst, max_concurrency)
+        self._apply_limits()
+
+    def remove_limits(self, entry_id: str) -> None:
+        """Drop the limits of an unloaded config entry."""
+        if self._limits.pop(entry_id, None) is not None:
+            self._apply_limits()
+
+    def _apply_limits(self) -> None:
+        """Apply the strictest limits of the config entries."""
+        limits = list(self._limits.values()) or [self._defaults]
+        self._refill()
+        self.rate = min(limit[0] for limit in limits)
+        self.burst = min(limit[1] for limit in limits)
+        self.max_concurrency = min(limit[2] for limit in limits)
+        self._tokens = min(self._tokens, float(self.burst))
+        self._dispatch()
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting for their turn."""
+        return sum(1 for *_, waiter in self._waiters if not waiter.done())
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Hold a request slot for the duration of the block."""
+        start = time.monotonic()
+        await self._acquire(priority)
+        wait = time.monotonic() - start
+        self.stats.record(wait)
+        if wait > 1:
+            _LOGGER.debug("Request waited %.1f s in the limiter", wait)
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._dispatch()
+
+    async def _acquire(self, priority: int) -> None:
+        """Wait until a token and a concurrency slot are granted."""
+        if not self._waiters and self._try_take():
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.queue_depth)
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted right before the cancellation, give the slot back.
+                self._active -= 1
+                self._dispatch()
+            raise
+
+    def _try_take(self) -> bool:
+        """Take a token and a slot if both are available."""
+        if self._active >= self.max_concurrency:
+            return False
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self._active += 1
+        return True
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def _dispatch(self) -> None:
+        """Grant waiting requests in priority order while capacity allows."""
+        while self._waiters:
+            waiter = self._waiters[0][2]
+            if waiter.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take():
+                break
+            heapq.heappop(self._waiters)
+            waiter.set_result(None)
+
+        if not self._waiters and self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        elif (
+            self._waiters
+            and self._active < self.max_concurrency
+            and self._wakeup is None
+        ):
+            delay = (1 - self._tokens) / self.rate
+            self._wakeup = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self) -> None:
+        """Dispatch once the next token is available."""
+        self._wakeup = None
+        self._dispatch()
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return settings and counters for diagnostics."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.stats.max_queue_depth,
+            "granted": self.stats.granted,
+            "average_wait": round(self.stats.average_wait, 3),
+            "max_wait": round(self.stats.max_wait, 3),
+        }
+
+
+def get_limiter(hass: HomeAssistant) -> RequestLimiter:
+    """Return the limiter shared by every UTE API client."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (limiter := domain_data.get(LIMITER)) is None:
+        limiter = domain_data[LIMITER] = RequestLimiter()
+    return limiter
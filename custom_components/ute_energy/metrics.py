@@ -0,0 +1,92 @@
+"""Runtime metrics of UTE API requests."""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+import math
+from typing import Any
+
+from .const import METRICS_WINDOW
+
+
+def percentile(samples: list[float], percent: float) -> float | None:
+    """Return the nearest-rank percentile of sorted samples."""
+    if not samples:
+        return None
+    rank = max(1, math.ceil(percent / 100 * len(samples)))
+    return samples[rank - 1]
+
+
+@dataclass
+class EndpointMetrics:
+    """Counters and latency window of an endpoint."""
+
+    calls: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    bytes_received: int = 0
+    max_latency: float = 0.0
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=METRICS_WINDOW)
+    )
+
+    def record(
+        self, latency: float, size: int = 0, error: str | int | None = None
+    ) -> None:
+        """Count a call, its latency in seconds and its outcome."""
+        self.calls += 1
+        self.bytes_received += size
+        self.latencies.append(latency)
+        self.max_latency = max(self.max_latency, latency)
+        if error is not None:
+            self.errors[str(error)] = self.errors.get(str(error), 0) + 1
+
+    @property
+    def error_count(self) -> int:
+        """Return the number of failed calls."""
+        return sum(self.errors.values())
+
+    def latency_ms(self, percent: float) -> float | None:
+        """Return a latency percentile of the recent calls in milliseconds."""
+        return _milliseconds(percentile(sorted(self.latencies), percent))
+
+    @property
+    def max_latency_ms(self) -> float | None:
+        """Return the slowest call in milliseconds."""
+        return _milliseconds(self.max_latency) if self.calls else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics with latencies in milliseconds."""
+        samples = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "errors": dict(self.errors),
+            "bytes_received": self.bytes_received,
+            "latency_p50": _milliseconds(percentile(samples, 50)),
+            "latency_p95": _milliseconds(percentile(samples, 95)),
+            "latency_max": self.max_latency_ms,
+        }
+
+
+class UteEnergyMetrics:
+    """Metrics of every endpoint requested by a client."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, endpoint: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint."""
+        if (metrics := self.endpoints.get(endpoint)) is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics of every endpoint for diagnostics."""
+        return {
+            endpoint: metrics.as_dict() for endpoint, metrics in self.endpoints.items()
+        }
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
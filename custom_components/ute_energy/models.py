@@ -0,0 +1,345 @@
+"""Compact models of UTE API responses."""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+
+from .utils import convert_number_to_month
+
+from .const import (
+    CONSUMPTION_ATTR,
+    CONTRACTED_POWER_ON_FLAT,
+    CONTRACTED_POWER_ON_PEAK,
+    CONTRACTED_POWER_ON_VALLEY,
+    CONTRACTED_TARIFF,
+    CONTRACTED_VOLTAGE,
+    CURRENT_CONSUMPTION,
+    CURRENT_POWER,
+    CURRENT_STATUS,
+    CURRENT_VOLTAGE,
+    ID,
+    LATEST_INVOICE,
+    LOG_BODY_MAX_LENGTH,
+    MONTH,
+    MONTH_CHARGES,
+    MONTH_CONSUMPTION,
+    SELECTED_PEAK,
+    SERVICE_AGREEMENT_ID,
+    VALOR,
+    VALUE,
+    YEAR,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def json_loads(text: str | bytes) -> Any:
+    """Decode a JSON body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def log_response(logger: logging.Logger, action: str, status: int, text: str) -> None:
+    """Log a response body at debug level, truncated to LOG_BODY_MAX_LENGTH."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    if len(text) > LOG_BODY_MAX_LENGTH:
+        text = f"{text[:LOG_BODY_MAX_LENGTH]}... ({len(text)} chars)"
+    logger.debug("%s return status: %s, content: %s", action, status, text)
+
+
+class UteModel:
+    """Base of the slotted models, compared and printed by field."""
+
+    __slots__ = ()
+
+    def _values(self) -> tuple[Any, ...]:
+        """Return the field values in slot order."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if other is the same model with the same values."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __repr__(self) -> str:
+        """Return the model fields."""
+        fields = ", ".join(
+            f"{name}={value!r}" for name, value in zip(self.__slots__, self._values())
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+class Agreement(UteModel):
+    """Contract of a service point."""
+
+    __slots__ = (
+        "service_agreement_id",
+        "tariff",
+        "voltage",
+        "power_on_peak",
+        "power_on_valley",
+        "power_on_flat",
+    )
+
+    def __init__(
+        self,
+        service_agreement_id: Any,
+        tariff: str | None,
+        voltage: Any,
+        power_on_peak: Any,
+        power_on_valley: Any,
+        power_on_flat: Any,
+    ) -> None:
+        """Initialize."""
+        self.service_agreement_id = service_agreement_id
+        self.tariff = tariff
+        self.voltage = voltage
+        self.power_on_peak = power_on_peak
+        self.power_on_valley = power_on_valley
+        self.power_on_flat = power_on_flat
+
+    @classmethod
+    def from_dict(cls, info: dict[str, Any]) -> Agreement:
+        """Build from an agreementInfo object."""
+        return cls(
+            info[SERVICE_AGREEMENT_ID],
+            info[CONTRACTED_TARIFF],
+            info[CONTRACTED_VOLTAGE],
+            info[CONTRACTED_POWER_ON_PEAK],
+            info[CONTRACTED_POWER_ON_VALLEY],
+            info[CONTRACTED_POWER_ON_FLAT],
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the agreement with the API field names."""
+        return {
+            SERVICE_AGREEMENT_ID: self.service_agreement_id,
+            CONTRACTED_TARIFF: self.tariff,
+            CONTRACTED_VOLTAGE: self.voltage,
+            CONTRACTED_POWER_ON_PEAK: self.power_on_peak,
+            CONTRACTED_POWER_ON_VALLEY: self.power_on_valley,
+            CONTRACTED_POWER_ON_FLAT: self.power_on_flat,
+        }
+
+
+class Invoice(UteModel):
+    """Charges of a billed month."""
+
+    __slots__ = ("year", "month", "charges")
+
+    def __init__(self, year: int, month: int, charges: float) -> None:
+        """Initialize."""
+        self.year = year
+        self.month = month
+        self.charges = charges
+
+    @classmethod
+    def from_dict(cls, invoice: dict[str, Any]) -> Invoice:
+        """Build from an invoice object."""
+        return cls(int(invoice[YEAR]), int(invoice[MONTH]), invoice[MONTH_CHARGES])
+
+    @property
+    def key(self) -> tuple[int, int]:
+        """Return the (year, month) the invoice is indexed by."""
+        return (self.year, self.month)
+
+    @property
+    def label(self) -> str:
+        """Return the billed month, as in 'Oct 2026'."""
+        return f"{convert_number_to_month(self.month)} {self.year}"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the invoice with the API field names."""
+        return {YEAR: self.year, MONTH: self.month, MONTH_CHARGES: self.charges}
+
+
+class ConsumptionPoint(UteModel):
+    """Monthly point of the consumption chart."""
+
+    __slots__ = ("id", "timestamp", "value")
+
+    def __init__(self, id: int | None, timestamp: int, value: float) -> None:
+        """Initialize."""
+        self.id = id  # pylint: disable=invalid-name
+        self.timestamp = timestamp
+        self.value = value
+
+    @classmethod
+    def from_dict(cls, point: dict[str, Any]) -> ConsumptionPoint:
+        """Build from a unaSerie point."""
+        return cls(point.get(ID), point[MONTH_CONSUMPTION], point[VALUE])
+
+
+class Reading(UteModel):
+    """Completed remote meter reading."""
+
+    __slots__ = ("status", "current", "voltage", "power")
+
+    def __init__(self, status: Any, current: Any, voltage: Any) -> None:
+        """Initialize."""
+        self.status = status
+        self.current = current
+        self.voltage = voltage
+        self.power: float | None = None
+        if voltage and current:
+            self.power = float(voltage) * float(current)
+
+    @classmethod
+    def from_list(cls, readings: list[dict[str, Any]]) -> Reading:
+        """Build from the readings of a lastReading response."""
+        values: dict[str, Any] = {}
+        for status in readings:
+            if status[VALOR]:
+                values[status[CONSUMPTION_ATTR]] = (
+                    True if status[VALOR] == "true" else status[VALOR]
+                )
+        return cls.from_dict(values)
+
+    @classmethod
+    def from_dict(cls, values: dict[str, Any]) -> Reading:
+        """Build from the values by their API field name."""
+        return cls(
+            values.get(CURRENT_STATUS),
+            values.get(CURRENT_CONSUMPTION),
+            values.get(CURRENT_VOLTAGE),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the reading with the API field names."""
+        return {
+            CURRENT_STATUS: self.status,
+            CURRENT_CONSUMPTION: self.current,
+            CURRENT_VOLTAGE: self.voltage,
+        }
+
+
+class AccountSnapshot(UteModel):
+    """Data of a service point, as held by a coordinator.
+
+    Every tier fills its own fields and leaves the rest as None. Entities
+    read values by their description key through get().
+    """
+
+    __slots__ = (
+        "agreement",
+        "peak_time",
+        "latest_invoice",
+        "month_consumption",
+        "reading",
+    )
+
+    def __init__(
+        self,
+        agreement: Agreement | None = None,
+        peak_time: str | None = None,
+        latest_invoice: Invoice | None = None,
+        month_consumption: float | None = None,
+        reading: Reading | None = None,
+    ) -> None:
+        """Initialize."""
+        self.agreement = agreement
+        self.peak_time = peak_time
+        self.latest_invoice = latest_invoice
+        self.month_consumption = month_consumption
+        self.reading = reading
+
+    def merge(self, other: AccountSnapshot) -> AccountSnapshot:
+        """Return a snapshot with the fields set in other replacing ours."""
+        return AccountSnapshot(
+            *(
+                theirs if theirs is not None else ours
+                for ours, theirs in zip(self._values(), other._values())
+            )
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a value by its API field name."""
+        if (getter := _SNAPSHOT_KEYS.get(key)) is None:
+            return default
+        value = getter(self)
+        return default if value is None else value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the known values by their API field name."""
+        return {
+            key: value for key in _SNAPSHOT_KEYS if (value := self.get(key)) is not None
+        }
+
+    def as_storage(self) -> dict[str, Any]:
+        """Return the snapshot as JSON serializable data."""
+        return {
+            "agreement": self.agreement.as_dict() if self.agreement else None,
+            "peak_time": self.peak_time,
+            "latest_invoice": (
+                self.latest_invoice.as_dict() if self.latest_invoice else None
+            ),
+            "month_consumption": self.month_consumption,
+            "reading": self.reading.as_dict() if self.reading else None,
+        }
+
+    @classmethod
+    def from_storage(cls, data: dict[str, Any]) -> AccountSnapshot:
+        """Build from the data returned by as_storage."""
+        agreement, invoice, reading = (
+            data.get("agreement"),
+            data.get("latest_invoice"),
+            data.get("reading"),
+        )
+        return cls(
+            agreement=Agreement.from_dict(agreement) if agreement else None,
+            peak_time=data.get("peak_time"),
+            latest_invoice=Invoice.from_dict(invoice) if invoice else None,
+            month_consumption=data.get("month_consumption"),
+            reading=Reading.from_dict(reading) if reading else None,
+        )
+
+
+def _agreement_value(name: str):
+    """Return a getter of an agreement field."""
+
+    def getter(snapshot: AccountSnapshot) -> Any:
+        if snapshot.agreement is None:
+            return None
+        return getattr(snapshot.agreement, name)
+
+    return getter
+
+
+def _reading_value(name: str):
+    """Return a getter of a reading field."""
+
+    def getter(snapshot: AccountSnapshot) -> Any:
+        if snapshot.reading is None:
+            return None
+        return getattr(snapshot.reading, name)
+
+    return getter
+
+
+_SNAPSHOT_KEYS = {
+    SERVICE_AGREEMENT_ID: _agreement_value("service_agreement_id"),
+    CONTRACTED_TARIFF: _agreement_value("tariff"),
+    CONTRACTED_VOLTAGE: _agreement_value("voltage"),
+    CONTRACTED_POWER_ON_PEAK: _agreement_value("power_on_peak"),
+    CONTRACTED_POWER_ON_VALLEY: _agreement_value("power_on_valley"),
+    CONTRACTED_POWER_ON_FLAT: _agreement_value("power_on_flat"),
+    SELECTED_PEAK: lambda snapshot: snapshot.peak_time,
+    LATEST_INVOICE: lambda snapshot: (
+        snapshot.latest_invoice.label if snapshot.latest_invoice else None
+    ),
+    MONTH_CHARGES: lambda snapshot: (
+        snapshot.latest_invoice.charges if snapshot.latest_invoice else None
+    ),
+    MONTH_CONSUMPTION: lambda snapshot: snapshot.month_consumption,
+    CURRENT_STATUS: _reading_value("status"),
+    CURRENT_CONSUMPTION: _reading_value("current"),
+    CURRENT_VOLTAGE: _reading_value("voltage"),
+    CURRENT_POWER: _reading_value("power"),
+}
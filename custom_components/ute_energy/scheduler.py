@@ -0,0 +1,66 @@
+"""Adaptive interval of the real-time reading path.
+
+The meter is read again soon after the power, the voltage or the relay
+changed significantly, and less and less often while readings are stable.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+
+from .models import Reading
+from .const import (
+    ADAPTIVE_BACKOFF,
+    ADAPTIVE_MIN_POWER_DELTA,
+    ADAPTIVE_VOLTAGE_DELTA,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AdaptiveInterval:
+    """Interval between readings, shortened on change and grown when stable."""
+
+    def __init__(
+        self,
+        minimum: timedelta,
+        maximum: timedelta,
+        sensitivity: float,
+        initial: timedelta | None = None,
+    ) -> None:
+        """Initialize with the bounds and the relative power change that counts.
+
+        sensitivity is a fraction, 0.2 reacts to power changes of 20 %.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.sensitivity = sensitivity
+        self.interval = min(max(initial or minimum, minimum), maximum)
+        self._last: Reading | None = None
+
+    def changed(self, previous: Reading, current: Reading) -> bool:
+        """Return True if a reading differs significantly from the previous."""
+        if previous.status != current.status:
+            return True
+        if previous.power is not None and current.power is not None:
+            threshold = max(previous.power * self.sensitivity, ADAPTIVE_MIN_POWER_DELTA)
+            if abs(current.power - previous.power) >= threshold:
+                return True
+        if previous.voltage and current.voltage:
+            delta = abs(float(current.voltage) - float(previous.voltage))
+            if delta >= ADAPTIVE_VOLTAGE_DELTA:
+                return True
+        return False
+
+    def update(self, reading: Reading | None) -> timedelta:
+        """Return the interval until the next reading, given the latest one."""
+        if reading is None:
+            return self.interval
+        if self._last is not None:
+            if self.changed(self._last, reading):
+                self.interval = self.minimum
+            else:
+                self.interval = min(self.interval * ADAPTIVE_BACKOFF, self.maximum)
+            _LOGGER.debug("Next reading in %s", self.interval)
+        self._last = reading
+        return self.interval
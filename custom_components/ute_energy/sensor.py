@@ -1,55 +1,93 @@
 """Support for the UTE Energy service."""
 from __future__ import annotations
 
+import asyncio
+import importlib
 import logging
+import sys
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
 
 from dataclasses import dataclass
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.config_entries import ConfigEntry
-from .coordinator import UteEnergyDataUpdateCoordinator
-from homeassistant.const import EntityCategory
+from homeassistant.util import dt as dt_util
+from .breaker import CircuitBreakers
+from .coordinator import UteEnergyDataUpdateCoordinator, UteEnergyReadingCoordinator
+from .hub import UteEnergyHub
+from .metrics import EndpointMetrics
+from homeassistant.const import ATTR_ATTRIBUTION, EntityCategory
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 
 from homeassistant.const import (
+    PERCENTAGE,
     UnitOfPower,
     UnitOfEnergy,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
+    UnitOfInformation,
+    UnitOfTime,
 )
-from .utils import extract_entity_id
+from .analytics import Forecast, ForecastCache, month_to_date
+from .tariff import TariffEngine, prices_from_options
+from .utils import async_add_entity_groups, extract_entity_id, has_values
 
 from .const import (
     ACCOUNT_ID,
     ATTRIBUTION,
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CIRCUIT_BREAKER,
     CONTRACTED_TARIFF,
     CONTRACTED_POWER_ON_PEAK,
     CONTRACTED_POWER_ON_VALLEY,
     CONTRACTED_POWER_ON_FLAT,
     CONTRACTED_VOLTAGE,
+    CONSUMPTION_BASELINE,
+    CONSUMPTION_YEAR_OVER_YEAR,
+    COST_RATE,
     CURRENT_CONSUMPTION,
     CURRENT_POWER,
+    CURRENT_PRICE,
     CURRENT_STATUS,
     CURRENCY_UYU,
     CURRENT_VOLTAGE,
+    DEFAULT_NAME,
     DEFAULT_PRECISION,
     DOMAIN,
     DOUBLE_TARIFF,
     ENTRY_NAME,
-    ENTRY_COORDINATOR,
+    ENTRY_COORDINATORS,
+    ENTRY_HUB,
+    FORECAST_CHARGES,
+    FORECAST_CONSUMPTION,
     LATEST_INVOICE,
+    METRIC_ENDPOINTS,
+    MONTH_COST,
     MONTH_CHARGES,
     MONTH_CONSUMPTION,
+    READING_INTERVAL,
+    SAMPLED_ENERGY,
     SELECTED_PEAK,
     SERVICE_AGREEMENT_ID,
+    TIER_AGREEMENT,
+    TIER_BILLING,
+    TIER_READING,
+    TIERS,
     TRIPLE_TARIFF,
 )
 
@@ -62,6 +100,25 @@ class UteEnergySensorDescription(SensorEntityDescription):
 
     attributes: tuple = ()
     parent_key: str | None = None
+    tier: str = TIER_AGREEMENT
+    static: bool = False
+
+
+@dataclass
+class UteEnergyMetricSensorDescription(UteEnergySensorDescription):
+    """Request metric of an endpoint."""
+
+    endpoint: str = ""
+    value_fn: Callable[[EndpointMetrics], StateType] | None = None
+    attributes_fn: Callable[[EndpointMetrics], dict[str, Any]] | None = None
+
+
+@dataclass
+class UteEnergyForecastSensorDescription(UteEnergySensorDescription):
+    """Value of the forecast of the month in progress."""
+
+    value_fn: Callable[[Forecast], float | None] | None = None
+    attributes_fn: Callable[[Forecast], dict[str, Any]] | None = None
 
 
 SENSOR_TYPES_REAL_TIME: tuple[UteEnergySensorDescription, ...] = (
@@ -73,6 +130,7 @@ SENSOR_TYPES_REAL_TIME: tuple[UteEnergySensorDescription, ...] = (
         device_class=SensorDeviceClass.CURRENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         suggested_display_precision=DEFAULT_PRECISION,
+        tier=TIER_READING,
     ),
     UteEnergySensorDescription(
         key=CURRENT_VOLTAGE,
@@ -81,6 +139,7 @@ SENSOR_TYPES_REAL_TIME: tuple[UteEnergySensorDescription, ...] = (
         device_class=SensorDeviceClass.VOLTAGE,
         entity_category=EntityCategory.DIAGNOSTIC,
         suggested_display_precision=DEFAULT_PRECISION,
+        tier=TIER_READING,
     ),
     UteEnergySensorDescription(
         key=CURRENT_POWER,
@@ -90,6 +149,7 @@ SENSOR_TYPES_REAL_TIME: tuple[UteEnergySensorDescription, ...] = (
         device_class=SensorDeviceClass.POWER,
         entity_category=EntityCategory.DIAGNOSTIC,
         suggested_display_precision=DEFAULT_PRECISION,
+        tier=TIER_READING,
     ),
 )
 
@@ -107,53 +167,231 @@ SENSOR_TYPES_TRT: tuple[UteEnergySensorDescription, ...] = (
         name="Contracted power on flat",
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         device_class=SensorDeviceClass.POWER,
+        static=True,
     ),
     UteEnergySensorDescription(
         key=CONTRACTED_POWER_ON_VALLEY,
         name="Contracted power on valley",
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         device_class=SensorDeviceClass.POWER,
+        static=True,
+    ),
+)
+
+REFRESH_DURATION_SENSOR_TYPES: tuple[UteEnergySensorDescription, ...] = tuple(
+    UteEnergySensorDescription(
+        key=f"{tier}_refresh_duration",
+        name=f"{tier.capitalize()} refresh duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        suggested_display_precision=DEFAULT_PRECISION,
+        tier=tier,
+    )
+    for tier in TIERS
+)
+
+METRIC_SENSOR_TYPES: tuple[UteEnergyMetricSensorDescription, ...] = (
+    *(
+        UteEnergyMetricSensorDescription(
+            key=f"{endpoint.lower()}_latency",
+            name=f"{label} latency",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            suggested_display_precision=0,
+            endpoint=endpoint,
+            value_fn=lambda metrics: metrics.latency_ms(95),
+            attributes_fn=lambda metrics: {
+                "p50": metrics.latency_ms(50),
+                "max": metrics.max_latency_ms,
+            },
+        )
+        for endpoint, label in METRIC_ENDPOINTS.items()
+    ),
+    *(
+        UteEnergyMetricSensorDescription(
+            key=f"{endpoint.lower()}_requests",
+            name=f"{label} requests",
+            icon="mdi:counter",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            endpoint=endpoint,
+            value_fn=lambda metrics: metrics.calls,
+            attributes_fn=lambda metrics: {
+                "errors": metrics.error_count,
+                **metrics.errors,
+            },
+        )
+        for endpoint, label in METRIC_ENDPOINTS.items()
+    ),
+    *(
+        UteEnergyMetricSensorDescription(
+            key=f"{endpoint.lower()}_received",
+            name=f"{label} received",
+            native_unit_of_measurement=UnitOfInformation.BYTES,
+            device_class=SensorDeviceClass.DATA_SIZE,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            endpoint=endpoint,
+            value_fn=lambda metrics: metrics.bytes_received,
+        )
+        for endpoint, label in METRIC_ENDPOINTS.items()
     ),
 )
 
+CIRCUIT_BREAKER_SENSOR = UteEnergySensorDescription(
+    key=CIRCUIT_BREAKER,
+    name="API circuit breaker",
+    icon="mdi:electric-switch",
+    device_class=SensorDeviceClass.ENUM,
+    options=[BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN],
+    entity_category=EntityCategory.DIAGNOSTIC,
+    tier=TIER_READING,
+)
+
+READING_INTERVAL_SENSOR = UteEnergySensorDescription(
+    key=READING_INTERVAL,
+    name="Reading interval",
+    icon="mdi:timer-sync-outline",
+    native_unit_of_measurement=UnitOfTime.SECONDS,
+    device_class=SensorDeviceClass.DURATION,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    tier=TIER_READING,
+)
+
+SAMPLED_ENERGY_SENSOR = UteEnergySensorDescription(
+    key=SAMPLED_ENERGY,
+    name="Sampled energy",
+    native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+    device_class=SensorDeviceClass.ENERGY,
+    state_class=SensorStateClass.TOTAL_INCREASING,
+    suggested_display_precision=3,
+    tier=TIER_READING,
+)
+
+CURRENT_PRICE_SENSOR = UteEnergySensorDescription(
+    key=CURRENT_PRICE,
+    name="Current price",
+    icon="mdi:cash-clock",
+    native_unit_of_measurement=f"{CURRENCY_UYU}/{UnitOfEnergy.KILO_WATT_HOUR}",
+    suggested_display_precision=DEFAULT_PRECISION,
+)
+
+COST_RATE_SENSOR = UteEnergySensorDescription(
+    key=COST_RATE,
+    name="Cost rate",
+    icon="mdi:cash-fast",
+    native_unit_of_measurement=f"{CURRENCY_UYU}/{UnitOfTime.HOURS}",
+    state_class=SensorStateClass.MEASUREMENT,
+    suggested_display_precision=DEFAULT_PRECISION,
+    tier=TIER_READING,
+)
+
+MONTH_COST_SENSOR = UteEnergySensorDescription(
+    key=MONTH_COST,
+    name="Month-to-date estimated cost",
+    native_unit_of_measurement=CURRENCY_UYU,
+    device_class=SensorDeviceClass.MONETARY,
+    state_class=SensorStateClass.TOTAL,
+    suggested_display_precision=DEFAULT_PRECISION,
+    tier=TIER_READING,
+)
+
+FORECAST_SENSOR_TYPES: tuple[UteEnergyForecastSensorDescription, ...] = (
+    UteEnergyForecastSensorDescription(
+        key=CONSUMPTION_BASELINE,
+        name="Consumption baseline",
+        icon="mdi:chart-bell-curve",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        suggested_display_precision=DEFAULT_PRECISION,
+        tier=TIER_BILLING,
+        value_fn=lambda forecast: forecast.baseline,
+    ),
+    UteEnergyForecastSensorDescription(
+        key=CONSUMPTION_YEAR_OVER_YEAR,
+        name="Year-over-year consumption change",
+        icon="mdi:chart-line-variant",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+        tier=TIER_BILLING,
+        value_fn=lambda forecast: forecast.year_over_year,
+    ),
+    UteEnergyForecastSensorDescription(
+        key=FORECAST_CONSUMPTION,
+        name="Forecast month consumption",
+        icon="mdi:chart-timeline-variant-shimmer",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        suggested_display_precision=DEFAULT_PRECISION,
+        tier=TIER_BILLING,
+        value_fn=lambda forecast: forecast.consumption,
+        attributes_fn=lambda forecast: {"month_to_date": forecast.month_to_date},
+    ),
+    UteEnergyForecastSensorDescription(
+        key=FORECAST_CHARGES,
+        name="Forecast month charges",
+        native_unit_of_measurement=CURRENCY_UYU,
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=DEFAULT_PRECISION,
+        tier=TIER_BILLING,
+        value_fn=lambda forecast: forecast.charges,
+        attributes_fn=lambda forecast: {
+            "price": None if forecast.price is None else round(forecast.price, 2)
+        },
+    ),
+)
 
 SENSOR_TYPES_COMMON: tuple[UteEnergySensorDescription, ...] = (
     UteEnergySensorDescription(
         key=SERVICE_AGREEMENT_ID,
         name="Agreement",
         icon="mdi:identifier",
+        static=True,
     ),
     UteEnergySensorDescription(
         key=CONTRACTED_TARIFF,
         name="Contracted tarrif",
+        static=True,
     ),
     UteEnergySensorDescription(
         key=CONTRACTED_VOLTAGE,
         name="Contracted voltage",
         icon="mdi:sine-wave",
+        static=True,
     ),
     UteEnergySensorDescription(
         key=CONTRACTED_POWER_ON_PEAK,
         name="Contracted power on peak",
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         device_class=SensorDeviceClass.POWER,
+        static=True,
     ),
     UteEnergySensorDescription(
         key=LATEST_INVOICE,
         name="Latest month invoice",
         icon="mdi:calendar-month",
+        tier=TIER_BILLING,
     ),
     UteEnergySensorDescription(
         key=MONTH_CHARGES,
         name="Latest month charges",
         native_unit_of_measurement=CURRENCY_UYU,
         device_class=SensorDeviceClass.MONETARY,
+        tier=TIER_BILLING,
     ),
     UteEnergySensorDescription(
         key=MONTH_CONSUMPTION,
         name="Latest month consumption",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
+        tier=TIER_BILLING,
     ),
 )
 
@@ -167,80 +405,203 @@ async def async_setup_entry(
     domain_data = hass.data[DOMAIN][config_entry.entry_id]
     name = domain_data[ENTRY_NAME]
     account_id = domain_data[ACCOUNT_ID]
-    coordinator = domain_data[ENTRY_COORDINATOR]
+    coordinators = domain_data[ENTRY_COORDINATORS]
+    agreement = coordinators[TIER_AGREEMENT]
+    reading = coordinators[TIER_READING]
+    engine = TariffEngine(prices_from_options(config_entry.options))
+    forecasts = ForecastCache()
+    numpy_import: asyncio.Task[None] | None = None
 
-    tariff_plan = coordinator.data.get(CONTRACTED_TARIFF, None)
+    def _tariff_plan() -> str | None:
+        return agreement.data.get(CONTRACTED_TARIFF) if agreement.data else None
 
-    entities: list[AbstractUteEnergySensor] = []
+    async def _async_import_numpy() -> None:
+        await hass.async_add_import_executor_job(importlib.import_module, "numpy")
+        async_check_groups()
 
-    if all(
-        coordinator.data.get(key) is not None
-        for key in (
-            SERVICE_AGREEMENT_ID,
-            CONTRACTED_TARIFF,
-            CONTRACTED_VOLTAGE,
-            CONTRACTED_POWER_ON_PEAK,
-            CONTRACTED_POWER_ON_VALLEY,
-            CONTRACTED_POWER_ON_FLAT,
-        )
-    ):
-        entities.extend(
-            [
-                UteEnergySensor(
-                    name,
-                    account_id,
-                    f"{config_entry.unique_id}_{account_id}_{description.key}",
-                    description,
-                    coordinator,
-                )
-                for description in SENSOR_TYPES_COMMON
-            ]
-        )
+    def _forecasts_ready() -> bool:
+        """Return True once the history is known and NumPy is imported.
 
-    if tariff_plan in (DOUBLE_TARIFF, TRIPLE_TARIFF):
-        entities.extend(
-            [
-                UteEnergySensor(
-                    name,
-                    account_id,
-                    f"{config_entry.unique_id}_{account_id}_{description.key}",
-                    description,
-                    coordinator,
-                )
-                for description in SENSOR_TYPES_TRD_TRT
-            ]
-        )
+        NumPy is only needed by the forecasts, it is imported off the event
+        loop the first time they could be added.
+        """
+        nonlocal numpy_import
+        if not has_values(coordinators[TIER_BILLING], (MONTH_CONSUMPTION,)):
+            return False
+        if "numpy" in sys.modules:
+            return True
+        if numpy_import is None:
+            numpy_import = config_entry.async_create_background_task(
+                hass, _async_import_numpy(), f"{DOMAIN} numpy import"
+            )
+        return False
+
+    def _sensors(
+        descriptions: tuple[UteEnergySensorDescription, ...]
+    ) -> Callable[[], list[AbstractUteEnergySensor]]:
+        return lambda: [
+            (UteEnergyStaticSensor if description.static else UteEnergySensor)(
+                name,
+                account_id,
+                f"{config_entry.unique_id}_{account_id}_{description.key}",
+                description,
+                coordinators[description.tier],
+            )
+            for description in descriptions
+        ]
 
-    if tariff_plan == TRIPLE_TARIFF:
-        entities.extend(
-            [
-                UteEnergySensor(
-                    name,
-                    account_id,
-                    f"{config_entry.unique_id}_{account_id}_{description.key}",
-                    description,
-                    coordinator,
-                )
-                for description in SENSOR_TYPES_TRT
-            ]
+    async_check_groups = async_add_entity_groups(
+        config_entry,
+        coordinators.values(),
+        [
+            (
+                lambda: has_values(
+                    agreement,
+                    (
+                        SERVICE_AGREEMENT_ID,
+                        CONTRACTED_TARIFF,
+                        CONTRACTED_VOLTAGE,
+                        CONTRACTED_POWER_ON_PEAK,
+                        CONTRACTED_POWER_ON_VALLEY,
+                        CONTRACTED_POWER_ON_FLAT,
+                    ),
+                ),
+                _sensors(SENSOR_TYPES_COMMON),
+            ),
+            (
+                lambda: _tariff_plan() in (DOUBLE_TARIFF, TRIPLE_TARIFF),
+                _sensors(SENSOR_TYPES_TRD_TRT),
+            ),
+            (
+                lambda: _tariff_plan() == TRIPLE_TARIFF,
+                _sensors(SENSOR_TYPES_TRT),
+            ),
+            (
+                lambda: has_values(
+                    reading,
+                    (
+                        CURRENT_STATUS,
+                        CURRENT_POWER,
+                        CURRENT_CONSUMPTION,
+                        CURRENT_VOLTAGE,
+                    ),
+                ),
+                _sensors(SENSOR_TYPES_REAL_TIME),
+            ),
+            (
+                lambda: reading.sampling and has_values(reading, (CURRENT_POWER,)),
+                lambda: [
+                    UteEnergySampledEnergySensor(
+                        name,
+                        account_id,
+                        f"{config_entry.unique_id}_{account_id}_{SAMPLED_ENERGY}",
+                        SAMPLED_ENERGY_SENSOR,
+                        reading,
+                    )
+                ],
+            ),
+            (
+                lambda: _tariff_plan() is not None,
+                lambda: [
+                    UteEnergyPriceSensor(
+                        name,
+                        account_id,
+                        f"{config_entry.unique_id}_{account_id}_{CURRENT_PRICE}",
+                        CURRENT_PRICE_SENSOR,
+                        agreement,
+                        agreement,
+                        engine,
+                    )
+                ],
+            ),
+            (
+                lambda: _tariff_plan() is not None
+                and has_values(reading, (CURRENT_POWER,)),
+                lambda: [
+                    UteEnergyCostRateSensor(
+                        name,
+                        account_id,
+                        f"{config_entry.unique_id}_{account_id}_{COST_RATE}",
+                        COST_RATE_SENSOR,
+                        reading,
+                        agreement,
+                        engine,
+                    ),
+                    UteEnergyMonthCostSensor(
+                        name,
+                        account_id,
+                        f"{config_entry.unique_id}_{account_id}_{MONTH_COST}",
+                        MONTH_COST_SENSOR,
+                        reading,
+                        agreement,
+                        engine,
+                        coordinators[TIER_BILLING],
+                    ),
+                ],
+            ),
+            (
+                _forecasts_ready,
+                lambda: [
+                    UteEnergyForecastSensor(
+                        name,
+                        account_id,
+                        f"{config_entry.unique_id}_{account_id}_{description.key}",
+                        description,
+                        coordinators[description.tier],
+                        forecasts,
+                    )
+                    for description in FORECAST_SENSOR_TYPES
+                ],
+            ),
+        ],
+        async_add_entities,
+    )
+
+    entities: list[AbstractUteEnergySensor] = []
+    hub: UteEnergyHub = domain_data[ENTRY_HUB]
+    hub.async_add_metrics_platform(
+        config_entry.entry_id,
+        lambda: async_add_entities(
+            UteEnergyMetricSensor(
+                f"{hub.unique_id}_{description.key}", description, hub
+            )
+            for description in METRIC_SENSOR_TYPES
+        ),
+    )
+    entities.extend(
+        [
+            UteEnergyRefreshDurationSensor(
+                name,
+                account_id,
+                f"{config_entry.unique_id}_{account_id}_{description.key}",
+                description,
+                coordinators[description.tier],
+            )
+            for description in REFRESH_DURATION_SENSOR_TYPES
+        ]
+    )
+
+    if (breakers := hub.client.breakers) is not None:
+        entities.append(
+            UteEnergyCircuitBreakerSensor(
+                name,
+                account_id,
+                f"{config_entry.unique_id}_{account_id}_{CIRCUIT_BREAKER}",
+                CIRCUIT_BREAKER_SENSOR,
+                coordinators[CIRCUIT_BREAKER_SENSOR.tier],
+                breakers,
+            )
         )
 
-    if all(
-        coordinator.data.get(key) is not None
-        for key in (CURRENT_STATUS, CURRENT_POWER, CURRENT_CONSUMPTION, CURRENT_VOLTAGE)
-    ):
-        entities.extend(
-            [
-                UteEnergySensor(
-                    name,
-                    account_id,
-                    f"{config_entry.unique_id}_{account_id}_{description.key}",
-                    description,
-                    coordinator,
-                )
-                for description in SENSOR_TYPES_REAL_TIME
-            ]
+    entities.append(
+        UteEnergyIntervalSensor(
+            name,
+            account_id,
+            f"{config_entry.unique_id}_{account_id}_{READING_INTERVAL}",
+            READING_INTERVAL_SENSOR,
+            coordinators[READING_INTERVAL_SENSOR.tier],
         )
+    )
 
     async_add_entities(entities)
 
@@ -256,11 +617,12 @@ class AbstractUteEnergySensor(SensorEntity):
         name: str,
         unique_id: str,
         description: UteEnergySensorDescription,
-        coordinator: DataUpdateCoordinator,
+        coordinator: DataUpdateCoordinator | None,
     ) -> None:
         """Initialize the sensor."""
         self.entity_description = description
         self._coordinator = coordinator
+        self._written: tuple[Any, ...] | None = None
 
         self._attr_name = f"{name} {description.name}"
         self._attr_unique_id = unique_id
@@ -278,9 +640,27 @@ class AbstractUteEnergySensor(SensorEntity):
     async def async_added_to_hass(self) -> None:
         """Connect to dispatcher listening for entity data notifications."""
         self.async_on_remove(
-            self._coordinator.async_add_listener(self.async_write_ha_state)
+            self._coordinator.async_add_listener(self._async_write_if_changed)
         )
 
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return what a state write would publish."""
+        return (self.available, self.native_value, self.extra_state_attributes)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember what was written."""
+        self._written = self._state_fingerprint()
+        super().async_write_ha_state()
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write the state only if value, attributes or availability changed."""
+        if (fingerprint := self._state_fingerprint()) == self._written:
+            return
+        self._written = fingerprint
+        super().async_write_ha_state()
+
     async def async_update(self) -> None:
         """Get the latest data from Ute API and updates the states."""
         await self._coordinator.async_request_refresh()
@@ -311,3 +691,451 @@ class UteEnergySensor(AbstractUteEnergySensor):
     def device_info(self) -> DeviceInfo:
         """Return device info."""
         return self._coordinator.device_info
+
+
+class UteEnergyStaticSensor(UteEnergySensor):
+    """Contract value, which only changes with the contract.
+
+    The last known value stays available through failed refreshes and the
+    constant attribution is left out of the recorder.
+    """
+
+    _unrecorded_attributes = frozenset({ATTR_ATTRIBUTION})
+
+    @property
+    def available(self) -> bool:
+        """Return True while a contract value is known."""
+        return self.native_value is not None
+
+
+class UteEnergySampledEnergySensor(UteEnergySensor, RestoreSensor):
+    """Energy integrated from the sampled meter power.
+
+    The total restored at startup is carried over, so the counter keeps
+    increasing across restarts.
+    """
+
+    _unrecorded_attributes = frozenset({"samples", "average_power"})
+
+    def __init__(
+        self,
+        name: str,
+        account_id: str,
+        unique_id: str,
+        description: UteEnergySensorDescription,
+        coordinator: UteEnergyReadingCoordinator,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(name, account_id, unique_id, description, coordinator)
+        self._sampler = coordinator.sampler
+        self._restored = 0.0
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the kWh integrated so far."""
+        return round(self._restored + self._sampler.energy, 4)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the buffered samples and their mean power."""
+        average = self._sampler.average_power
+        return {
+            "samples": len(self._sampler.buffer),
+            "average_power": None if average is None else round(average, 1),
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last total."""
+        if (last := await self.async_get_last_sensor_data()) is not None:
+            self._restored = float(last.native_value or 0)
+        await super().async_added_to_hass()
+
+
+class UteEnergyTariffSensor(UteEnergySensor):
+    """Sensor priced by the local tariff engine.
+
+    Bands change with the hour, so the state is also checked on the hour.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        account_id: str,
+        unique_id: str,
+        description: UteEnergySensorDescription,
+        coordinator: UteEnergyDataUpdateCoordinator,
+        agreement: UteEnergyDataUpdateCoordinator,
+        engine: TariffEngine,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(name, account_id, unique_id, description, coordinator)
+        self._agreement = agreement
+        self._engine = engine
+
+    def _price(self, moment: datetime) -> float:
+        """Return the $U/kWh of the contracted tariff at a moment."""
+        data = self._agreement.data
+        return self._engine.price(
+            data.get(CONTRACTED_TARIFF), data.get(SELECTED_PEAK), moment
+        )
+
+    @callback
+    def _async_on_hour(self, now: datetime) -> None:
+        """Check the state when the band may change."""
+        self._async_write_if_changed()
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to the coordinator and the hour."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_change(self.hass, self._async_on_hour, minute=0, second=0)
+        )
+
+
+class UteEnergyPriceSensor(UteEnergyTariffSensor):
+    """Energy price of the band in effect."""
+
+    @property
+    def available(self) -> bool:
+        """Return True while the contracted tariff is known."""
+        return self._agreement.data.get(CONTRACTED_TARIFF) is not None
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the current $U/kWh."""
+        return self._price(dt_util.now())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the band in effect."""
+        data = self._agreement.data
+        return {
+            "band": self._engine.band(
+                data.get(CONTRACTED_TARIFF), data.get(SELECTED_PEAK), dt_util.now()
+            )
+        }
+
+
+class UteEnergyCostRateSensor(UteEnergyTariffSensor):
+    """Cost per hour of the current power draw."""
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the current $U/h."""
+        if (power := self._coordinator.data.get(CURRENT_POWER)) is None:
+            return None
+        data = self._agreement.data
+        return round(
+            self._engine.cost_rate(
+                data.get(CONTRACTED_TARIFF),
+                data.get(SELECTED_PEAK),
+                dt_util.now(),
+                float(power),
+            ),
+            4,
+        )
+
+
+class UteEnergyMonthCostSensor(UteEnergyTariffSensor, RestoreSensor):
+    """Cost of the energy consumed since the month began.
+
+    The month-to-date kWh of the consumption chart is priced at the average
+    band price of the month so far. Energy integrated from the readings
+    after the chart last changed is added at the band in effect when it is
+    accounted, until the chart catches up. The total restarts with every
+    month and is restored across restarts.
+    """
+
+    _coordinator: UteEnergyReadingCoordinator
+
+    def __init__(
+        self,
+        name: str,
+        account_id: str,
+        unique_id: str,
+        description: UteEnergySensorDescription,
+        coordinator: UteEnergyReadingCoordinator,
+        agreement: UteEnergyDataUpdateCoordinator,
+        engine: TariffEngine,
+        billing: UteEnergyDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            name, account_id, unique_id, description, coordinator, agreement, engine
+        )
+        self._billing = billing
+        self._month = dt_util.start_of_local_day().replace(day=1)
+        self._charted: float | None = None
+        self._charted_cost = 0.0
+        self._sampled = 0.0
+        self._sampled_cost = 0.0
+        self._seen = coordinator.sampler.energy
+
+    @property
+    def available(self) -> bool:
+        """Return True, the total is kept while readings fail."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the $U spent this month."""
+        return round(self._charted_cost + self._sampled_cost, 2)
+
+    @property
+    def last_reset(self) -> datetime:
+        """Return the start of the month."""
+        return self._month
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the energy accounted this month."""
+        return {
+            "energy": round((self._charted or 0.0) + self._sampled, 3),
+            "charted_energy": self._charted,
+            "sampled_energy": round(self._sampled, 3),
+            "sampled_cost": round(self._sampled_cost, 4),
+        }
+
+    def _month_to_date(self) -> float | None:
+        """Return the kWh charted by UTE for the month in progress."""
+        client = self._billing.ute_api
+        return month_to_date(
+            client.consumption_history.get(
+                str(self._billing.account_service_point_id), []
+            ),
+            dt_util.now().date(),
+        )
+
+    @callback
+    def _async_accumulate(self) -> None:
+        """Price the charted energy and the energy integrated after it."""
+        now = dt_util.now()
+        if (month := dt_util.start_of_local_day(now).replace(day=1)) != self._month:
+            self._month = month
+            self._charted = None
+            self._charted_cost = self._sampled = self._sampled_cost = 0.0
+        if (charted := self._month_to_date()) is not None and charted != self._charted:
+            # The chart now includes the energy sampled until here.
+            data = self._agreement.data
+            self._charted = charted
+            self._charted_cost = charted * self._engine.average_price(
+                data.get(CONTRACTED_TARIFF), data.get(SELECTED_PEAK), self._month, now
+            )
+            self._sampled = self._sampled_cost = 0.0
+        energy = self._coordinator.sampler.energy
+        if (delta := energy - self._seen) > 0:
+            self._sampled += delta
+            self._sampled_cost += delta * self._price(now)
+        self._seen = energy
+        self._async_write_if_changed()
+
+    @callback
+    def _async_on_hour(self, now: datetime) -> None:
+        """Account the energy of the closing band."""
+        self._async_accumulate()
+
+    async def async_added_to_hass(self) -> None:
+        """Restore this month's total and listen to readings, billing and the hour."""
+        last_state = await self.async_get_last_state()
+        last_data = await self.async_get_last_sensor_data()
+        if (
+            last_state is not None
+            and last_data is not None
+            and last_data.native_value is not None
+            and last_state.attributes.get("last_reset") == self._month.isoformat()
+        ):
+            attributes = last_state.attributes
+            self._charted = attributes.get("charted_energy")
+            self._sampled = float(attributes.get("sampled_energy") or 0)
+            self._sampled_cost = float(attributes.get("sampled_cost") or 0)
+            self._charted_cost = float(last_data.native_value) - self._sampled_cost
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._async_accumulate)
+        )
+        self.async_on_remove(self._billing.async_add_listener(self._async_accumulate))
+        self.async_on_remove(
+            async_track_time_change(self.hass, self._async_on_hour, minute=0, second=0)
+        )
+        self._async_accumulate()
+
+
+class UteEnergyForecastSensor(UteEnergySensor):
+    """Forecast of the month in progress from the billing history."""
+
+    entity_description: UteEnergyForecastSensorDescription
+
+    def __init__(
+        self,
+        name: str,
+        account_id: str,
+        unique_id: str,
+        description: UteEnergyForecastSensorDescription,
+        coordinator: UteEnergyDataUpdateCoordinator,
+        forecasts: ForecastCache,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(name, account_id, unique_id, description, coordinator)
+        self._forecasts = forecasts
+
+    def _forecast(self) -> Forecast:
+        """Return the forecast of the history known by the client."""
+        client = self._coordinator.ute_api
+        account_id = str(self._coordinator.account_service_point_id)
+        return self._forecasts.get(
+            client.consumption_history.get(account_id, []),
+            client.invoice_stores.get(account_id),
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the forecast value."""
+        value = self.entity_description.value_fn(self._forecast())
+        return None if value is None else round(value, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the figures the value was derived from."""
+        if (attributes_fn := self.entity_description.attributes_fn) is None:
+            return None
+        return attributes_fn(self._forecast())
+
+
+class UteEnergyCircuitBreakerSensor(UteEnergySensor):
+    """State of the circuit breakers guarding the UTE API."""
+
+    def __init__(
+        self,
+        name: str,
+        account_id: str,
+        unique_id: str,
+        description: UteEnergySensorDescription,
+        coordinator: UteEnergyDataUpdateCoordinator,
+        breakers: CircuitBreakers,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(name, account_id, unique_id, description, coordinator)
+        self._breakers = breakers
+
+    @property
+    def available(self) -> bool:
+        """Return True, the breakers are known even while the API is down."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the worst breaker state."""
+        return self._breakers.state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the host breaker and the endpoints not closed."""
+        attributes: dict[str, Any] = {
+            "host": self._breakers.host.state,
+            "retry_in": round(self._breakers.host.retry_in),
+        }
+        attributes.update(
+            {
+                endpoint: breaker.state
+                for endpoint, breaker in self._breakers.endpoints.items()
+                if breaker.state != BREAKER_CLOSED
+            }
+        )
+        return attributes
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state on every breaker transition."""
+        self.async_on_remove(
+            self._breakers.async_add_listener(self._async_write_if_changed)
+        )
+
+
+class UteEnergyMetricSensor(AbstractUteEnergySensor):
+    """Request metric of an endpoint, counted for every service point of a hub."""
+
+    entity_description: UteEnergyMetricSensorDescription
+
+    def __init__(
+        self,
+        unique_id: str,
+        description: UteEnergyMetricSensorDescription,
+        hub: UteEnergyHub,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_id = extract_entity_id(DEFAULT_NAME, "api", description.name)
+        super().__init__(f"{DEFAULT_NAME} API", unique_id, description, None)
+        self._hub = hub
+
+    @property
+    def available(self) -> bool:
+        """Return True, metrics are local."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the metric value."""
+        return self.entity_description.value_fn(self._metrics)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the related metrics."""
+        if (attributes_fn := self.entity_description.attributes_fn) is None:
+            return None
+        return attributes_fn(self._metrics)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device of the hub."""
+        return self._hub.device_info
+
+    @property
+    def _metrics(self) -> EndpointMetrics:
+        """Return the metrics of the endpoint."""
+        return self._hub.client.metrics.endpoint(self.entity_description.endpoint)
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state after every poll of the hub."""
+        self.async_on_remove(self._hub.async_add_listener(self._async_write_if_changed))
+
+    async def async_update(self) -> None:
+        """Nothing to fetch, the metrics are pushed by the hub."""
+
+
+class UteEnergyRefreshDurationSensor(UteEnergySensor):
+    """Duration of the last refresh of a tier, pushed after every refresh."""
+
+    @property
+    def available(self) -> bool:
+        """Return True, the duration is local."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the seconds the last refresh took."""
+        return self._coordinator.last_cycle_duration
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state after every refresh."""
+        self.async_on_remove(
+            self._coordinator.async_add_refresh_listener(self._async_write_if_changed)
+        )
+
+
+class UteEnergyIntervalSensor(UteEnergySensor):
+    """Current interval of the real-time reading path."""
+
+    @property
+    def available(self) -> bool:
+        """Return True, the interval is local."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the seconds until the next reading."""
+        return self._coordinator.update_interval.total_seconds()
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state after every refresh and availability change."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._coordinator.async_add_refresh_listener(self._async_write_if_changed)
+        )
@@ -0,0 +1,91 @@
+"""Persist the last data of every coordinator across restarts."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .models import AccountSnapshot
+from .const import (
+    DOMAIN,
+    SNAPSHOTS,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_KEY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UteEnergySnapshotStore:
+    """Keep the last snapshot of every tier of every config entry.
+
+    Snapshots are serialized when the delayed save runs, so frequent
+    updates only cost a dict assignment until then.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, SNAPSHOT_STORAGE_KEY
+        )
+        self._stored: dict[str, dict[str, dict[str, Any]]] = {}
+        self._pending: dict[str, dict[str, AccountSnapshot]] = {}
+        self._load_task: asyncio.Task | None = None
+
+    async def async_load(self) -> None:
+        """Load persisted snapshots once."""
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Read snapshots from storage."""
+        if stored := await self._store.async_load():
+            self._stored = stored.get(SNAPSHOTS, {})
+        _LOGGER.debug("Loaded snapshots of %s entries", len(self._stored))
+
+    def get(self, entry_id: str, tier: str) -> AccountSnapshot | None:
+        """Return the last snapshot of a tier, None if unknown or unreadable."""
+        if (snapshot := self._pending.get(entry_id, {}).get(tier)) is not None:
+            return snapshot
+        if (data := self._stored.get(entry_id, {}).get(tier)) is None:
+            return None
+        try:
+            return AccountSnapshot.from_storage(data)
+        except (KeyError, TypeError, ValueError) as error:
+            _LOGGER.debug("Ignoring stored %s snapshot: %s", tier, error)
+            return None
+
+    def set(self, entry_id: str, tier: str, snapshot: AccountSnapshot) -> None:
+        """Store the latest snapshot of a tier."""
+        self._pending.setdefault(entry_id, {})[tier] = snapshot
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def remove(self, entry_id: str) -> None:
+        """Drop the snapshots of a removed config entry."""
+        self._stored.pop(entry_id, None)
+        self._pending.pop(entry_id, None)
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the snapshots to persist, serializing the updated ones."""
+        for entry_id, snapshots in self._pending.items():
+            stored = self._stored.setdefault(entry_id, {})
+            for tier, snapshot in snapshots.items():
+                stored[tier] = snapshot.as_storage()
+        self._pending = {}
+        return {SNAPSHOTS: self._stored}
+
+
+async def async_get_snapshot_store(hass: HomeAssistant) -> UteEnergySnapshotStore:
+    """Return the shared snapshot store, loading it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (snapshots := domain_data.get(SNAPSHOTS)) is None:
+        snapshots = domain_data[SNAPSHOTS] = UteEnergySnapshotStore(hass)
+    await snapshots.async_load()
+    return snapshots
@@ -0,0 +1,212 @@
+"""Import UTE billing history into Home Assistant long-term statistics."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import datetime
+import logging
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .coordinator import UteEnergyBillingCoordinator
+from .models import ConsumptionPoint, Invoice
+from .const import (
+    CURRENCY_UYU,
+    DEFAULT_NAME,
+    DOMAIN,
+    STATISTICS_CHUNK_SIZE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+MonthlyPoints = list[tuple[datetime.datetime, float]]
+
+
+def _month_start(year: int, month: int) -> datetime.datetime:
+    """Return local midnight of the first day of a month."""
+    return dt_util.start_of_local_day(datetime.date(year, month, 1))
+
+
+def energy_points(series: list[ConsumptionPoint]) -> MonthlyPoints:
+    """Return completed months of the consumption chart as (start, kWh).
+
+    Chart points carry the month as an epoch timestamp in milliseconds,
+    placeholders without id or timestamp are dropped. The current month is
+    still being billed, so it is only imported once it is over.
+    """
+    now = dt_util.now()
+    current_month = _month_start(now.year, now.month)
+    points: dict[datetime.datetime, float] = {}
+    for point in series:
+        if not point.id or not point.timestamp:
+            continue
+        moment = dt_util.as_local(dt_util.utc_from_timestamp(point.timestamp / 1000))
+        start = _month_start(moment.year, moment.month)
+        if start < current_month:
+            points[start] = float(point.value or 0)
+    return sorted(points.items())
+
+
+def cost_points(invoices: list[Invoice]) -> MonthlyPoints:
+    """Return the invoices as (start of the billed month, charges)."""
+    return [
+        (_month_start(invoice.year, invoice.month), float(invoice.charges or 0))
+        for invoice in invoices
+    ]
+
+
+def _row_start(row: dict[str, Any]) -> datetime.datetime:
+    """Return the start of a statistics row as an aware datetime."""
+    start = row["start"]
+    if isinstance(start, datetime.datetime):
+        return start
+    return dt_util.utc_from_timestamp(start)
+
+
+class UteEnergyStatisticsImporter:
+    """Keep the energy and cost statistics of a service point up to date.
+
+    Imports run as a background task whenever the billing data changes. Only
+    months after the last imported one are added, so a restart resumes where
+    the recorder left off and new months are appended to the running sum.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: UteEnergyBillingCoordinator, name: str
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.name = name
+        self._task: asyncio.Task[None] | None = None
+        self._pending = False
+        self._unsub: CALLBACK_TYPE | None = None
+
+        account_service_point_id = str(coordinator.account_service_point_id).lower()
+        self._statistics: tuple[
+            tuple[StatisticMetaData, Callable[[], MonthlyPoints]], ...
+        ] = (
+            (
+                StatisticMetaData(
+                    has_mean=False,
+                    has_sum=True,
+                    name=f"{DEFAULT_NAME} {name} energy",
+                    source=DOMAIN,
+                    statistic_id=f"{DOMAIN}:energy_{account_service_point_id}",
+                    unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+                ),
+                self._energy_points,
+            ),
+            (
+                StatisticMetaData(
+                    has_mean=False,
+                    has_sum=True,
+                    name=f"{DEFAULT_NAME} {name} cost",
+                    source=DOMAIN,
+                    statistic_id=f"{DOMAIN}:cost_{account_service_point_id}",
+                    unit_of_measurement=CURRENCY_UYU,
+                ),
+                self._cost_points,
+            ),
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Import on every billing update, starting with the current data."""
+        self._unsub = self.coordinator.async_add_listener(self.async_schedule)
+        self.async_schedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening and cancel a running import."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def async_schedule(self) -> None:
+        """Start an import, or queue one behind the import already running."""
+        if self._task is not None and not self._task.done():
+            self._pending = True
+            return
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} statistics import {self.name}"
+        )
+
+    def _energy_points(self) -> MonthlyPoints:
+        """Return the monthly energy points known by the client."""
+        client = self.coordinator.ute_api
+        account_id = str(self.coordinator.account_service_point_id)
+        return energy_points(client.consumption_history.get(account_id, []))
+
+    def _cost_points(self) -> MonthlyPoints:
+        """Return the monthly cost points known by the client."""
+        client = self.coordinator.ute_api
+        account_id = str(self.coordinator.account_service_point_id)
+        store = client.invoice_stores.get(account_id)
+        return cost_points(store.as_list() if store is not None else [])
+
+    async def _async_run(self) -> None:
+        """Import until no billing update arrived during the last import."""
+        while True:
+            self._pending = False
+            for metadata, points in self._statistics:
+                try:
+                    await self._async_import(metadata, points())
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Unable to import statistics %s", metadata["statistic_id"]
+                    )
+            if not self._pending:
+                return
+
+    async def _async_import(
+        self, metadata: StatisticMetaData, points: MonthlyPoints
+    ) -> None:
+        """Append the points after the last imported month, in chunks."""
+        if not points:
+            return
+
+        statistic_id = metadata["statistic_id"]
+        last_stats = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+        )
+        last_start: datetime.datetime | None = None
+        total = 0.0
+        if rows := last_stats.get(statistic_id):
+            last_start = _row_start(rows[0])
+            total = rows[0].get("sum") or 0.0
+
+        new_points = [
+            (start, value)
+            for start, value in points
+            if last_start is None or start > last_start
+        ]
+        if not new_points:
+            return
+
+        _LOGGER.debug(
+            "Importing %s months into %s, from %s",
+            len(new_points),
+            statistic_id,
+            new_points[0][0],
+        )
+        for index in range(0, len(new_points), STATISTICS_CHUNK_SIZE):
+            statistics: list[StatisticData] = []
+            for start, value in new_points[index : index + STATISTICS_CHUNK_SIZE]:
+                total += value
+                statistics.append(StatisticData(start=start, state=value, sum=total))
+            async_add_external_statistics(self.hass, metadata, statistics)
+            await asyncio.sleep(0)
@@ -0,0 +1,105 @@
+"""Local tariff engine pricing UTE consumption without calling the API.
+
+Every tariff and peak start maps to a precomputed table with the band of
+each hour of the week. The triple tariff has its valley from midnight to
+VALLEY_END and its peak for PEAK_HOURS from the selected start, weekdays
+only. The double tariff only has peak and off-peak. Holidays are priced as
+weekdays.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from functools import lru_cache
+import math
+import re
+from typing import Any
+
+from .const import (
+    BAND_FLAT,
+    BAND_OFF_PEAK,
+    BAND_PEAK,
+    BAND_SIMPLE,
+    BAND_VALLEY,
+    CONF_PRICE,
+    DEFAULT_PEAK_START,
+    DEFAULT_PRICES,
+    DOUBLE_TARIFF,
+    PEAK_HOURS,
+    TRIPLE_TARIFF,
+    VALLEY_END,
+)
+
+_PEAK_START = re.compile(r"(\d{1,2})[:.h]")
+
+
+def parse_peak_start(description: str | None) -> int:
+    """Return the peak start hour of a description like 18:00."""
+    if description and (match := _PEAK_START.search(description)):
+        if 0 <= (hour := int(match.group(1))) < 24:
+            return hour
+    return DEFAULT_PEAK_START
+
+
+@lru_cache(maxsize=16)
+def band_table(tariff: str | None, peak_start: int) -> tuple[str, ...]:
+    """Return the band of every hour of the week, Monday 00:00 first."""
+    table = []
+    for weekday in range(7):
+        for hour in range(24):
+            peak = weekday < 5 and 0 <= hour - peak_start < PEAK_HOURS
+            if tariff == DOUBLE_TARIFF:
+                table.append(BAND_PEAK if peak else BAND_OFF_PEAK)
+            elif tariff == TRIPLE_TARIFF:
+                if peak:
+                    table.append(BAND_PEAK)
+                elif hour < VALLEY_END:
+                    table.append(BAND_VALLEY)
+                else:
+                    table.append(BAND_FLAT)
+            else:
+                table.append(BAND_SIMPLE)
+    return tuple(table)
+
+
+def prices_from_options(options: Mapping[str, Any]) -> dict[str, float]:
+    """Return the price of every band, options overriding the defaults."""
+    return {
+        band: float(options.get(CONF_PRICE.format(band), price))
+        for band, price in DEFAULT_PRICES.items()
+    }
+
+
+class TariffEngine:
+    """Price energy and power of a service point by time of use."""
+
+    def __init__(self, prices: Mapping[str, float]) -> None:
+        """Initialize the engine with the $U/kWh of every band."""
+        self.prices = dict(prices)
+
+    def band(self, tariff: str | None, peak: str | None, moment: datetime) -> str:
+        """Return the band of a moment."""
+        table = band_table(tariff, parse_peak_start(peak))
+        return table[moment.weekday() * 24 + moment.hour]
+
+    def price(self, tariff: str | None, peak: str | None, moment: datetime) -> float:
+        """Return the $U/kWh of a moment."""
+        return self.prices[self.band(tariff, peak, moment)]
+
+    def average_price(
+        self, tariff: str | None, peak: str | None, start: datetime, end: datetime
+    ) -> float:
+        """Return the $U/kWh of energy drawn evenly from start to end."""
+        table = band_table(tariff, parse_peak_start(peak))
+        hours = max(1, math.ceil((end - start).total_seconds() / 3600))
+        total = 0.0
+        for hour in range(hours):
+            moment = start + timedelta(hours=hour)
+            total += self.prices[table[moment.weekday() * 24 + moment.hour]]
+        return total / hours
+
+    def cost_rate(
+        self, tariff: str | None, peak: str | None, moment: datetime, watts: float
+    ) -> float:
+        """Return the $U/h of drawing watts at a moment."""
+        return watts / 1000 * self.price(tariff, peak, moment)
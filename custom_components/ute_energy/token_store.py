@@ -0,0 +1,77 @@
+"""Persist UTE bearer tokens across restarts.
+
+Tokens are kept in a private Store (readable by the Home Assistant user only)
+rather than in the config entry: the entry already holds the credentials the
+token is derived from, one token is shared by every entry of a user, and
+updating entry data on each refresh would reload those entries through the
+options update listener. A token is dropped with the last entry of its user.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    TOKENS,
+    TOKEN_SAVE_DELAY,
+    TOKEN_STORAGE_KEY,
+)
+from .utils import credentials_key
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UteEnergyTokenStore:
+    """Keep the last bearer token of every UTE user."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, TOKEN_STORAGE_KEY, private=True
+        )
+        self._tokens: dict[str, str] = {}
+        self._load_task: asyncio.Task | None = None
+
+    async def async_load(self) -> None:
+        """Load persisted tokens once."""
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Read tokens from storage."""
+        if stored := await self._store.async_load():
+            self._tokens = stored.get(TOKENS, {})
+
+    def get(self, email: str, phone: str) -> str | None:
+        """Return the stored token of a user."""
+        return self._tokens.get(credentials_key(email, phone))
+
+    def set(self, email: str, phone: str, token: str) -> None:
+        """Store the token of a user."""
+        self._tokens[credentials_key(email, phone)] = token
+        _LOGGER.debug("Storing refreshed UTE token")
+        self._store.async_delay_save(lambda: {TOKENS: self._tokens}, TOKEN_SAVE_DELAY)
+
+    def remove(self, email: str, phone: str) -> None:
+        """Forget the token of a user."""
+        if self._tokens.pop(credentials_key(email, phone), None) is not None:
+            self._store.async_delay_save(
+                lambda: {TOKENS: self._tokens}, TOKEN_SAVE_DELAY
+            )
+
+
+async def async_get_token_store(hass: HomeAssistant) -> UteEnergyTokenStore:
+    """Return the shared token store, loading it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (token_store := domain_data.get(TOKENS)) is None:
+        token_store = domain_data[TOKENS] = UteEnergyTokenStore(hass)
+    await token_store.async_load()
+    return token_store
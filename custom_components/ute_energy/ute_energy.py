@@ -1,24 +1,41 @@
 """Perform UTE API requests"""
 from __future__ import annotations
 
+import asyncio
 import logging
 import json
 import datetime
+from functools import partial
+import hashlib
+import random
 import time
 
-from typing import Any
-import requests
+from collections.abc import Awaitable, Callable, Coroutine, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+import aiohttp
 
 from .utils import (
     generate_random_string,
     generate_random_agent_id,
-    convert_number_to_month,
 )
 
 
+from .invoices import InvoiceStore
+from .metrics import UteEnergyMetrics
+from .models import (
+    AccountSnapshot,
+    Agreement,
+    ConsumptionPoint,
+    Invoice,
+    Reading,
+    json_loads,
+    log_response,
+)
 from .exceptions import (
     UteEnergyException,
     UteApiAccessDenied,
+    UteApiCircuitOpen,
     UteApiUnauthorized,
 )
 
@@ -28,62 +45,117 @@ from .const import (
     AGREEMENT_INFO,
     BASE_ACCOUNTS,
     BASE_URL,
-    CONSUMPTION_ATTR,
     CONTRACTED_TARIFF,
-    CONTRACTED_VOLTAGE,
-    CONTRACTED_POWER_ON_PEAK,
-    CONTRACTED_POWER_ON_VALLEY,
-    CONTRACTED_POWER_ON_FLAT,
-    CURRENT_CONSUMPTION,
-    CURRENT_POWER,
-    CURRENT_VOLTAGE,
     DATA,
     ENDPOINTS,
+    GET_ACCOUNT_INFO,
     HEADERS,
-    ID,
     INVOICES,
     INVOICE_INFO,
     MISC_BEHAVIOUR,
-    LATEST_INVOICE,
     LAST_READING,
     METER_PEAK,
     MAX_WAIT_TIME,
-    MONTH,
-    MONTH_CHARGES,
-    MONTH_CONSUMPTION,
     PEAK_INFO,
     SELECTED_PEAK,
+    TARIFF_ENDPOINTS,
     PHONE_LENGHT,
     PHONE_START_WIHT,
     READINGS,
     READING_INPROGRESS,
+    READING_MIN_INTERVAL,
+    READING_POLL_BACKOFF,
+    READING_POLL_DEADLINE,
+    READING_POLL_JITTER,
+    READING_POLL_MAX_DELAY,
     READING_REQUEST,
     REQUEST_CODE,
     REQUEST_CONSUMPTION,
+    REQUEST_PRIORITIES,
     REQUEST_TOKEN,
     RESPONSE_RESULT,
     RESPONSE_STATUS,
     SINGLE_SERIE,
-    SERVICE_AGREEMENT_ID,
     TOKEN_TYPE,
     VALIDATE_CODE,
-    VALOR,
-    VALUE,
-    YEAR,
 )
 
+if TYPE_CHECKING:
+    from .breaker import CircuitBreakers
+    from .cache import UteEnergyCache
+    from .limiter import RequestLimiter
+
 _LOGGER = logging.getLogger(__name__)
 
 
-class UteEnergy:
-    """Main class to perform UTE API requests."""
+@dataclass
+class ReadingPollSettings:
+    """Backoff and deadline used while waiting for a remote meter reading.
+
+    A reading requested less than min_interval seconds ago is reused instead
+    of triggering another meter read, unless the service point has its own
+    interval in reading_min_intervals.
+    """
+
+    initial_delay: float = MAX_WAIT_TIME
+    max_delay: float = READING_POLL_MAX_DELAY
+    backoff: float = READING_POLL_BACKOFF
+    jitter: float = READING_POLL_JITTER
+    deadline: float = READING_POLL_DEADLINE
+    min_interval: float = READING_MIN_INTERVAL
+
+
+@dataclass
+class ReadingPollStats:
+    """Number of lastReading polls spent on the readings of an account."""
+
+    last_polls: int = 0
+    max_polls: int = 0
+    total_polls: int = 0
+    readings: int = 0
+    timeouts: int = 0
+    shared: int = 0
+    reused: int = 0
+
+    def record(self, polls: int, completed: bool) -> None:
+        """Record a finished reading poll."""
+        self.last_polls = polls
+        self.max_polls = max(self.max_polls, polls)
+        self.total_polls += polls
+        if completed:
+            self.readings += 1
+        else:
+            self.timeouts += 1
+
+
+@dataclass
+class FingerprintStats:
+    """How often an endpoint answered with the same body as last time."""
 
-    def __init__(self, email: str, phone: str) -> None:
+    fetched: int = 0
+    unchanged: int = 0
+
+
+class BaseUteEnergy:
+    """Shared credentials handling and response parsing for UTE API clients."""
+
+    def __init__(
+        self,
+        email: str,
+        phone: str,
+        reading_poll: ReadingPollSettings | None = None,
+        base_url: str = BASE_URL,
+    ) -> None:
         """Initialize."""
         self.email = email
         self.phone = phone
+        self.base_url = base_url
         self.service_token = None
-        self.session = None
+        self.reading_poll = reading_poll or ReadingPollSettings()
+        self.reading_stats: dict[str, ReadingPollStats] = {}
+        self.reading_min_intervals: dict[str, float] = {}
+        self.invoice_stores: dict[str, InvoiceStore] = {}
+        self.consumption_history: dict[str, list[ConsumptionPoint]] = {}
 
         self.failed_logins = 0
 
@@ -98,6 +170,172 @@ class UteEnergy:
 
         self.client_id = generate_random_string(6)
 
+    def _check_credentials(self) -> bool:
+        """Return True if user data are valid."""
+        if (
+            isinstance(self.email, str)
+            and isinstance(self.phone, str)
+            and len(self.phone) == PHONE_LENGHT
+            and self.phone.startswith(PHONE_START_WIHT)
+        ):
+            return True
+        return False
+
+    def _login_payload(self) -> dict[str, str]:
+        """Return login request payload."""
+        return {"Email": self.email, "PhoneNumber": self.phone}
+
+    def _auth_code_payload(self) -> dict[str, Any]:
+        """Return auth code request payload."""
+        return {
+            "UserId": 0,
+            "Name": self.email,
+            "Email": self.email,
+            "PhoneNumber": self.phone,
+            "IsValidated": False,
+            "IsBanned": False,
+            "UniqueId": None,
+        }
+
+    def _parse_service_agreement(self, content: dict[str, Any]) -> Agreement | None:
+        """Parse agreement and meter info."""
+        if content.get(DATA, None) and content[DATA].get(AGREEMENT_INFO, None):
+            return Agreement.from_dict(content[DATA][AGREEMENT_INFO])
+        return None
+
+    def _parse_peak_time(self, content: dict[str, Any]) -> dict[str, str]:
+        """Parse peak time info."""
+        data: dict[str, str] = {}
+
+        peak_time = SELECTED_PEAK or METER_PEAK
+
+        data.update({peak_time: content[DATA][peak_time]})
+        return data
+
+    def _peak_behaviour_payload(self, account_id: str) -> dict[str, str]:
+        """Return tariff peak availability payload."""
+        return {
+            "Name": "IsTariffPeakSelectionAvailable",
+            "Value": None,
+            ACCOUNT_SERVICE_POINT_ID: account_id,
+        }
+
+    def _invoice_store(self, account_id: str) -> InvoiceStore:
+        """Return the invoice store of an account."""
+        return self.invoice_stores.setdefault(str(account_id), InvoiceStore())
+
+    def _invoice_path(self, account_id: str) -> str:
+        """Return the invoice page path covering every missing invoice."""
+        page_size = self._invoice_store(account_id).page_size(datetime.date.today())
+        return ENDPOINTS[INVOICE_INFO].format(account_id, page_size)
+
+    def _parse_latest_invoice_info(
+        self, account_id: str, content: dict[str, Any]
+    ) -> Invoice | None:
+        """Merge an invoice page into the store and return the latest invoice."""
+        store = self._invoice_store(account_id)
+        if content[RESPONSE_STATUS]:
+            store.merge(content[DATA][INVOICES])
+        return store.latest
+
+    def _parse_latest_month_consumption_info(
+        self, account_id: str, content: dict[str, Any]
+    ) -> float | None:
+        """Parse latest month consumption and keep the monthly series."""
+        if not content[RESPONSE_STATUS]:
+            return None
+
+        active_consumption = [
+            ConsumptionPoint.from_dict(point)
+            for point in content[DATA][0][ACTIVE_CONSUMPTION][SINGLE_SERIE]
+        ]
+        self.consumption_history[str(account_id)] = active_consumption
+        return self._extract_latest_consumption_info(active_consumption).value
+
+    def _extract_latest_consumption_info(
+        self, active_consumption: list[ConsumptionPoint]
+    ) -> ConsumptionPoint:
+        """Extract latest month consumption info."""
+        active_consumption_filtered = [
+            point
+            for point in active_consumption
+            if point.id is not None and point.id > 0
+        ]
+        if (
+            len(active_consumption_filtered) > 0
+            and active_consumption[0].timestamp == 0
+        ):
+            return active_consumption_filtered[-1]
+        return max(active_consumption, key=lambda point: point.timestamp)
+
+    def _reading_poll_delay(self, attempt: int, remaining: float) -> float:
+        """Return the wait before the next lastReading poll.
+
+        The delay grows exponentially from the initial delay up to the max
+        delay, is randomized by the jitter ratio and never exceeds the time
+        left before the deadline.
+        """
+        settings = self.reading_poll
+        delay = min(
+            settings.initial_delay * settings.backoff ** (attempt - 1),
+            settings.max_delay,
+        )
+        delay *= 1 + random.uniform(-settings.jitter, settings.jitter)
+        return max(0.0, min(delay, remaining))
+
+    def _record_reading_poll(
+        self, account_id: str, polls: int, completed: bool
+    ) -> None:
+        """Keep per account poll counters."""
+        self.reading_stats.setdefault(account_id, ReadingPollStats()).record(
+            polls, completed
+        )
+        if not completed:
+            _LOGGER.warning(
+                "Reading for account %s not ready after %s polls, giving up for this cycle",
+                account_id,
+                polls,
+            )
+
+    def _parse_latest_reading_info(self, content: dict[str, Any]) -> Reading:
+        """Parse a completed meter reading."""
+        return Reading.from_list(content[DATA][READINGS])
+
+    def _build_api_error(
+        self, action: str, status: int, reason: str | None, text: str
+    ) -> Exception:
+        """Return the exception matching a failed UTE API response."""
+        message = (
+            f"{action} return status: {status}, reason: {reason}, content: {text}",
+        )
+
+        if status == 401:
+            return UteApiAccessDenied(message)
+
+        if status == 403:
+            return UteApiUnauthorized(message)
+
+        return UteEnergyException(message, status)
+
+
+class UteEnergy(BaseUteEnergy):
+    """Main class to perform UTE API requests.
+
+    Blocking client built on requests, kept for scripts and tooling. Home
+    Assistant uses AsyncUteEnergy.
+    """
+
+    def __init__(
+        self,
+        email: str,
+        phone: str,
+        reading_poll: ReadingPollSettings | None = None,
+        base_url: str = BASE_URL,
+    ) -> None:
+        """Initialize."""
+        self.session = None
+        super().__init__(email, phone, reading_poll, base_url)
+
     def login(self) -> bool:
         """Login in to Ute API.
 
@@ -111,10 +349,9 @@ class UteEnergy:
 
         self._init_session()
 
-        url = BASE_URL + ENDPOINTS[REQUEST_TOKEN]
-        payload: dict[str, str] = {"Email": self.email, "PhoneNumber": self.phone}
+        url = self.base_url + ENDPOINTS[REQUEST_TOKEN]
 
-        response = self._call_ute_api("POST", url, "Login", payload)
+        response = self._call_ute_api("POST", url, "Login", self._login_payload())
 
         service_token = response.text
 
@@ -126,44 +363,28 @@ class UteEnergy:
             return True
         return False
 
-    def _check_credentials(self) -> bool:
-        """Return True if user data are valid."""
-        if (
-            isinstance(self.email, str)
-            and isinstance(self.phone, str)
-            and len(self.phone) == PHONE_LENGHT
-            and self.phone.startswith(PHONE_START_WIHT)
-        ):
-            return True
-        return False
-
     def _init_session(self, reset=False):
         """Initilize session object."""
         if not self.session or reset:
+            # Only the blocking client uses requests, keep it off the import path.
+            import requests  # pylint: disable=import-outside-toplevel
+
             self.session = requests.Session()
             self.session.headers.update(HEADERS)
 
     def request_auth_code(self) -> None:
         """Retrieve auth code from UTE API."""
 
-        url = BASE_URL + ENDPOINTS[REQUEST_CODE]
+        url = self.base_url + ENDPOINTS[REQUEST_CODE]
 
-        payload: dict[str, str] = {
-            "UserId": 0,
-            "Name": self.email,
-            "Email": self.email,
-            "PhoneNumber": self.phone,
-            "IsValidated": False,
-            "IsBanned": False,
-            "UniqueId": None,
-        }
-
-        return self._call_ute_api("POST", url, "Request auth code", payload)
+        return self._call_ute_api(
+            "POST", url, "Request auth code", self._auth_code_payload()
+        )
 
     def validate_auth_code(self, code: str) -> bool:
         """Validate authentication code"""
 
-        url = BASE_URL + ENDPOINTS[VALIDATE_CODE]
+        url = self.base_url + ENDPOINTS[VALIDATE_CODE]
 
         payload: dict[str, str] = {"ValidationCode": code}
 
@@ -175,196 +396,103 @@ class UteEnergy:
 
     def request_accounts(self) -> Any:
         """Request all user account services"""
-        url = BASE_URL + ENDPOINTS[BASE_ACCOUNTS]
+        url = self.base_url + ENDPOINTS[BASE_ACCOUNTS]
         content = self._call_ute_api("GET", url, "Request accounts")
         return content[DATA]
 
-    def retrieve_service_account_data(self, account_id: str) -> dict[str, Any]:
+    def retrieve_service_account_data(self, account_id: str) -> AccountSnapshot:
         """Retrieve service account data."""
-        data = self._retrieve_service_agreement(account_id)
+        data = AccountSnapshot(
+            agreement=self._retrieve_service_agreement(account_id),
+            latest_invoice=self._retrieve_latest_invoice_info(account_id),
+            month_consumption=self._retrieve_latest_month_consumption_info(account_id),
+        )
         if self._is_tariff_peak_available(account_id):
-            data.update(self._retrieve_peak_time(account_id))
-        data.update(self._retrieve_latest_invoice_info(account_id))
-        data.update(self._retrieve_latest_month_consumption_info(account_id))
+            data.peak_time = self._retrieve_peak_time(account_id)
         if self._is_remote_reading_available(account_id):
-            data.update(self._retrieve_latest_reading_info(account_id))
+            data.reading = self._retrieve_latest_reading_info(account_id)
         return data
 
-    def _retrieve_service_agreement(self, account_id: str) -> dict[str, Any]:
+    def _retrieve_service_agreement(self, account_id: str) -> Agreement | None:
         """Retrieve agreement and meter info from UTE API"""
-        url = f"{BASE_URL}{ENDPOINTS[BASE_ACCOUNTS]}/{account_id}"
+        path = ENDPOINTS[GET_ACCOUNT_INFO].format(account_id)
+        url = f"{self.base_url}{path}"
 
-        data: dict[str, Any] = {}
         content = self._call_ute_api("GET", url, "Retrieve service agreement")
-        if content.get(DATA, None) and content[DATA].get(AGREEMENT_INFO, None):
-            agreement_info = content[DATA][AGREEMENT_INFO]
-            data.update(
-                {
-                    SERVICE_AGREEMENT_ID: agreement_info[SERVICE_AGREEMENT_ID],
-                    CONTRACTED_TARIFF: agreement_info[CONTRACTED_TARIFF],
-                    CONTRACTED_VOLTAGE: agreement_info[CONTRACTED_VOLTAGE],
-                    CONTRACTED_POWER_ON_PEAK: agreement_info[CONTRACTED_POWER_ON_PEAK],
-                    CONTRACTED_POWER_ON_VALLEY: agreement_info[
-                        CONTRACTED_POWER_ON_VALLEY
-                    ],
-                    CONTRACTED_POWER_ON_FLAT: agreement_info[CONTRACTED_POWER_ON_FLAT],
-                }
-            )
-
-        return data
+        return self._parse_service_agreement(content)
 
-    def _retrieve_peak_time(self, account_id: str) -> dict[str, str] | None:
+    def _retrieve_peak_time(self, account_id: str) -> str | None:
         """Retrieve account and meter info from UTE API"""
-        data: dict[str, str] = {}
-
         path = ENDPOINTS[PEAK_INFO].format(account_id)
 
-        url = f"{BASE_URL}{path}"
+        url = f"{self.base_url}{path}"
 
         content = self._call_ute_api("GET", url, "Retrieve peak time")
-
-        peak_time = SELECTED_PEAK or METER_PEAK
-
-        data.update({peak_time: content[DATA][peak_time]})
-        return data
+        return self._parse_peak_time(content).get(SELECTED_PEAK)
 
     def _is_tariff_peak_available(self, account_id: str) -> bool:
         """Retrieve peak tariff availability"""
-        url = f"{BASE_URL}{ENDPOINTS[MISC_BEHAVIOUR]}"
-
-        payload: dict[str, str] = {
-            "Name": "IsTariffPeakSelectionAvailable",
-            "Value": None,
-            ACCOUNT_SERVICE_POINT_ID: account_id,
-        }
+        url = f"{self.base_url}{ENDPOINTS[MISC_BEHAVIOUR]}"
 
         content = self._call_ute_api(
-            "POST", url, "Verify tariff peak selection available", payload
+            "POST",
+            url,
+            "Verify tariff peak selection available",
+            self._peak_behaviour_payload(account_id),
         )
         return content[RESPONSE_STATUS]
 
-    def _retrieve_latest_invoice_info(self, account_id: str) -> dict[str, str]:
+    def _retrieve_latest_invoice_info(self, account_id: str) -> Invoice | None:
         """Retrieve latest invoice info"""
-        path = ENDPOINTS[INVOICE_INFO].format(account_id)
-        url = f"{BASE_URL}/{path}"
+        url = f"{self.base_url}/{self._invoice_path(account_id)}"
 
-        data: dict[str, Any] = {
-            LATEST_INVOICE: None,
-            MONTH_CHARGES: 0,
-        }
         content = self._call_ute_api("GET", url, "Retrieve latest invoice info")
+        return self._parse_latest_invoice_info(account_id, content)
 
-        if content[RESPONSE_STATUS]:
-            invoices = content[DATA][INVOICES]
-            if len(invoices) > 0:
-                latest_invoice = self._extract_latest_invoice_info(invoices)
-                _month = convert_number_to_month(latest_invoice[MONTH])
-                data[LATEST_INVOICE] = f"{_month} {latest_invoice[YEAR]}"
-                data[MONTH_CHARGES] = latest_invoice[MONTH_CHARGES]
-
-        return data
-
-    def _extract_latest_invoice_info(
-        self, invoices: list[dict[str, Any]]
-    ) -> dict[str, str]:
-        """Extract last invoice info"""
-        today = datetime.datetime.today()
-
-        last_invoice = max(
-            invoices,
-            key=lambda x: (x[YEAR], x[MONTH]) <= (today.year, today.month),
-        )
-        return last_invoice
-
-    def _retrieve_latest_month_consumption_info(
-        self, account_id: str
-    ) -> dict[str, Any]:
+    def _retrieve_latest_month_consumption_info(self, account_id: str) -> float | None:
         """Retrieve latest month consumption info"""
         path = ENDPOINTS[REQUEST_CONSUMPTION].format(account_id)
-        url = f"{BASE_URL}/{path}"
+        url = f"{self.base_url}/{path}"
 
-        data: dict[str, Any] = {MONTH_CONSUMPTION: None}
         content = self._call_ute_api("GET", url, "Retrieve latest consumption")
-
-        if content[RESPONSE_STATUS]:
-            active_consumption = content[DATA][0][ACTIVE_CONSUMPTION][SINGLE_SERIE]
-            latest_consumption = self._extract_latest_consumption_info(
-                active_consumption
-            )
-            data[MONTH_CONSUMPTION] = latest_consumption[VALUE]
-        return data
+        return self._parse_latest_month_consumption_info(account_id, content)
 
     def _is_remote_reading_available(self, account_id: str) -> bool:
         """Send reading request to UTE API"""
-        url = f"{BASE_URL}{ENDPOINTS[READING_REQUEST]}"
+        url = f"{self.base_url}{ENDPOINTS[READING_REQUEST]}"
         payload: dict[str, str] = {ACCOUNT_SERVICE_POINT_ID: account_id}
 
         content = self._call_ute_api("POST", url, "Send reading request", payload)
         return content[RESPONSE_STATUS]
 
-    def _retrieve_latest_reading_info(self, account_id: str) -> dict[str, str]:
-        """Send reading request to UTE API"""
+    def _retrieve_latest_reading_info(self, account_id: str) -> Reading | None:
+        """Poll the latest reading until the meter answers or the deadline."""
         path = ENDPOINTS[LAST_READING].format(account_id)
-        url = f"{BASE_URL}/{path}"
+        url = f"{self.base_url}/{path}"
 
-        data: dict[str, Any] = {}
-        # reading_in_process = True
-        reading_result = READING_INPROGRESS
+        deadline = time.monotonic() + self.reading_poll.deadline
         count = 1
-        while reading_result == READING_INPROGRESS:
-            _LOGGER.debug(
-                "Waiting %s s to avoid to many requests, account: %s, request: #%s",
-                MAX_WAIT_TIME,
-                account_id,
-                count,
-            )
+        while True:
             content = self._call_ute_api("GET", url, "Retrieve latest reading info")
 
             if content[RESPONSE_RESULT] != READING_INPROGRESS:
-                reading_result = content[RESPONSE_RESULT]
-                latest_reading = content[DATA][READINGS]
-
-                for status in latest_reading:
-                    if status[VALOR]:
-                        if status[VALOR] == "true":
-                            status[VALOR] = True
-                        data[status[CONSUMPTION_ATTR]] = status[VALOR]
-
-                if data.get(CURRENT_VOLTAGE, None) and data.get(
-                    CURRENT_CONSUMPTION, None
-                ):
-                    current_power = float(data[CURRENT_VOLTAGE]) * float(
-                        data[CURRENT_CONSUMPTION]
-                    )
-                    data.update({CURRENT_POWER: current_power})
-                continue
+                self._record_reading_poll(account_id, count, True)
+                return self._parse_latest_reading_info(content)
 
-            count += 1
-            time.sleep(MAX_WAIT_TIME)
-
-        return data
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._record_reading_poll(account_id, count, False)
+                return None
 
-    def _extract_latest_consumption_info(
-        self, active_consumption: list[dict[str, Any]]
-    ) -> dict[str, Any]:
-        """Extract latest month consumption info."""
-        latest_consumption: dict[str, Any] = {VALUE: 0}
-
-        active_consumption_filtered = list(
-            filter(
-                lambda x: x.get(ID, None) is not None and x[ID] > 0, active_consumption
-            )
-        )
-        if (
-            len(active_consumption_filtered) > 0
-            and active_consumption[0][MONTH_CONSUMPTION] == 0
-        ):
-            latest_consumption = active_consumption_filtered[-1]
-        else:
-            latest_consumption = max(
-                active_consumption, key=lambda x: x[MONTH_CONSUMPTION]
+            delay = self._reading_poll_delay(count, remaining)
+            _LOGGER.debug(
+                "Waiting %.1f s to avoid to many requests, account: %s, request: #%s",
+                delay,
+                account_id,
+                count,
             )
-        return latest_consumption
+            count += 1
+            time.sleep(delay)
 
     def _call_ute_api(self, method, url, action, payload=None) -> dict[str, Any]:
         """Execute request to UTE API."""
@@ -375,25 +503,544 @@ class UteEnergy:
             if response.status_code == 200:
                 if action == "Login":
                     return response
-                _LOGGER.debug(
-                    "%s return status: %s, content: %s",
-                    action,
-                    response.status_code,
-                    response.json(),
-                )
-                return response.json()
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    log_response(_LOGGER, action, response.status_code, response.text)
+                return json_loads(response.content)
+
+            raise self._build_api_error(
+                action, response.status_code, response.reason, response.text
+            )
+
+        except (
+            UteApiUnauthorized,
+            UteApiAccessDenied,
+            UteEnergyException,
+        ) as error:
+            _LOGGER.error(error.message)
+            raise error
+
+        except Exception as error:
+            _LOGGER.error("%s failed: %s", action, error, exc_info=True)
+            raise error
+
+
+class AsyncUteEnergy(BaseUteEnergy):
+    """Perform UTE API requests on the event loop using aiohttp."""
+
+    def __init__(
+        self,
+        email: str,
+        phone: str,
+        session: aiohttp.ClientSession,
+        concurrent_fetch: bool = True,
+        reading_poll: ReadingPollSettings | None = None,
+        cache: UteEnergyCache | None = None,
+        service_token: str | None = None,
+        on_token_refresh: Callable[[str], None] | None = None,
+        limiter: RequestLimiter | None = None,
+        breakers: CircuitBreakers | None = None,
+        base_url: str = BASE_URL,
+    ) -> None:
+        """Initialize."""
+        super().__init__(email, phone, reading_poll, base_url)
+        self.session = session
+        self.concurrent_fetch = concurrent_fetch
+        self.cache = cache
+        self.limiter = limiter
+        self.breakers = breakers
+        self.on_token_refresh = on_token_refresh
+        self.fingerprint_stats: dict[str, FingerprintStats] = {}
+        self.metrics = UteEnergyMetrics()
+        self._sections: dict[tuple[str, str], tuple[bytes, Any]] = {}
+        self._readings: dict[str, asyncio.Task[Reading | None]] = {}
+        self._reading_waiters: dict[asyncio.Task[Reading | None], int] = {}
+        self._last_readings: dict[str, tuple[float, Reading | None]] = {}
+        self.headers: dict[str, str] = dict(HEADERS)
+        self._login_lock = asyncio.Lock()
+        if service_token:
+            self._set_token(service_token)
+
+    async def login(self) -> bool:
+        """Login in to Ute API.
+
+        Concurrent callers share a single token request.
+
+        :return: True if login successful, False otherwise.
+        """
+        if not self._check_credentials():
+            return False
+
+        async with self._login_lock:
+            if self.email and self.service_token:
+                return True
+
+            url = self.base_url + ENDPOINTS[REQUEST_TOKEN]
+
+            service_token = await self._call_ute_api(
+                "POST", url, "Login", self._login_payload(), endpoint=REQUEST_TOKEN
+            )
+
+            if service_token:
+                self._set_token(service_token)
+                if self.on_token_refresh is not None:
+                    self.on_token_refresh(service_token)
+                return True
+            return False
+
+    def _set_token(self, service_token: str) -> None:
+        """Use a bearer token for the next requests."""
+        self.service_token = service_token
+        self.headers["Authorization"] = f"{TOKEN_TYPE} {self.service_token}"
+
+    async def _refresh_token(self, stale_token: str | None) -> None:
+        """Drop a rejected token and login again.
+
+        Only the first caller holding the stale token requests a new one, the
+        rest wait on the login lock and reuse the refreshed token.
+        """
+        async with self._login_lock:
+            if self.service_token == stale_token:
+                _LOGGER.debug("Token rejected by UTE API, login again")
+                self.service_token = None
+                self.headers.pop("Authorization", None)
+
+        await self.login()
+
+    async def request_auth_code(self) -> dict[str, Any]:
+        """Retrieve auth code from UTE API."""
+        url = self.base_url + ENDPOINTS[REQUEST_CODE]
+
+        return await self._call_ute_api(
+            "POST",
+            url,
+            "Request auth code",
+            self._auth_code_payload(),
+            endpoint=REQUEST_CODE,
+        )
+
+    async def validate_auth_code(self, code: str) -> bool:
+        """Validate authentication code"""
+        url = self.base_url + ENDPOINTS[VALIDATE_CODE]
+
+        payload: dict[str, str] = {"ValidationCode": code}
+
+        response = await self._call_ute_api(
+            "POST", url, "Validate authentication code", payload, endpoint=VALIDATE_CODE
+        )
+
+        return response[RESPONSE_STATUS]
+
+    async def request_accounts(self) -> Any:
+        """Request all user account services"""
+        url = self.base_url + ENDPOINTS[BASE_ACCOUNTS]
+        content = await self._call_ute_api(
+            "GET", url, "Request accounts", endpoint=BASE_ACCOUNTS
+        )
+        return content[DATA]
+
+    async def retrieve_service_account_data(self, account_id: str) -> AccountSnapshot:
+        """Retrieve service account data.
+
+        In concurrent mode independent endpoints are requested in parallel and
+        only dependent calls are chained: peak data after the agreement, peak
+        time after the peak availability check and the latest reading after
+        the reading request.
+        """
+        return self._merge(
+            await self._retrieve(
+                self.retrieve_agreement_data(account_id),
+                self.retrieve_billing_data(account_id),
+                self.retrieve_reading_data(account_id),
+            )
+        )
+
+    async def retrieve_agreement_data(self, account_id: str) -> AccountSnapshot:
+        """Retrieve contract data: agreement and peak time.
+
+        The peak sections are read after the agreement, so a tariff change
+        found by this refresh drops them before they are read.
+        """
+        agreement = await self._retrieve_service_agreement(account_id)
+        peak_time = await self._retrieve_peak_time_if_available(account_id)
+        return AccountSnapshot(agreement=agreement, peak_time=peak_time)
+
+    async def retrieve_billing_data(self, account_id: str) -> AccountSnapshot:
+        """Retrieve billing data: latest invoice and consumption chart."""
+        latest_invoice, month_consumption = await self._retrieve(
+            self._retrieve_latest_invoice_info(account_id),
+            self._retrieve_latest_month_consumption_info(account_id),
+        )
+        return AccountSnapshot(
+            latest_invoice=latest_invoice, month_consumption=month_consumption
+        )
+
+    async def retrieve_reading_data(self, account_id: str) -> AccountSnapshot:
+        """Retrieve the real-time meter reading."""
+        return AccountSnapshot(
+            reading=await self._retrieve_latest_reading_if_available(account_id)
+        )
+
+    async def _retrieve(self, *coros: Coroutine[Any, Any, Any]) -> list[Any]:
+        """Run data requests honoring the fetch mode, results in order."""
+        if self.concurrent_fetch:
+            return await self._gather(*coros)
+
+        results: list[Any] = []
+        try:
+            for coro in coros:
+                results.append(await coro)
+        finally:
+            for coro in coros:
+                coro.close()
+        return results
+
+    def _merge(self, results: list[AccountSnapshot]) -> AccountSnapshot:
+        """Merge partial snapshots in order."""
+        data = AccountSnapshot()
+        for result in results:
+            data = data.merge(result)
+        return data
+
+    async def _gather(self, *coros: Awaitable[Any]) -> list[Any]:
+        """Run coroutines concurrently, cancelling the rest if one fails."""
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def _retrieve_peak_time_if_available(self, account_id: str) -> str | None:
+        """Retrieve peak time when the tariff supports peak selection."""
+        if await self._is_tariff_peak_available(account_id):
+            return await self._retrieve_peak_time(account_id)
+        return None
+
+    async def _retrieve_latest_reading_if_available(
+        self, account_id: str
+    ) -> Reading | None:
+        """Return the meter reading of an account, reading the meter if needed.
+
+        Every reading request triggers a physical meter read, so concurrent
+        callers share the read in flight and a read requested less than
+        min_interval ago is returned again. The read is cancelled with its
+        last waiting caller.
+        """
+        stats = self.reading_stats.setdefault(account_id, ReadingPollStats())
+        if (task := self._readings.get(account_id)) is not None:
+            stats.shared += 1
+            return await self._wait_reading(task)
+
+        loop = asyncio.get_running_loop()
+        if (last := self._last_readings.get(account_id)) is not None and (
+            loop.time() - last[0]
+            < self.reading_min_intervals.get(account_id, self.reading_poll.min_interval)
+        ):
+            stats.reused += 1
+            return last[1]
 
-            message = (
-                f"{action} return status: {response.status_code}, reason: {response.reason}, content: {response.text}",
+        task = self._readings[account_id] = asyncio.ensure_future(
+            self._read_meter(account_id, loop.time())
+        )
+        task.add_done_callback(partial(self._reading_done, account_id))
+        return await self._wait_reading(task)
+
+    async def _wait_reading(self, task: asyncio.Task[Reading | None]) -> Reading | None:
+        """Wait for a shared meter read, cancelling it if no caller is left."""
+        self._reading_waiters[task] = self._reading_waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._reading_waiters[task] == 1:
+                task.cancel()
+            raise
+        finally:
+            if (waiters := self._reading_waiters.pop(task) - 1) > 0:
+                self._reading_waiters[task] = waiters
+
+    async def _read_meter(self, account_id: str, started: float) -> Reading | None:
+        """Request a remote reading and retrieve it once accepted."""
+        reading = None
+        if await self._is_remote_reading_available(account_id):
+            reading = await self._retrieve_latest_reading_info(account_id)
+        self._last_readings[account_id] = (started, reading)
+        return reading
+
+    def _reading_done(self, account_id: str, task: asyncio.Task) -> None:
+        """Forget a finished meter read, its result is kept by _read_meter."""
+        if self._readings.get(account_id) is task:
+            del self._readings[account_id]
+        if not task.cancelled():
+            # Retrieved here too, every caller may have been cancelled.
+            task.exception()
+
+    def forget_sections(
+        self, account_id: str | None = None, endpoints: Iterable[str] | None = None
+    ) -> None:
+        """Drop kept sections, so identical responses are parsed again."""
+        self._sections = {
+            key: section
+            for key, section in self._sections.items()
+            if not (
+                (account_id is None or key[1] == str(account_id))
+                and (endpoints is None or key[0] in endpoints)
             )
+        }
 
-            if response.status_code == 401:
-                raise UteApiAccessDenied(message)
+    def cancel_reading(self, account_id: str) -> None:
+        """Cancel the meter read in flight of an account."""
+        if (task := self._readings.get(account_id)) is not None:
+            task.cancel()
+
+    def cancel_readings(self) -> None:
+        """Cancel the meter reads in flight."""
+        for task in list(self._readings.values()):
+            task.cancel()
+
+    async def _cached(
+        self,
+        endpoint: str,
+        account_id: str,
+        fetch: Callable[[], Coroutine[Any, Any, Any]],
+        model: type[Agreement] | None = None,
+    ) -> Any:
+        """Return the cached endpoint value or fetch and cache it.
+
+        Models are stored with their API field names and rebuilt on hits.
+        """
+        if self.cache is None:
+            return await fetch()
 
-            if response.status_code == 403:
-                raise UteApiUnauthorized(message)
+        if (value := self.cache.get(endpoint, account_id)) is not None:
+            return model.from_dict(value) if model is not None else value
 
-            raise UteEnergyException(message)
+        value = await fetch()
+        if value is not None:
+            self.cache.set(
+                endpoint, account_id, value.as_dict() if model is not None else value
+            )
+        return value
+
+    async def _retrieve_service_agreement(self, account_id: str) -> Agreement | None:
+        """Retrieve agreement and meter info, cached."""
+        return await self._cached(
+            GET_ACCOUNT_INFO,
+            account_id,
+            lambda: self._fetch_service_agreement(account_id),
+            Agreement,
+        )
+
+    async def _fetch_service_agreement(self, account_id: str) -> Agreement | None:
+        """Retrieve agreement and meter info from UTE API"""
+        path = ENDPOINTS[GET_ACCOUNT_INFO].format(account_id)
+        url = f"{self.base_url}{path}"
+
+        data = await self._call_ute_api_section(
+            GET_ACCOUNT_INFO,
+            account_id,
+            self._parse_service_agreement,
+            "GET",
+            url,
+            "Retrieve service agreement",
+        )
+
+        if self.cache is not None and (
+            previous := self.cache.peek(GET_ACCOUNT_INFO, account_id)
+        ):
+            if data is None or previous.get(CONTRACTED_TARIFF) != data.tariff:
+                _LOGGER.debug("Tariff changed for account %s", account_id)
+                for endpoint in TARIFF_ENDPOINTS:
+                    self.cache.invalidate(account_id, endpoint)
+                self.forget_sections(account_id, TARIFF_ENDPOINTS)
+        return data
+
+    async def _retrieve_peak_time(self, account_id: str) -> str | None:
+        """Retrieve peak time, cached."""
+        peak_time = await self._cached(
+            PEAK_INFO, account_id, lambda: self._fetch_peak_time(account_id)
+        )
+        return peak_time.get(SELECTED_PEAK)
+
+    async def _fetch_peak_time(self, account_id: str) -> dict[str, str]:
+        """Retrieve account and meter info from UTE API"""
+        path = ENDPOINTS[PEAK_INFO].format(account_id)
+        url = f"{self.base_url}{path}"
+
+        return await self._call_ute_api_section(
+            PEAK_INFO,
+            account_id,
+            self._parse_peak_time,
+            "GET",
+            url,
+            "Retrieve peak time",
+        )
+
+    async def _is_tariff_peak_available(self, account_id: str) -> bool:
+        """Retrieve peak tariff availability, cached."""
+        return await self._cached(
+            MISC_BEHAVIOUR,
+            account_id,
+            lambda: self._fetch_tariff_peak_available(account_id),
+        )
+
+    async def _fetch_tariff_peak_available(self, account_id: str) -> bool:
+        """Retrieve peak tariff availability"""
+        url = f"{self.base_url}{ENDPOINTS[MISC_BEHAVIOUR]}"
+
+        content = await self._call_ute_api(
+            "POST",
+            url,
+            "Verify tariff peak selection available",
+            self._peak_behaviour_payload(account_id),
+            endpoint=MISC_BEHAVIOUR,
+        )
+        return content[RESPONSE_STATUS]
+
+    async def _retrieve_latest_invoice_info(self, account_id: str) -> Invoice | None:
+        """Retrieve latest invoice info"""
+        url = f"{self.base_url}/{self._invoice_path(account_id)}"
+
+        store = self._invoice_store(account_id)
+        version = store.version
+        data = await self._call_ute_api_section(
+            INVOICE_INFO,
+            account_id,
+            partial(self._parse_latest_invoice_info, account_id),
+            "GET",
+            url,
+            "Retrieve latest invoice info",
+        )
+        if self.cache is not None and store.version != version:
+            self.cache.set(INVOICE_INFO, account_id, store.as_storage())
+        return data
+
+    def _invoice_store(self, account_id: str) -> InvoiceStore:
+        """Return the invoice store of an account, seeded from the cache."""
+        if (
+            str(account_id) not in self.invoice_stores
+            and self.cache is not None
+            and (stored := self.cache.peek(INVOICE_INFO, account_id))
+        ):
+            self.invoice_stores[str(account_id)] = InvoiceStore.from_storage(stored)
+        return super()._invoice_store(account_id)
+
+    async def _retrieve_latest_month_consumption_info(
+        self, account_id: str
+    ) -> float | None:
+        """Retrieve latest month consumption info"""
+        path = ENDPOINTS[REQUEST_CONSUMPTION].format(account_id)
+        url = f"{self.base_url}/{path}"
+
+        return await self._call_ute_api_section(
+            REQUEST_CONSUMPTION,
+            account_id,
+            partial(self._parse_latest_month_consumption_info, account_id),
+            "GET",
+            url,
+            "Retrieve latest consumption",
+        )
+
+    async def _is_remote_reading_available(self, account_id: str) -> bool:
+        """Send reading request to UTE API"""
+        url = f"{self.base_url}{ENDPOINTS[READING_REQUEST]}"
+        payload: dict[str, str] = {ACCOUNT_SERVICE_POINT_ID: account_id}
+
+        content = await self._call_ute_api(
+            "POST", url, "Send reading request", payload, endpoint=READING_REQUEST
+        )
+        return content[RESPONSE_STATUS]
+
+    async def _retrieve_latest_reading_info(self, account_id: str) -> Reading | None:
+        """Poll the latest reading until the meter answers or the deadline.
+
+        Waits are plain asyncio sleeps, so cancelling the refresh stops the
+        poll immediately.
+        """
+        path = ENDPOINTS[LAST_READING].format(account_id)
+        url = f"{self.base_url}/{path}"
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.reading_poll.deadline
+        count = 1
+        while True:
+            content = await self._call_ute_api(
+                "GET", url, "Retrieve latest reading info", endpoint=LAST_READING
+            )
+
+            if content[RESPONSE_RESULT] != READING_INPROGRESS:
+                self._record_reading_poll(account_id, count, True)
+                return self._parse_latest_reading_info(content)
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                self._record_reading_poll(account_id, count, False)
+                return None
+
+            delay = self._reading_poll_delay(count, remaining)
+            _LOGGER.debug(
+                "Waiting %.1f s to avoid to many requests, account: %s, request: #%s",
+                delay,
+                account_id,
+                count,
+            )
+            count += 1
+            await asyncio.sleep(delay)
+
+    async def _call_ute_api_section(
+        self,
+        endpoint: str,
+        account_id: str,
+        parse: Callable[[dict[str, Any]], Any],
+        method,
+        url,
+        action,
+        payload=None,
+    ) -> Any:
+        """Execute request to UTE API and parse the body only if it changed.
+
+        The last parsed section of every endpoint and account is kept with a
+        hash of the raw body. When UTE answers the same bytes again the kept
+        section is returned without decoding or post-processing.
+        """
+        body = await self._call_ute_api(
+            method, url, action, payload, raw=True, endpoint=endpoint
+        )
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        stats = self.fingerprint_stats.setdefault(endpoint, FingerprintStats())
+        stats.fetched += 1
+
+        key = (endpoint, str(account_id))
+        if (previous := self._sections.get(key)) is not None and previous[0] == digest:
+            stats.unchanged += 1
+            return previous[1]
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            log_response(_LOGGER, action, 200, body.decode(errors="replace"))
+        section = parse(json_loads(body))
+        self._sections[key] = (digest, section)
+        return section
+
+    async def _call_ute_api(
+        self, method, url, action, payload=None, raw: bool = False, *, endpoint: str
+    ) -> Any:
+        """Execute request to UTE API.
+
+        A request rejected with 401 refreshes the token and is replayed once.
+        """
+        try:
+            stale_token = self.service_token
+            try:
+                return await self._request(method, url, action, payload, raw, endpoint)
+            except UteApiAccessDenied:
+                if action == "Login" or stale_token is None:
+                    raise
+            await self._refresh_token(stale_token)
+            return await self._request(method, url, action, payload, raw, endpoint)
+
+        except UteApiCircuitOpen as error:
+            _LOGGER.debug(error.message)
+            raise error
 
         except (
             UteApiUnauthorized,
@@ -406,3 +1053,61 @@ class UteEnergy:
         except Exception as error:
             _LOGGER.error("%s failed: %s", action, error, exc_info=True)
             raise error
+
+    async def _request(
+        self, method, url, action, payload=None, raw: bool = False, endpoint=None
+    ) -> Any:
+        """Send a single request through the circuit breakers."""
+        if self.breakers is None:
+            return await self._send_limited(method, url, action, payload, raw, endpoint)
+        async with self.breakers.guard(endpoint):
+            return await self._send_limited(method, url, action, payload, raw, endpoint)
+
+    async def _send_limited(
+        self, method, url, action, payload=None, raw: bool = False, endpoint=None
+    ) -> Any:
+        """Send a single request once the shared limiter grants a slot."""
+        if self.limiter is None:
+            return await self._send(method, url, action, payload, raw, endpoint)
+        async with self.limiter.slot(REQUEST_PRIORITIES[endpoint]):
+            return await self._send(method, url, action, payload, raw, endpoint)
+
+    async def _send(
+        self, method, url, action, payload=None, raw: bool = False, endpoint=None
+    ) -> Any:
+        """Send a single request, record its metrics and decode the response."""
+        metrics = self.metrics.endpoint(endpoint)
+        json_data = json.dumps(payload) if payload is not None else None
+        start = time.monotonic()
+        try:
+            async with self.session.request(
+                method, url, data=json_data, headers=self.headers
+            ) as response:
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            metrics.record(time.monotonic() - start, error=type(error).__name__)
+            raise
+
+        metrics.record(
+            time.monotonic() - start,
+            len(body),
+            None if response.status == 200 else response.status,
+        )
+
+        if response.status == 200:
+            if raw:
+                return body
+            if action == "Login":
+                return body.decode(response.get_encoding())
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                log_response(
+                    _LOGGER, action, response.status, body.decode(errors="replace")
+                )
+            return json_loads(body)
+
+        raise self._build_api_error(
+            action,
+            response.status,
+            response.reason,
+            body.decode(response.get_encoding(), errors="replace"),
+        )
@@ -1,5 +1,7 @@
 """Ute energy utils methods"""
+from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 import random
 import string
 import re
@@ -7,6 +9,12 @@ import calendar
 
 import logging
 
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -41,3 +49,54 @@ def extract_entity_id(name, account_id, description_name) -> str:
     """Return entity_id"""
     text_id = f"sensor.{name} {account_id} {description_name}"
     return convert_to_snake_case(text_id)
+
+
+def credentials_key(email: str, phone: str) -> str:
+    """Return the key identifying a UTE user"""
+    return f"{email.strip().lower()}|{phone.strip()}"
+
+
+def has_values(coordinator: DataUpdateCoordinator, keys: Iterable[str]) -> bool:
+    """Return True when the coordinator data holds every key"""
+    return coordinator.data is not None and all(
+        coordinator.data.get(key) is not None for key in keys
+    )
+
+
+@callback
+def async_add_entity_groups(
+    config_entry: ConfigEntry,
+    coordinators: Iterable[DataUpdateCoordinator],
+    groups: list[tuple[Callable[[], bool], Callable[[], list[Entity]]]],
+    async_add_entities: AddEntitiesCallback,
+) -> CALLBACK_TYPE:
+    """Add every group of entities as soon as its data is known.
+
+    A group is a (ready, build) pair. Groups not ready at setup are checked
+    again on every update of the coordinators, so data missing from the first
+    refresh adds its entities without a reload. Unique ids are added once.
+    Return a callback checking the pending groups again.
+    """
+    pending = list(groups)
+    added: set[str | None] = set()
+
+    @callback
+    def _async_add_ready_groups() -> None:
+        if not pending:
+            return
+        entities: list[Entity] = []
+        for group in [group for group in pending if group[0]()]:
+            pending.remove(group)
+            for entity in group[1]():
+                if entity.unique_id not in added:
+                    added.add(entity.unique_id)
+                    entities.append(entity)
+        if entities:
+            async_add_entities(entities)
+
+    _async_add_ready_groups()
+    for coordinator in coordinators:
+        config_entry.async_on_unload(
+            coordinator.async_add_listener(_async_add_ready_groups)
+        )
+    return _async_add_ready_groups
@@ -0,0 +1 @@
+"""Tests for the UTE Energy integration."""
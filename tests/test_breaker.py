@@ -0,0 +1,157 @@
+"""Tests for the UTE API circuit breakers."""
+import asyncio
+
+import aiohttp
+import pytest
+
+from custom_components.ute_energy.breaker import CircuitBreaker, CircuitBreakers
+from custom_components.ute_energy.const import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+)
+from custom_components.ute_energy.exceptions import (
+    UteApiCircuitOpen,
+    UteEnergyException,
+)
+
+
+def _expire(breaker: CircuitBreaker) -> None:
+    """Move the opening back so the reset timeout has elapsed."""
+    breaker.opened_at -= breaker.reset_timeout
+
+
+async def test_opens_after_threshold():
+    """Consecutive failures open the breaker, which then fails fast."""
+    breaker = CircuitBreaker("endpoint", failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.state == BREAKER_CLOSED
+        assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow()
+    assert 0 < breaker.retry_in <= 60
+
+
+async def test_success_resets_failure_count():
+    """A success between failures keeps the breaker closed."""
+    breaker = CircuitBreaker("endpoint", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+
+
+async def test_half_open_probe_closes_on_success():
+    """After the timeout a single probe goes through and closes on success."""
+    breaker = CircuitBreaker("endpoint", failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    _expire(breaker)
+
+    assert breaker.allow()
+    assert breaker.state == BREAKER_HALF_OPEN
+    assert breaker.probe_in_flight
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert not breaker.probe_in_flight
+    assert breaker.reset_timeout == 60
+
+
+async def test_failed_probe_doubles_timeout_up_to_max():
+    """A failed probe opens again with a doubled, capped reset timeout."""
+    breaker = CircuitBreaker(
+        "endpoint", failure_threshold=1, reset_timeout=60, max_reset_timeout=150
+    )
+    breaker.record_failure()
+    for expected in (120, 150, 150):
+        _expire(breaker)
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == BREAKER_OPEN
+        assert breaker.reset_timeout == expected
+
+
+async def test_released_probe_lets_next_call_probe():
+    """A probe given back without a verdict stays half open for the next call."""
+    breaker = CircuitBreaker("endpoint", failure_threshold=1)
+    breaker.record_failure()
+    _expire(breaker)
+    assert breaker.allow()
+
+    breaker.release()
+    assert breaker.state == BREAKER_HALF_OPEN
+    assert breaker.allow()
+
+
+async def test_on_change_called_on_transitions():
+    """State changes are reported once each."""
+    states: list[str] = []
+    breaker = CircuitBreaker(
+        "endpoint",
+        failure_threshold=1,
+        on_change=lambda changed: states.append(changed.state),
+    )
+    breaker.record_failure()
+    breaker.record_failure()
+    _expire(breaker)
+    breaker.allow()
+    breaker.record_success()
+    assert states == [BREAKER_OPEN, BREAKER_HALF_OPEN, BREAKER_CLOSED]
+
+
+async def test_guard_counts_transient_failures_only():
+    """Transient errors open the breaker, API answers keep it closed."""
+    breakers = CircuitBreakers()
+    for _ in range(5):
+        with pytest.raises(UteEnergyException):
+            async with breakers.guard("endpoint"):
+                raise UteEnergyException("Bad request", 400)
+    assert breakers.state == BREAKER_CLOSED
+
+    for _ in range(3):
+        with pytest.raises(aiohttp.ClientError):
+            async with breakers.guard("endpoint"):
+                raise aiohttp.ClientError
+    assert breakers.endpoint("endpoint").state == BREAKER_OPEN
+    assert breakers.host.state == BREAKER_CLOSED
+    assert breakers.state == BREAKER_OPEN
+
+    with pytest.raises(UteApiCircuitOpen):
+        async with breakers.guard("endpoint"):
+            pass
+    async with breakers.guard("other"):
+        pass
+
+
+async def test_guard_waits_for_probe_verdict():
+    """Calls arriving during a probe wait for it instead of failing fast."""
+    breakers = CircuitBreakers()
+    breaker = breakers.endpoint("endpoint")
+    breaker.failure_threshold = 1
+    breaker.record_failure()
+    _expire(breaker)
+    probe_sent = asyncio.Event()
+    finish_probe = asyncio.Event()
+
+    async def probe() -> None:
+        async with breakers.guard("endpoint"):
+            probe_sent.set()
+            await finish_probe.wait()
+
+    async def follower() -> None:
+        async with breakers.guard("endpoint"):
+            pass
+
+    probe_task = asyncio.create_task(probe())
+    await probe_sent.wait()
+    follower_task = asyncio.create_task(follower())
+    await asyncio.sleep(0)
+    assert not follower_task.done()
+
+    finish_probe.set()
+    await asyncio.gather(probe_task, follower_task)
+    assert breakers.state == BREAKER_CLOSED
@@ -0,0 +1,74 @@
+"""Tests for the persistent endpoint cache."""
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.ute_energy.cache import UteEnergyCache, async_get_cache
+from custom_components.ute_energy.const import (
+    CACHE_SAVE_DELAY,
+    CACHE_TTL,
+    GET_ACCOUNT_INFO,
+    PEAK_INFO,
+)
+
+
+async def test_entries_expire_after_ttl(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Entries are served until their endpoint TTL, then only peeked."""
+    cache = await async_get_cache(hass)
+    cache.set(PEAK_INFO, "1", {"peak": True})
+    assert cache.get(PEAK_INFO, "1") == {"peak": True}
+    assert cache.get(PEAK_INFO, "2") is None
+
+    freezer.tick(timedelta(seconds=CACHE_TTL[PEAK_INFO] - 1))
+    assert cache.get(PEAK_INFO, "1") == {"peak": True}
+
+    freezer.tick(timedelta(seconds=1))
+    assert cache.get(PEAK_INFO, "1") is None
+    assert cache.peek(PEAK_INFO, "1") == {"peak": True}
+    assert cache.as_dict()["endpoints"][PEAK_INFO] == {"hits": 2, "misses": 2}
+
+
+async def test_invalidate_filters(hass: HomeAssistant):
+    """Invalidation drops the entries matching the account and endpoint."""
+    cache = UteEnergyCache(hass)
+
+    def fill() -> None:
+        for endpoint in (GET_ACCOUNT_INFO, PEAK_INFO):
+            for account_id in ("1", "2"):
+                cache.set(endpoint, account_id, endpoint + account_id)
+
+    fill()
+    cache.invalidate("1", PEAK_INFO)
+    assert cache.peek(PEAK_INFO, "1") is None
+    assert cache.peek(PEAK_INFO, "2") is not None
+    assert cache.peek(GET_ACCOUNT_INFO, "1") is not None
+
+    cache.invalidate(account_id=1)
+    assert cache.peek(GET_ACCOUNT_INFO, "1") is None
+    assert cache.peek(GET_ACCOUNT_INFO, "2") is not None
+
+    cache.invalidate(endpoint=GET_ACCOUNT_INFO)
+    assert cache.peek(GET_ACCOUNT_INFO, "2") is None
+    assert cache.peek(PEAK_INFO, "2") is not None
+
+    fill()
+    cache.invalidate()
+    assert cache.as_dict()["entries"] == 0
+
+
+async def test_entries_persist(hass: HomeAssistant, freezer: FrozenDateTimeFactory):
+    """Entries are saved after a delay and loaded back by a new cache."""
+    cache = await async_get_cache(hass)
+    cache.set(GET_ACCOUNT_INFO, "1", {"agreement": 1})
+    freezer.tick(timedelta(seconds=CACHE_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    restored = UteEnergyCache(hass)
+    await restored.async_load()
+    assert restored.get(GET_ACCOUNT_INFO, "1") == {"agreement": 1}
@@ -0,0 +1,98 @@
+"""Tests for the local invoice store."""
+from collections.abc import Iterable
+import datetime
+
+from custom_components.ute_energy.const import (
+    INVOICE_PAGE_SIZE,
+    MONTH,
+    MONTH_CHARGES,
+    YEAR,
+)
+from custom_components.ute_energy.invoices import InvoiceStore
+
+TODAY = datetime.date(2026, 10, 17)
+
+
+def _invoice(year: int, month: int, charges: float = 1000.0) -> dict:
+    """Return an invoice API object."""
+    return {YEAR: year, MONTH: month, MONTH_CHARGES: charges}
+
+
+def _months(start: tuple[int, int], count: int) -> list[tuple[int, int]]:
+    """Return count consecutive (year, month) keys from start."""
+    first = start[0] * 12 + start[1] - 1
+    return [(index // 12, index % 12 + 1) for index in range(first, first + count)]
+
+
+def _page(keys: Iterable[tuple[int, int]]) -> list[dict]:
+    """Return invoice API objects for (year, month) keys."""
+    return [_invoice(year, month) for year, month in keys]
+
+
+def test_newest_first_pages_shrink():
+    """Newest first pages only ask for the months since the latest invoice."""
+    store = InvoiceStore()
+    assert store.page_size(TODAY) == INVOICE_PAGE_SIZE
+
+    keys = _months((2026, 7), 3)
+    assert store.merge(_page(reversed(keys)), TODAY)
+    assert store.newest_first is True
+    assert store.latest.key == (2026, 9)
+    assert [invoice.key for invoice in store.as_list()] == [
+        (2026, 7),
+        (2026, 8),
+        (2026, 9),
+    ]
+    assert store.page_size(TODAY) == 2
+
+    # The single latest invoice tells nothing of the order.
+    assert not store.merge([_invoice(2026, 9)], TODAY)
+    assert store.newest_first is True
+    assert store.page_size(TODAY) == 2
+
+
+def test_oldest_first_pages_stay_full():
+    """Oldest first pages keep asking for full pages."""
+    store = InvoiceStore()
+    assert store.merge(_page(_months((2024, 1), 34)), TODAY)
+    assert store.newest_first is False
+    assert store.latest.key == (2026, 10)
+    assert store.page_size(TODAY) == INVOICE_PAGE_SIZE
+
+    # A page ending before the latest invoice is oldest first too.
+    store = InvoiceStore()
+    store.merge(_page(reversed(_months((2026, 7), 3))), TODAY)
+    assert store.merge([_invoice(2026, 1)], TODAY)
+    assert store.newest_first is False
+
+
+def test_merge_replaces_and_skips_future_invoices():
+    """Corrections replace stored invoices, future ones are not the latest."""
+    store = InvoiceStore([_invoice(2026, 8), _invoice(2026, 9)])
+    version = store.version
+
+    assert not store.merge([_invoice(2026, 9)], TODAY)
+    assert store.version == version
+
+    assert store.merge([_invoice(2026, 12), _invoice(2026, 9, 1200.0)], TODAY)
+    assert store.version == version + 1
+    assert store.latest.key == (2026, 9)
+    assert store.latest.charges == 1200.0
+    assert len(store) == 3
+
+
+def test_storage_roundtrip_keeps_order():
+    """The detected order survives storage, legacy lists leave it unknown."""
+    store = InvoiceStore()
+    store.merge(_page(reversed(_months((2026, 7), 3))), TODAY)
+
+    restored = InvoiceStore.from_storage(store.as_storage())
+    assert restored.newest_first is True
+    assert [invoice.key for invoice in restored.as_list()] == [
+        invoice.key for invoice in store.as_list()
+    ]
+    assert restored.page_size(TODAY) == 2
+
+    legacy = InvoiceStore.from_storage([_invoice(2026, 8), _invoice(2026, 9)])
+    assert legacy.newest_first is None
+    assert legacy.page_size(TODAY) == 2
@@ -0,0 +1,102 @@
+"""Tests for the shared request limiter."""
+import asyncio
+
+from custom_components.ute_energy.const import (
+    LIMITER_BURST,
+    LIMITER_MAX_CONCURRENCY,
+    LIMITER_RATE,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+)
+from custom_components.ute_energy.limiter import RequestLimiter
+
+
+async def _request(
+    limiter: RequestLimiter, priority: int, name: str, served: list[str]
+) -> None:
+    """Hold a slot and record the order requests are served in."""
+    async with limiter.slot(priority):
+        served.append(name)
+
+
+async def test_waiters_served_by_priority_then_arrival():
+    """Queued requests go lower priority first, then first come first served."""
+    limiter = RequestLimiter(rate=1000, burst=1, max_concurrency=1)
+    served: list[str] = []
+
+    async with limiter.slot(PRIORITY_NORMAL):
+        tasks = [
+            asyncio.create_task(_request(limiter, priority, name, served))
+            for priority, name in (
+                (PRIORITY_LOW, "low"),
+                (PRIORITY_NORMAL, "normal"),
+                (PRIORITY_HIGH, "high 1"),
+                (PRIORITY_HIGH, "high 2"),
+            )
+        ]
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 4
+
+    await asyncio.gather(*tasks)
+    assert served == ["high 1", "high 2", "normal", "low"]
+    assert limiter.stats.granted == 5
+    assert limiter.stats.max_queue_depth == 4
+
+
+async def test_concurrency_cap():
+    """No more than max_concurrency requests hold a slot at once."""
+    limiter = RequestLimiter(rate=1000, burst=10, max_concurrency=2)
+    active = peak = 0
+
+    async def request() -> None:
+        nonlocal active, peak
+        async with limiter.slot(PRIORITY_NORMAL):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert peak == 2
+    assert limiter.as_dict()["active"] == 0
+
+
+async def test_cancelled_waiter_does_not_leak_slot():
+    """A request cancelled while queued gives no slot away."""
+    limiter = RequestLimiter(rate=1000, burst=1, max_concurrency=1)
+    served: list[str] = []
+
+    async with limiter.slot(PRIORITY_NORMAL):
+        cancelled = asyncio.create_task(
+            _request(limiter, PRIORITY_HIGH, "cancelled", served)
+        )
+        waiting = asyncio.create_task(
+            _request(limiter, PRIORITY_NORMAL, "waiting", served)
+        )
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+
+    await waiting
+    assert served == ["waiting"]
+    assert limiter.as_dict()["active"] == 0
+
+
+async def test_strictest_entry_limits_apply():
+    """Entry limits combine to the strictest, removing them restores defaults."""
+    limiter = RequestLimiter()
+    limiter.set_limits("entry_1", 1.0, 5, 3)
+    limiter.set_limits("entry_2", 2.0, 2, 4)
+    assert (limiter.rate, limiter.burst, limiter.max_concurrency) == (1.0, 2, 3)
+
+    limiter.remove_limits("entry_1")
+    assert (limiter.rate, limiter.burst, limiter.max_concurrency) == (2.0, 2, 4)
+
+    limiter.remove_limits("entry_2")
+    assert (limiter.rate, limiter.burst, limiter.max_concurrency) == (
+        LIMITER_RATE,
+        LIMITER_BURST,
+        LIMITER_MAX_CONCURRENCY,
+    )
@@ -0,0 +1,64 @@
+"""Tests for the power sampler."""
+import pytest
+
+from custom_components.ute_energy.sampling import (
+    PowerSampleBuffer,
+    PowerSampler,
+    segment_energy,
+)
+
+
+def test_segment_energy_trapezoid():
+    """A segment is the mean power over its duration."""
+    assert segment_energy((0, 1000), (3600, 3000), 3600) == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize("end", [0, -10, 601])
+def test_segment_energy_ignores_gaps(end):
+    """Empty, backwards and too long segments count as zero."""
+    assert segment_energy((0, 1000), (end, 1000), 600) == 0.0
+
+
+def test_sampler_skips_missed_readings():
+    """Energy is not integrated across a gap longer than max_gap."""
+    sampler = PowerSampler(interval=60, size=10, max_gap=180)
+    sampler.add(0, 3600)
+    sampler.add(60, 3600)
+    sampler.add(60 + 3600, 3600)
+    sampler.add(60 + 3600 + 120, 3600)
+    assert sampler.energy == pytest.approx(0.18)
+
+
+def test_sampler_ignores_missing_power():
+    """Readings without power neither add energy nor break the series."""
+    sampler = PowerSampler(interval=60, size=10, max_gap=180)
+    sampler.add(0, 1800)
+    sampler.add(60, None)
+    sampler.add(120, 1800)
+    assert len(sampler.buffer) == 2
+    assert sampler.energy == pytest.approx(0.06)
+
+
+def test_average_power_over_covered_time():
+    """The average only weighs the time covered by contiguous samples."""
+    sampler = PowerSampler(interval=60, size=10, max_gap=180)
+    assert sampler.average_power is None
+
+    sampler.add(0, 1000)
+    assert sampler.average_power is None
+
+    sampler.add(60, 3000)
+    sampler.add(10_000, 500)
+    sampler.add(10_060, 500)
+    assert sampler.average_power == pytest.approx(1250)
+
+
+def test_buffer_overwrites_oldest():
+    """A full buffer keeps the newest samples, oldest first."""
+    buffer = PowerSampleBuffer(3)
+    assert buffer.last() is None
+    for second in range(5):
+        buffer.append(second, second * 100)
+    assert len(buffer) == 3
+    assert list(buffer) == [(2, 200), (3, 300), (4, 400)]
+    assert buffer.last() == (4, 400)